@@ -4,14 +4,59 @@ Multi-agent architecture for intelligent JSON configuration generation
 """
 
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 import pandas as pd
 from datetime import datetime
-from typing import Dict, List, Any, Optional
-from openai import OpenAI
+from typing import Dict, List, Any, Optional, Tuple, Callable, Iterator
 import os
 
-# Initialize OpenAI client (API key from environment)
-client = OpenAI()
+from schema_profiler import StreamingProfiler, DEFAULT_MAX_MEMORY_MB
+from compression import detect_compression, detect_file_type, open_source
+from dialect import sniff_dialect, read_csv_options
+from file_readers import read_json_sample, read_xml_sample, detect_xml_record_element
+from sampling import sample_file, DEFAULT_SAMPLE_SIZE
+from schema_cache import get_schema_cache, file_fingerprint
+from llm_cache import get_llm_cache, request_key
+from llm_streaming import JSONSectionParser, iter_completion_text
+from json_repair import extract_json
+from llm_telemetry import get_telemetry
+from llm_resilience import ResiliencePolicy
+from llm_client import get_openai_client
+from single_flight import get_single_flight
+from template_matcher import TemplateMatcher
+from rule_based_config import synthesize_config
+from etl_transformation_agent import ETLTransformationAgent
+from prompt_packing import pack_schema, estimate_tokens, estimate_messages_tokens, DEFAULT_TOKEN_BUDGET
+from parallel_profiler import ParallelColumnProfiler, profile_columns_serial
+from sketches import key_columns, is_skewed
+
+# Distinct values up to which a text column is dictionary-encoded
+DICTIONARY_MAX_VALUES = 32
+
+# Distinct dates beyond which daily partitions are too many
+MAX_DAILY_PARTITIONS = 1000
+
+# Sections every generated configuration must contain
+REQUIRED_SECTIONS = ["process_config", "feed_file_config", "etl_steps"]
+
+# Sections the config prompt asks for; any lost from a completion are filled in by the rule-based generator
+CONFIG_SECTIONS = ["process_config", "feed_file_config", "etl_steps", "date_control", "file_pattern"]
+
+# What each section holds, as the full config prompt describes it; reused by section repair prompts
+SECTION_CONTENTS = {
+    "process_config": "process_id, process_name, source_system, schedule, enabled",
+    "feed_file_config": 'feed_id, file_format, delimiter if CSV, columns with types, in "pos" order',
+    "etl_steps": "deduplication, validation and transformation steps, each with step_id, step_name and step_type",
+    "date_control": "business_date handling: business_date_column, date_format, timezone",
+    "file_pattern": "output_pattern, output_format, output_location"
+}
+
+# Rounds of section repair after validation; each round regenerates only the sections still failing
+MAX_REPAIR_ROUNDS = 2
+REPAIR_MAX_TOKENS = 1000
+
 
 class BaseAgent:
     """Base class for all agents"""
@@ -42,50 +87,151 @@ class SchemaAnalyzerAgent(BaseAgent):
             name="Schema Analyzer",
             role="Analyzes source files and infers schema, data types, and structure"
         )
+        self._parallel_profiler = None
     
-    def analyze_file(self, file_path: str, file_type: str) -> Dict[str, Any]:
-        """Analyze file and extract schema information"""
+    def _get_parallel_profiler(self, workers: int) -> ParallelColumnProfiler:
+        """Reuse one worker pool across files as long as the pool size is unchanged"""
+        if self._parallel_profiler is None or self._parallel_profiler.workers != workers:
+            if self._parallel_profiler is not None:
+                self._parallel_profiler.shutdown()
+            self._parallel_profiler = ParallelColumnProfiler(workers=workers)
+        return self._parallel_profiler
+    
+    def analyze_file(self, file_path: str, file_type: str, mode: str = "sample",
+                     max_memory_mb: int = DEFAULT_MAX_MEMORY_MB,
+                     max_rows: Optional[int] = None,
+                     sample_size: int = DEFAULT_SAMPLE_SIZE,
+                     seed: Optional[int] = None,
+                     workers: int = 1) -> Dict[str, Any]:
+        """
+        Analyze file and extract schema information
+        
+        Args:
+            file_path: Path to the source data file
+            file_type: Type of file (csv, json, xml)
+            mode: "sample" profiles the first sample_size rows, "reservoir"
+                a uniform sample drawn in one pass, "seek" a sample spread
+                evenly across byte offsets, and "stream" the whole file in
+                bounded-memory chunks
+            max_memory_mb: Memory ceiling for a single chunk in stream mode
+            max_rows: Optional row budget after which stream mode stops reading
+            sample_size: Number of rows sampled by the non-stream modes
+            seed: Random seed for the reservoir and seek modes
+            workers: Processes used to profile column groups in parallel;
+                worth raising for files with hundreds of columns
+        
+        Returns:
+            Schema dictionary with per-column statistics
+        """
+        if mode == "stream":
+            return self._analyze_file_streaming(file_path, file_type, max_memory_mb, max_rows, workers)
+        
         try:
+            # Delimiter, quoting, header and encoding come from the first few hundred KB
+            dialect = sniff_dialect(file_path) if file_type.lower() == 'csv' else None
+            
             # Read file based on type
-            if file_type.lower() == 'csv':
-                df = pd.read_csv(file_path, nrows=100)
+            rows_scanned = None
+            df = None
+            parallel_csv = workers > 1 and file_type.lower() == 'csv' and detect_compression(file_path) is None
+            if parallel_csv and mode == "sample":
+                # Workers read their column groups straight from the file
+                profile = self._get_parallel_profiler(workers).profile_csv(
+                    file_path, nrows=sample_size, dialect=dialect
+                )
+            elif mode in ("reservoir", "seek"):
+                df, rows_scanned = sample_file(file_path, file_type, mode, sample_size, seed, dialect)
+            elif mode != "sample":
+                raise ValueError(f"Unsupported analysis mode: {mode}")
+            elif file_type.lower() == 'csv':
+                with open_source(file_path, encoding=dialect["encoding"]) as f:
+                    df = pd.read_csv(f, nrows=sample_size, **read_csv_options(dialect))
             elif file_type.lower() == 'json':
-                # Read JSON file - handle both array and line-delimited formats
-                try:
-                    # Try reading as JSON array first
-                    df = pd.read_json(file_path)
-                    # Limit to first 100 rows if more
-                    if len(df) > 100:
-                        df = df.head(100)
-                except ValueError:
-                    # If that fails, try line-delimited JSON
-                    df = pd.read_json(file_path, lines=True, nrows=100)
+                # Handles both array and line-delimited formats, stopping after sample_size records
+                df = read_json_sample(file_path, nrows=sample_size)
+            elif file_type.lower() == 'xml':
+                # Repeating record element is inferred and its child paths flattened into columns
+                df = read_xml_sample(file_path, nrows=sample_size)
             else:
                 raise ValueError(f"Unsupported file type: {file_type}")
             
+            # Analyze each column, spreading column groups across a process pool if requested
+            if df is None:
+                row_count, columns = profile["rows_profiled"], profile["columns"]
+            elif workers > 1:
+                row_count, columns = len(df), self._get_parallel_profiler(workers).profile_frame(df)
+            else:
+                row_count, columns = len(df), profile_columns_serial(df)
+            
             # Extract schema
             schema = {
                 "file_type": file_type,
-                "row_count_sample": len(df),
-                "column_count": len(df.columns),
-                "columns": []
+                "row_count_sample": row_count,
+                "column_count": len(columns),
+                "columns": columns
             }
             
-            # Analyze each column
-            for col in df.columns:
-                # Get sample values and convert to JSON-serializable format
-                sample_values = df[col].head(3).tolist()
-                # Convert Pandas Timestamp objects to strings
-                sample_values = [str(val) if hasattr(val, 'isoformat') else val for val in sample_values]
-                
-                col_info = {
-                    "name": col,
-                    "dtype": str(df[col].dtype),
-                    "null_count": int(df[col].isnull().sum()),
-                    "unique_count": int(df[col].nunique()),
-                    "sample_values": sample_values
+            if dialect is not None:
+                schema["dialect"] = dialect
+            
+            if mode != "sample":
+                schema["sampling"] = {
+                    "method": mode,
+                    "sample_size": sample_size,
+                    "seed": seed,
+                    "rows_scanned": rows_scanned
                 }
-                schema["columns"].append(col_info)
+            
+            if file_type.lower() == 'xml':
+                schema.update(detect_xml_record_element(file_path))
+            
+            self.log_action("analyze_file", schema)
+            return schema
+            
+        except Exception as e:
+            error = {"error": str(e)}
+            self.log_action("analyze_file_error", error)
+            return error
+    
+    def _analyze_file_streaming(self, file_path: str, file_type: str, max_memory_mb: int,
+                                max_rows: Optional[int], workers: int = 1) -> Dict[str, Any]:
+        """Profile every row of the file without loading it into memory"""
+        try:
+            profiler = StreamingProfiler(max_memory_mb=max_memory_mb)
+            dialect = sniff_dialect(file_path) if file_type.lower() == 'csv' else None
+            # Each worker would decompress the whole file, so compressed input is profiled serially
+            if workers > 1 and file_type.lower() == 'csv' and detect_compression(file_path) is None:
+                profile = self._get_parallel_profiler(workers).profile_csv(
+                    file_path, nrows=max_rows, stream=True, max_memory_mb=max_memory_mb, dialect=dialect
+                )
+            elif file_type.lower() == 'csv':
+                profile = profiler.profile_csv(file_path, max_rows, dialect=dialect)
+            elif file_type.lower() == 'json':
+                profile = profiler.profile_json(file_path, max_rows)
+            elif file_type.lower() == 'xml':
+                profile = profiler.profile_xml(file_path, max_rows)
+            else:
+                raise ValueError(f"Unsupported file type: {file_type}")
+            
+            schema = {
+                "file_type": file_type,
+                "row_count_sample": profile["rows_profiled"],
+                "column_count": len(profile["columns"]),
+                "columns": profile["columns"],
+                "profile_mode": "stream",
+                # False when max_rows stopped the pass early; only complete profiles give exact bounds
+                "profile_complete": max_rows is None or profile["rows_profiled"] < max_rows,
+                "profile_stats": profile["profile_stats"]
+            }
+            if dialect is not None:
+                schema["dialect"] = dialect
+            
+            self.log_action("analyze_file_stream", {
+                "rows_profiled": profile["rows_profiled"],
+                **profile["profile_stats"]
+            })
+            if file_type.lower() == 'xml':
+                schema.update(detect_xml_record_element(file_path))
             
             self.log_action("analyze_file", schema)
             return schema
@@ -99,54 +245,72 @@ class SchemaAnalyzerAgent(BaseAgent):
 class ConfigGeneratorAgent(BaseAgent):
     """Agent responsible for generating JSON configurations using LLM"""
     
-    def __init__(self):
+    def __init__(self, use_llm_cache: bool = True, prompt_token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET,
+                 resilience: Optional[ResiliencePolicy] = None, offline: bool = False):
         super().__init__(
             name="Config Generator",
             role="Generates Hermes framework JSON configurations using AI"
         )
+        self.llm_cache = get_llm_cache() if use_llm_cache else None
+        self.prompt_token_budget = prompt_token_budget
+        # Deadline, retries and the shared circuit breaker; an open circuit means the fallback config
+        self.resilience = resilience or ResiliencePolicy()
+        # Offline mode uses the rule-based generator only: no API calls, no latency
+        self.offline = offline
     
     def generate_config(self, schema: Dict[str, Any], feed_name: str, 
-                       source_system: str) -> Dict[str, Any]:
-        """Generate complete Hermes configuration using LLM"""
+                       source_system: str, use_cache: bool = True,
+                       on_section: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+        """
+        Generate complete Hermes configuration using LLM
+        
+        Identical requests (model, parameters and prompt) are answered from
+        the LLM response cache unless use_cache is False. If on_section is
+        given, the completion is streamed and on_section(name, value) is
+        called for each top-level section as soon as it is complete.
+        """
+        if on_section is not None:
+            for event in self.generate_config_stream(schema, feed_name, source_system, use_cache):
+                if event["event"] == "section":
+                    on_section(event["section"], event["value"])
+                else:
+                    return event["config"]
+        
+        if self.offline:
+            self.log_action("generate_config", {"success": True, "feed_name": feed_name, "offline": True})
+            return self._generate_fallback_config(schema, feed_name, source_system)
+        
+        model, messages, params = self._build_request(schema, feed_name, source_system)
+        cache = self.llm_cache if use_cache else None
+        # Also keys the coalescing of identical requests already in flight
+        cache_key = request_key(model, messages, **params)
         
-        # Prepare prompt for LLM
-        prompt = f"""You are an expert in the Hermes data processing framework. Generate a complete JSON configuration for a new data feed based on the following schema:
-
-Feed Name: {feed_name}
-Source System: {source_system}
-Schema: {json.dumps(schema, indent=2)}
-
-Generate a comprehensive Hermes configuration that includes:
-1. Process Config (process_id, process_name, source_system, schedule, enabled)
-2. Feed File Config (feed_id, file_format, delimiter if CSV, columns with types)
-3. ETL Steps (deduplication, validation, transformation steps)
-4. Date Control (business_date handling)
-5. File Pattern (output naming and location)
-
-Return ONLY valid JSON without any markdown formatting or explanations."""
-
         try:
-            # Call LLM
-            response = client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[
-                    {"role": "system", "content": "You are a Hermes framework configuration expert. Generate only valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2000
-            )
+            config_text = cache.get(cache_key) if cache is not None else None
+            cached = config_text is not None
+            shared = False
+            if cached:
+                self.log_action("llm_cache_hit", cache.stats())
+            else:
+                # Call LLM, or wait for the identical call another session already made
+                started = time.perf_counter()
+                config_text, shared = get_single_flight().do(
+                    f"config:{cache_key}", lambda: self._complete(self.name, model, messages, params)
+                )
+                latency = time.perf_counter() - started
+                if shared:
+                    self.log_action("llm_coalesced", get_single_flight().stats())
             
-            # Extract and parse JSON
-            config_text = response.choices[0].message.content.strip()
+            # Extract and parse JSON, repairing what the model got wrong
+            config, repair = extract_json(config_text, CONFIG_SECTIONS)
+            config = self._salvage_sections(config, repair, schema, feed_name, source_system)
             
-            # Remove markdown code blocks if present
-            if config_text.startswith("```"):
-                config_text = config_text.split("```")[1]
-                if config_text.startswith("json"):
-                    config_text = config_text[4:]
+            # Only complete completions are worth replaying, and the leader of a shared call stores them
+            if cache is not None and not cached and not shared and not repair["truncated"]:
+                cache.put(cache_key, config_text, latency)
+                self.log_action("llm_cache_miss", cache.stats())
             
-            config = json.loads(config_text)
+            self._apply_dialect(config.get("feed_file_config"), schema)
             
             self.log_action("generate_config", {"success": True, "feed_name": feed_name})
             return config
@@ -159,28 +323,272 @@ Return ONLY valid JSON without any markdown formatting or explanations."""
             self.log_action("generate_config_error", error_config)
             return error_config["fallback_config"]
     
+    def generate_config_stream(self, schema: Dict[str, Any], feed_name: str,
+                               source_system: str, use_cache: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the configuration, yielding events as the completion arrives
+        
+        Yields:
+            {"event": "section", "section", "value", "elapsed_seconds"} for each
+            top-level section as soon as it is complete, then one
+            {"event": "complete", "config", "cache_hit", "elapsed_seconds"}
+            (with "error" if the fallback configuration was used)
+        """
+        if self.offline:
+            config = self._generate_fallback_config(schema, feed_name, source_system)
+            for name, value in config.items():
+                yield {"event": "section", "section": name, "value": value, "elapsed_seconds": 0.0}
+            self.log_action("generate_config", {"success": True, "feed_name": feed_name, "offline": True})
+            yield {"event": "complete", "config": config, "cache_hit": False, "elapsed_seconds": 0.0}
+            return
+        
+        model, messages, params = self._build_request(schema, feed_name, source_system)
+        cache = self.llm_cache if use_cache else None
+        cache_key = request_key(model, messages, **params)
+        started = time.perf_counter()
+        first_section = None
+        parser = JSONSectionParser()
+        flights = get_single_flight()
+        flight = None
+        
+        try:
+            cached_text = cache.get(cache_key) if cache is not None else None
+            replay_text = cached_text
+            if cached_text is not None:
+                self.log_action("llm_cache_hit", cache.stats())
+            else:
+                flight, leader = flights.join(f"config:{cache_key}")
+                if not leader:
+                    # Another session is already making this exact call; replay its completion
+                    replay_text, flight = flight.wait(), None
+                    self.log_action("llm_coalesced", flights.stats())
+            
+            if replay_text is not None:
+                tracker = nullcontext()
+            else:
+                self.resilience.check()
+                tracker = get_telemetry().track(self.name, model, streamed=True)
+            
+            with tracker as call:
+                if call is None:
+                    pieces = [replay_text]
+                else:
+                    pieces = self.resilience.stream(
+                        lambda timeout: iter_completion_text(get_openai_client(), model, messages, call=call,
+                                                             timeout=timeout, **params),
+                        call
+                    )
+                for piece in pieces:
+                    for name, value in parser.feed(piece):
+                        if name == "feed_file_config":
+                            self._apply_dialect(value, schema)
+                        elapsed = time.perf_counter() - started
+                        first_section = first_section if first_section is not None else elapsed
+                        yield {"event": "section", "section": name, "value": value,
+                               "elapsed_seconds": round(elapsed, 3)}
+            
+            if flight is not None:
+                flights.land(flight, parser.text.strip())
+                flight = None
+            
+            config, repair = parser.close(CONFIG_SECTIONS)
+            config = self._salvage_sections(config, repair, schema, feed_name, source_system)
+            latency = time.perf_counter() - started
+            if cache is not None and replay_text is None and not repair["truncated"]:
+                cache.put(cache_key, parser.text.strip(), latency)
+                self.log_action("llm_cache_miss", cache.stats())
+            self._apply_dialect(config.get("feed_file_config"), schema)
+            
+            self.log_action("generate_config", {
+                "success": True,
+                "feed_name": feed_name,
+                "streamed": True,
+                "time_to_first_section": round(first_section, 3) if first_section is not None else None,
+                "elapsed_seconds": round(latency, 3)
+            })
+            yield {"event": "complete", "config": config, "cache_hit": cached_text is not None,
+                   "elapsed_seconds": round(latency, 3)}
+            
+        except Exception as e:
+            if flight is not None:
+                flights.land(flight, error=e)
+                flight = None
+            error_config = {
+                "error": str(e),
+                "fallback_config": self._generate_fallback_config(schema, feed_name, source_system)
+            }
+            self.log_action("generate_config_error", error_config)
+            yield {"event": "complete", "config": error_config["fallback_config"], "cache_hit": False,
+                   "elapsed_seconds": round(time.perf_counter() - started, 3), "error": str(e)}
+        finally:
+            if flight is not None:
+                # The consumer stopped reading before the completion finished
+                flights.land(flight, error=RuntimeError("Streamed request abandoned before it completed"))
+    
+    def repair_sections(self, config: Dict[str, Any], sections: List[str], problems: List[str],
+                        schema: Dict[str, Any], feed_name: str, source_system: str,
+                        use_cache: bool = True) -> List[str]:
+        """
+        Regenerate only the given sections of a configuration, in place
+        
+        The prompt holds the validation problems and just the part of the
+        schema those sections need, so a repair costs a fraction of a full
+        generation. Returns the sections replaced; on any error the
+        configuration is left as it was.
+        """
+        if self.offline or not sections:
+            return []
+        
+        model, messages, params = self._build_repair_request(sections, problems, schema, feed_name, source_system)
+        cache = self.llm_cache if use_cache else None
+        cache_key = request_key(model, messages, **params)
+        
+        try:
+            repair_text = cache.get(cache_key) if cache is not None else None
+            cached = repair_text is not None
+            shared = False
+            if not cached:
+                started = time.perf_counter()
+                repair_text, shared = get_single_flight().do(
+                    f"config:{cache_key}", lambda: self._complete(f"{self.name} (repair)", model, messages, params)
+                )
+                latency = time.perf_counter() - started
+            
+            repaired, report = extract_json(repair_text, sections)
+            replaced = [name for name in sections
+                        if name in repaired and name not in report["truncated_sections"]]
+            for name in replaced:
+                config[name] = repaired[name]
+            if "feed_file_config" in replaced:
+                self._apply_dialect(config["feed_file_config"], schema)
+            
+            if cache is not None and not cached and not shared and not report["truncated"]:
+                cache.put(cache_key, repair_text, latency)
+            self.log_action("repair_sections", {
+                "success": True,
+                "requested": sections,
+                "replaced": replaced,
+                "cache_hit": cached,
+                "coalesced": shared,
+                "prompt_tokens": estimate_messages_tokens(messages)
+            })
+            return replaced
+        
+        except Exception as e:
+            self.log_action("repair_sections_error", {"requested": sections, "error": str(e)})
+            return []
+    
+    def _complete(self, telemetry_name: str, model: str, messages: List[Dict[str, str]],
+                  params: Dict[str, Any]) -> str:
+        """Text of one non-streamed completion, within the resilience policy and tracked in telemetry"""
+        self.resilience.check()
+        with get_telemetry().track(telemetry_name, model) as call:
+            response = self.resilience.call(
+                lambda timeout: get_openai_client().chat.completions.create(model=model, messages=messages,
+                                                               timeout=timeout, **params),
+                call
+            )
+            text = response.choices[0].message.content.strip()
+            call.set_usage(getattr(response, "usage", None),
+                           prompt_tokens=estimate_messages_tokens(messages),
+                           completion_tokens=estimate_tokens(text))
+        return text
+    
+    def _build_repair_request(self, sections: List[str], problems: List[str], schema: Dict[str, Any],
+                              feed_name: str, source_system: str) -> Tuple[str, List[Dict[str, str]], Dict[str, Any]]:
+        """(model, messages, parameters) of a completion regenerating only the given sections"""
+        schema_slice = json.dumps(self._schema_slice(schema, sections), separators=(",", ":"))
+        contents = "\n".join(f"- {name}: {SECTION_CONTENTS.get(name, 'as in the Hermes framework')}"
+                             for name in sections)
+        
+        prompt = f"""Regenerate these sections of a Hermes configuration, which failed validation:
+{contents}
+
+Feed Name: {feed_name}
+Source System: {source_system}
+Problems: {"; ".join(problems) or "section missing or empty"}
+Relevant schema: {schema_slice}
+
+Return ONLY a JSON object with exactly the keys {", ".join(sections)}, without any markdown formatting or explanations."""
+        
+        messages = [
+            {"role": "system", "content": "You are a Hermes framework configuration expert. Generate only valid JSON."},
+            {"role": "user", "content": prompt}
+        ]
+        return "gpt-4.1-mini", messages, {"temperature": 0.3, "max_tokens": REPAIR_MAX_TOKENS}
+    
+    def _schema_slice(self, schema: Dict[str, Any], sections: List[str]) -> Dict[str, Any]:
+        """The schema facts the given sections depend on, without statistics"""
+        columns = schema.get("columns", [])
+        schema_slice = {"file_type": schema.get("file_type", "csv")}
+        if "feed_file_config" in sections or "etl_steps" in sections:
+            keys = set(key_columns(schema))
+            schema_slice["columns"] = [
+                {"name": col["name"], "type": col.get("semantic_type", col.get("dtype")),
+                 "nullable": col.get("null_count", 0) > 0, **({"unique": True} if col["name"] in keys else {})}
+                for col in columns
+            ]
+        elif "date_control" in sections:
+            schema_slice["columns"] = [
+                {"name": col["name"], "type": col["semantic_type"], "format": col.get("parse_format")}
+                for col in columns if col.get("semantic_type") in ("date", "timestamp")
+            ]
+        if "feed_file_config" in sections and "dialect" in schema:
+            schema_slice["delimiter"] = schema["dialect"].get("delimiter")
+        return schema_slice
+    
+    def _build_request(self, schema: Dict[str, Any], feed_name: str,
+                       source_system: str) -> Tuple[str, List[Dict[str, str]], Dict[str, Any]]:
+        """(model, messages, parameters) of the chat completion for one feed"""
+        packed_schema, packing = pack_schema(schema, self.prompt_token_budget)
+        
+        # Prepare prompt for LLM
+        prompt = f"""You are an expert in the Hermes data processing framework. Generate a complete JSON configuration for a new data feed based on the following schema:
+
+Feed Name: {feed_name}
+Source System: {source_system}
+Schema (columns grouped by type; "pos" is the column's position in the file): {packed_schema}
+
+Generate a comprehensive Hermes configuration that includes:
+1. Process Config (process_id, process_name, source_system, schedule, enabled)
+2. Feed File Config (feed_id, file_format, delimiter if CSV, columns with types, in "pos" order)
+3. ETL Steps (deduplication, validation, transformation steps)
+4. Date Control (business_date handling)
+5. File Pattern (output naming and location)
+
+Return ONLY valid JSON without any markdown formatting or explanations."""
+
+        messages = [
+            {"role": "system", "content": "You are a Hermes framework configuration expert. Generate only valid JSON."},
+            {"role": "user", "content": prompt}
+        ]
+        self.log_action("prompt_packed", {**packing, "prompt_tokens": estimate_messages_tokens(messages)})
+        return "gpt-4.1-mini", messages, {"temperature": 0.3, "max_tokens": 2000}
+    
+    def _salvage_sections(self, config: Dict[str, Any], repair: Dict[str, Any], schema: Dict[str, Any],
+                          feed_name: str, source_system: str) -> Dict[str, Any]:
+        """Replace sections lost to truncation with their rule-based versions, keeping the rest"""
+        lost = repair["truncated_sections"] + repair["missing_sections"]
+        if not repair["repaired"] and not lost:
+            return config
+        filled = []
+        if lost:
+            fallback = self._generate_fallback_config(schema, feed_name, source_system)
+            filled = [name for name in lost if name in fallback]
+            for name in filled:
+                config[name] = fallback[name]
+        self.log_action("completion_salvaged", {**repair, "sections_filled": filled})
+        return config
+    
+    def _apply_dialect(self, feed_file_config: Any, schema: Dict[str, Any]):
+        """The sniffed delimiter is authoritative; the LLM only sees it in the prompt"""
+        if "dialect" in schema and isinstance(feed_file_config, dict):
+            feed_file_config["delimiter"] = schema["dialect"]["delimiter"]
+    
     def _generate_fallback_config(self, schema: Dict, feed_name: str, 
                                  source_system: str) -> Dict:
-        """Generate basic configuration without LLM"""
-        return {
-            "process_config": {
-                "process_id": feed_name.upper().replace(" ", "_"),
-                "process_name": feed_name,
-                "source_system": source_system,
-                "schedule": "Daily at 6 PM",
-                "enabled": True
-            },
-            "feed_file_config": {
-                "feed_id": feed_name.upper().replace(" ", "_"),
-                "file_format": schema.get("file_type", "CSV"),
-                "delimiter": "," if schema.get("file_type") == "csv" else None,
-                "columns": schema.get("columns", [])
-            },
-            "etl_steps": [
-                {"step_id": 1, "step_name": "Remove Duplicates", "step_type": "deduplication"},
-                {"step_id": 2, "step_name": "Validate Data", "step_type": "validation"}
-            ]
-        }
+        """Generate a complete configuration from the profiled schema without LLM"""
+        return synthesize_config(schema, feed_name, source_system)
 
 
 class ValidationAgent(BaseAgent):
@@ -193,46 +601,80 @@ class ValidationAgent(BaseAgent):
         )
     
     def validate_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Validate configuration structure and completeness"""
-        validation_result = {
-            "valid": True,
-            "errors": [],
-            "warnings": [],
-            "score": 100
+        """
+        Validate configuration structure and completeness
+        
+        failing_sections names the sections that lost points, and
+        section_results keeps each section's result for revalidate.
+        """
+        section_results = {section: self._check_required(section, config) for section in REQUIRED_SECTIONS}
+        validation_result = self._summarize(section_results)
+        self.log_action("validate_config", validation_result)
+        return validation_result
+    
+    def revalidate(self, validation: Dict[str, Any], config: Dict[str, Any],
+                   sections: List[str]) -> Dict[str, Any]:
+        """Validation after changing some sections, checking only those again"""
+        section_results = dict(validation["section_results"])
+        for section in sections:
+            if section in section_results:
+                section_results[section] = self._check_required(section, config)
+        validation_result = self._summarize(section_results)
+        self.log_action("revalidate_config", {"sections": sections, **validation_result})
+        return validation_result
+    
+    def _check_required(self, section: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        """check_section for a required section, or an error if it is missing"""
+        if section not in config:
+            return {"section": section, "errors": [f"Missing required section: {section}"],
+                    "warnings": [], "penalty": 30}
+        return {"errors": [], **self.check_section(section, config[section])}
+    
+    def _summarize(self, section_results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        results = list(section_results.values())
+        errors = [error for result in results for error in result["errors"]]
+        return {
+            "valid": not errors,
+            "errors": errors,
+            "warnings": [warning for result in results for warning in result["warnings"]],
+            "score": 100 - sum(result["penalty"] for result in results),
+            "failing_sections": [section for section, result in section_results.items() if result["penalty"]],
+            "section_results": section_results
         }
+    
+    def check_section(self, name: str, value: Any) -> Dict[str, Any]:
+        """
+        Check one top-level section on its own
+        
+        Used by validate_config and, while a completion is still streaming,
+        on each section as soon as it arrives.
         
-        # Check required sections
-        required_sections = ["process_config", "feed_file_config", "etl_steps"]
-        for section in required_sections:
-            if section not in config:
-                validation_result["errors"].append(f"Missing required section: {section}")
-                validation_result["valid"] = False
-                validation_result["score"] -= 30
+        Returns:
+            {"section", "warnings", "penalty"}
+        """
+        warnings, penalty = [], 0
         
         # Validate process_config
-        if "process_config" in config:
-            process_config = config["process_config"]
+        if name == "process_config":
             required_fields = ["process_id", "process_name", "source_system"]
             for field in required_fields:
-                if field not in process_config:
-                    validation_result["warnings"].append(f"Missing field in process_config: {field}")
-                    validation_result["score"] -= 10
+                if field not in value:
+                    warnings.append(f"Missing field in process_config: {field}")
+                    penalty += 10
         
         # Validate feed_file_config
-        if "feed_file_config" in config:
-            feed_config = config["feed_file_config"]
-            if "columns" not in feed_config or not feed_config["columns"]:
-                validation_result["warnings"].append("No columns defined in feed_file_config")
-                validation_result["score"] -= 15
+        elif name == "feed_file_config":
+            if "columns" not in value or not value["columns"]:
+                warnings.append("No columns defined in feed_file_config")
+                penalty += 15
         
         # Validate ETL steps
-        if "etl_steps" in config:
-            if not config["etl_steps"]:
-                validation_result["warnings"].append("No ETL steps defined")
-                validation_result["score"] -= 10
+        elif name == "etl_steps":
+            if not value:
+                warnings.append("No ETL steps defined")
+                penalty += 10
         
-        self.log_action("validate_config", validation_result)
-        return validation_result
+        return {"section": name, "warnings": warnings, "penalty": penalty}
 
 
 class OptimizationAgent(BaseAgent):
@@ -248,16 +690,19 @@ class OptimizationAgent(BaseAgent):
         """Optimize configuration based on data characteristics"""
         optimized = config.copy()
         recommendations = []
+        columns = schema.get("columns", [])
+        row_count = schema.get("row_count_sample", 0)
         
         # Add partitioning strategy for large datasets
-        if schema.get("row_count_sample", 0) > 50:
+        if row_count > 50:
             recommendations.append("Consider adding partitioning strategy for large dataset")
             if "optimization" not in optimized:
                 optimized["optimization"] = {}
+            partition_column = self._partition_column(columns, row_count)
             optimized["optimization"]["partitioning"] = {
                 "enabled": True,
-                "partition_by": "date",
-                "partition_size": "daily"
+                "partition_by": partition_column["name"] if partition_column else "date",
+                "partition_size": self._partition_size(partition_column)
             }
         
         # Add compression for large files
@@ -271,7 +716,7 @@ class OptimizationAgent(BaseAgent):
             }
         
         # Add indexing recommendations
-        date_columns = [col for col in schema.get("columns", []) 
+        date_columns = [col for col in columns 
                        if "date" in col.get("name", "").lower()]
         if date_columns:
             recommendations.append(f"Create indexes on date columns: {[c['name'] for c in date_columns]}")
@@ -279,41 +724,103 @@ class OptimizationAgent(BaseAgent):
                 optimized["optimization"] = {}
             optimized["optimization"]["indexes"] = [col["name"] for col in date_columns]
         
+        # Unique, never-null columns are natural deduplication and index keys
+        keys = key_columns(schema)
+        if keys:
+            recommendations.append(f"Use unique columns as deduplication/index keys: {keys}")
+            if "optimization" not in optimized:
+                optimized["optimization"] = {}
+            optimized["optimization"]["key_columns"] = keys
+            indexes = optimized["optimization"].setdefault("indexes", [])
+            indexes.extend(key for key in keys if key not in indexes)
+        
+        # Heavily skewed columns make poor partition or bucketing keys
+        skewed = [col["name"] for col in columns if is_skewed(col, row_count)]
+        if skewed:
+            recommendations.append(f"Avoid skewed columns as partition or bucketing keys: {skewed}")
+        
+        # Low-cardinality text columns compress well with dictionary encoding
+        categorical = [col["name"] for col in columns
+                       if col.get("dtype") == "object" and 1 < col.get("unique_count", 0) <= DICTIONARY_MAX_VALUES
+                       and row_count >= 10 * col["unique_count"]]
+        if categorical:
+            recommendations.append(f"Dictionary-encode low-cardinality columns: {categorical}")
+            if "optimization" not in optimized:
+                optimized["optimization"] = {}
+            optimized["optimization"]["dictionary_encoding"] = categorical
+        
         optimized["optimization_recommendations"] = recommendations
         
         self.log_action("optimize_config", {"recommendations_count": len(recommendations)})
         return optimized
+    
+    def _partition_size(self, partition_column: Optional[Dict[str, Any]]) -> str:
+        """Monthly partitions once a date column spans more days than daily partitions handle well"""
+        # Distinct date counts come from the analyzer's HyperLogLog sketch
+        if partition_column and partition_column.get("semantic_type") == "date" \
+                and partition_column.get("unique_count", 0) > MAX_DAILY_PARTITIONS:
+            return "monthly"
+        return "daily"
+    
+    def _partition_column(self, columns: List[Dict[str, Any]], row_count: int) -> Optional[Dict[str, Any]]:
+        """The first complete, unskewed date column, if any"""
+        for col in columns:
+            is_date = col.get("semantic_type") in ("date", "timestamp") or "date" in col.get("name", "").lower()
+            if is_date and col.get("null_count", 0) == 0 and not is_skewed(col, row_count):
+                return col
+        return None
 
 
 class OrchestratorAgent(BaseAgent):
     """Master agent that coordinates all other agents"""
     
-    def __init__(self):
+    def __init__(self, use_schema_cache: bool = True, use_llm_cache: bool = True, use_templates: bool = True,
+                 offline: bool = False, repair_sections: bool = True):
         super().__init__(
             name="Orchestrator",
             role="Coordinates all agents and manages the configuration generation workflow"
         )
+        self.schema_cache = get_schema_cache() if use_schema_cache else None
+        # Schemas that fit a pre-built template are configured without an LLM call
+        self.template_matcher = TemplateMatcher() if use_templates else None
         self.schema_analyzer = SchemaAnalyzerAgent()
-        self.config_generator = ConfigGeneratorAgent()
+        self.config_generator = ConfigGeneratorAgent(use_llm_cache=use_llm_cache, offline=offline)
         self.validator = ValidationAgent()
         self.optimizer = OptimizationAgent()
+        self.etl_agent = ETLTransformationAgent(use_cache=use_llm_cache)
+        # Sections of LLM configs that fail validation are regenerated on their own
+        self.repair_sections = repair_sections
     
     def generate_complete_config(self, file_path: str, file_type: str, 
-                                feed_name: str, source_system: str) -> Dict[str, Any]:
-        """Orchestrate the complete configuration generation process"""
+                                feed_name: str, source_system: str,
+                                on_section: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+        """
+        Orchestrate the complete configuration generation process
+        
+        If on_section is given, the LLM output is streamed and
+        on_section(name, value) is called for each finished top-level section.
+        """
+        
+        # Step 1: Analyze schema (skipped when the file is unchanged since a previous run)
+        self.log_action("step_1_start", "Analyzing file schema")
+        schema, cache_hit = self.analyze_schema(file_path, file_type)
+        return self.generate_from_schema(schema, cache_hit, feed_name, source_system, on_section)
+    
+    def generate_from_schema(self, schema: Dict[str, Any], cache_hit: bool,
+                             feed_name: str, source_system: str,
+                             on_section: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+        """Run generation, validation and optimization (steps 2-4) on an analyzed schema"""
         
         result = {
             "status": "processing",
             "steps": []
         }
         
-        # Step 1: Analyze schema
-        self.log_action("step_1_start", "Analyzing file schema")
-        schema = self.schema_analyzer.analyze_file(file_path, file_type)
         result["steps"].append({
             "step": 1,
             "name": "Schema Analysis",
             "status": "completed" if "error" not in schema else "failed",
+            "cache_hit": cache_hit,
             "output": schema
         })
         
@@ -321,23 +828,39 @@ class OrchestratorAgent(BaseAgent):
             result["status"] = "failed"
             return result
         
-        # Step 2: Generate configuration
-        self.log_action("step_2_start", "Generating configuration with LLM")
-        config = self.config_generator.generate_config(schema, feed_name, source_system)
+        # Step 2: Generate configuration, from a template when one fits the schema
+        match = self.template_matcher.best_match(schema) if self.template_matcher is not None else None
+        if match is not None:
+            self.log_action("step_2_start", f"Generating configuration from template {match['template_id']}")
+            config = self.template_matcher.instantiate(match, schema, feed_name, source_system)
+            self.log_action("template_match", {key: match[key] for key in ("template_id", "confidence")})
+            if on_section is not None:
+                for name, value in config.items():
+                    on_section(name, value)
+        else:
+            self.log_action("step_2_start", "Generating configuration with rules" if self.config_generator.offline
+                            else "Generating configuration with LLM")
+            config = self.config_generator.generate_config(schema, feed_name, source_system, on_section=on_section)
         result["steps"].append({
             "step": 2,
             "name": "Config Generation",
             "status": "completed",
+            "source": "template" if match is not None else ("rules" if self.config_generator.offline else "llm"),
+            "template_match": match,
             "output": config
         })
         
-        # Step 3: Validate configuration
+        # Step 3: Validate configuration, regenerating failing sections of LLM output
         self.log_action("step_3_start", "Validating configuration")
         validation = self.validator.validate_config(config)
+        repairs = []
+        if self.repair_sections and result["steps"][1]["source"] == "llm":
+            validation, repairs = self._repair_failing_sections(config, validation, schema, feed_name, source_system)
         result["steps"].append({
             "step": 3,
             "name": "Validation",
             "status": "completed",
+            "repairs": repairs,
             "output": validation
         })
         
@@ -366,28 +889,166 @@ class OrchestratorAgent(BaseAgent):
         
         return result
     
-    def orchestrate_config_generation(self, file_path: str, feed_details: Dict[str, Any]) -> Dict[str, Any]:
+    def _repair_failing_sections(self, config: Dict[str, Any], validation: Dict[str, Any], schema: Dict[str, Any],
+                                 feed_name: str, source_system: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Regenerate the sections validation flags, revalidating only those, for up to MAX_REPAIR_ROUNDS
+        
+        Rounds stop once neither the failing sections nor their problems
+        shrink, since the next round would send the same prompt again.
+        Only sections that pass revalidation are reported as repaired.
+        """
+        repairs = []
+        failing = validation["failing_sections"]
+        problems = self._section_problems(validation, failing)
+        for _ in range(MAX_REPAIR_ROUNDS):
+            if not failing:
+                break
+            self.log_action("section_repair_start", {"sections": failing, "score": validation["score"]})
+            replaced = self.config_generator.repair_sections(config, failing, problems, schema,
+                                                             feed_name, source_system)
+            if not replaced:
+                break
+            validation = self.validator.revalidate(validation, config, replaced)
+            still_failing = validation["failing_sections"]
+            repaired = [section for section in replaced if section not in still_failing]
+            if repaired:
+                repairs.append({"sections": failing, "repaired": repaired, "score": validation["score"]})
+            remaining = self._section_problems(validation, still_failing)
+            if not (set(still_failing) < set(failing) or set(remaining) < set(problems)):
+                self.log_action("section_repair_stalled", {"sections": still_failing, "score": validation["score"]})
+                break
+            failing, problems = still_failing, remaining
+        return validation, repairs
+    
+    def _section_problems(self, validation: Dict[str, Any], sections: List[str]) -> List[str]:
+        """Errors and warnings validation reported for the given sections"""
+        return [problem for section in sections
+                for problem in validation["section_results"][section]["errors"]
+                + validation["section_results"][section]["warnings"]]
+    
+    def analyze_schema(self, file_path: str, file_type: str) -> Tuple[Dict[str, Any], bool]:
+        """Return (schema, cache_hit), profiling the file only on a cache miss"""
+        if self.schema_cache is None:
+            return self._analyze_coalesced(file_path, file_type)[0], False
+        
+        try:
+            cache_key = self.schema_cache.make_key(file_path, file_type)
+        except OSError:
+            # Missing or unreadable file: the analyzer reports it as a failed schema
+            return self._analyze_coalesced(file_path, file_type)[0], False
+        schema = self.schema_cache.get(cache_key)
+        if schema is not None:
+            self.log_action("schema_cache_hit", self.schema_cache.stats())
+            return schema, True
+        
+        schema, shared = self._analyze_coalesced(file_path, file_type)
+        if not shared:
+            self.schema_cache.put(cache_key, schema)
+            self.log_action("schema_cache_miss", self.schema_cache.stats())
+        return schema, False
+    
+    def _analyze_coalesced(self, file_path: str, file_type: str) -> Tuple[Dict[str, Any], bool]:
+        """(schema, shared): profile the file, or wait for a profile of the same content already running"""
+        try:
+            key = f"schema:{file_fingerprint(file_path)}:{file_type.lower()}"
+        except OSError:
+            # Let the analyzer report the unreadable file
+            return self.schema_analyzer.analyze_file(file_path, file_type), False
+        schema, shared = get_single_flight().do(key, lambda: self.schema_analyzer.analyze_file(file_path, file_type))
+        if shared:
+            self.log_action("schema_coalesced", get_single_flight().stats())
+        return schema, shared
+    
+    def orchestrate_config_generation(self, file_path: str, feed_details: Dict[str, Any],
+                                      on_section: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
         """
         Orchestrate config generation with feed details (v2 interface)
         
         Args:
             file_path: Path to the source data file
             feed_details: Dictionary containing feed metadata
+            on_section: Optional callback receiving (name, value) for each
+                configuration section as the LLM output streams in
         
         Returns:
             Configuration generation result with schema
         """
-        # Extract file type from file path
-        file_type = file_path.split('.')[-1] if '.' in file_path else 'csv'
+        # Extract file type from file path, looking past compression suffixes (.csv.gz -> csv)
+        file_type = detect_file_type(file_path)
         
         # Extract key details
         feed_name = feed_details.get("feed_name", "unknown_feed")
         source_system = feed_details.get("source_system", "unknown_system")
         
         # Use the existing complete config generation
-        result = self.generate_complete_config(file_path, file_type, feed_name, source_system)
+        result = self.generate_complete_config(file_path, file_type, feed_name, source_system, on_section)
+        return self.to_v2_result(result)
+    
+    def orchestrate_combined_generation(self, file_path: str, feed_details: Dict[str, Any],
+                                        transformation_description: str,
+                                        on_section: Optional[Callable[[str, Any], None]] = None,
+                                        on_etl_section: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+        """
+        Generate the configuration and the ETL transformation from one schema analysis
+        
+        The file is analyzed once. The ETL specification, which needs only
+        the schema, target table and description, is generated on a
+        background thread while this thread generates the configuration and
+        then validates and optimizes it, so the total time is close to the
+        slower of the two LLM calls rather than their sum.
+        
+        Args:
+            file_path: Path to the source data file
+            feed_details: Feed metadata as for orchestrate_config_generation,
+                including target_table
+            transformation_description: Natural language ETL requirements
+            on_section: Optional callback for configuration sections, called on this thread
+            on_etl_section: Optional callback for ETL sections, called on the background thread
+        
+        Returns:
+            The orchestrate_config_generation result plus "etl_transformation"
+            and "timings" (seconds for each branch and in total)
+        """
+        started = time.perf_counter()
+        file_type = detect_file_type(file_path)
+        feed_name = feed_details.get("feed_name", "unknown_feed")
+        source_system = feed_details.get("source_system", "unknown_system")
+        target_table = feed_details.get("target_table", "gold.target_table")
+        
+        self.log_action("step_1_start", "Analyzing file schema")
+        schema, cache_hit = self.analyze_schema(file_path, file_type)
+        analysis_seconds = time.perf_counter() - started
+        if "error" in schema:
+            result = self.to_v2_result(self.generate_from_schema(schema, cache_hit, feed_name, source_system))
+            return {**result, "etl_transformation": None, "timings": {"analysis_seconds": round(analysis_seconds, 3)}}
         
-        # Transform result to match v2 expected format
+        def generate_etl() -> Tuple[Dict[str, Any], float]:
+            etl_started = time.perf_counter()
+            etl_json = self.etl_agent.generate_etl_transformation(schema, target_table, transformation_description,
+                                                                  on_section=on_etl_section)
+            return etl_json, time.perf_counter() - etl_started
+        
+        self.log_action("combined_generation_start", {"feed_name": feed_name, "target_table": target_table})
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="hermes-etl") as pool:
+            etl_future = pool.submit(generate_etl)
+            config_started = time.perf_counter()
+            result = self.generate_from_schema(schema, cache_hit, feed_name, source_system, on_section)
+            config_seconds = time.perf_counter() - config_started
+            etl_json, etl_seconds = etl_future.result()
+        
+        timings = {
+            "analysis_seconds": round(analysis_seconds, 3),
+            "config_seconds": round(config_seconds, 3),
+            "etl_seconds": round(etl_seconds, 3),
+            "total_seconds": round(time.perf_counter() - started, 3)
+        }
+        self.log_action("combined_generation_complete", timings)
+        return {**self.to_v2_result(result), "etl_transformation": etl_json, "timings": timings}
+    
+    @staticmethod
+    def to_v2_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Transform a generate_complete_config result to match the v2 expected format"""
         validation_data = result["steps"][2]["output"] if len(result["steps"]) > 2 else {}
         validation_score = validation_data.get("score", 85) if validation_data else 85  # Default score
         
@@ -398,7 +1059,9 @@ class OrchestratorAgent(BaseAgent):
             "status": result.get("status", "unknown"),
             "all_steps": result.get("steps", []),
             "validation_score": validation_score,
-            "steps_completed": len(result.get("steps", []))
+            "steps_completed": len(result.get("steps", [])),
+            "template_match": result["steps"][1].get("template_match") if len(result["steps"]) > 1 else None,
+            "section_repairs": result["steps"][2].get("repairs", []) if len(result["steps"]) > 2 else []
         }
     
     def get_all_agent_logs(self) -> Dict[str, List[Dict]]:
@@ -408,8 +1071,13 @@ class OrchestratorAgent(BaseAgent):
             "schema_analyzer": self.schema_analyzer.get_memory(),
             "config_generator": self.config_generator.get_memory(),
             "validator": self.validator.get_memory(),
-            "optimizer": self.optimizer.get_memory()
+            "optimizer": self.optimizer.get_memory(),
+            "etl_transformation": self.etl_agent.get_memory()
         }
+    
+    def get_llm_telemetry(self, by: str = "agent") -> Dict[str, Dict[str, Any]]:
+        """Latency, token and retry percentiles of this process's LLM calls, per agent or per model"""
+        return get_telemetry().summary(by)
 
 
 # Convenience function for external use
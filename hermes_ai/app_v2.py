@@ -18,6 +18,9 @@ from agents import (
     OrchestratorAgent
 )
 from etl_transformation_agent import ETLTransformationAgent
+from llm_telemetry import get_telemetry
+from llm_resilience import get_circuit_breaker
+from single_flight import get_single_flight
 from templates import get_template, list_templates
 from git_integration import GitIntegration
 
@@ -62,8 +65,8 @@ with tab1:
     
     with col1:
         uploaded_file = st.file_uploader(
-            "Upload CSV or JSON file",
-            type=['csv', 'json'],
+            "Upload CSV, JSON or XML file (optionally .gz, .bz2, .xz or .zip)",
+            type=['csv', 'tsv', 'psv', 'txt', 'json', 'xml', 'gz', 'bz2', 'xz', 'zip'],
             help="Upload a sample of your source data file"
         )
     
@@ -131,6 +134,12 @@ with tab1:
             ["Daily", "Hourly", "Weekly", "Monthly", "Real-time"]
         )
     
+    etl_description = st.text_area(
+        "ETL Transformation Requirements (optional)",
+        height=80,
+        help="Describe the transformations to also generate the ETL specification, concurrently with the configuration"
+    )
+    
     st.markdown("---")
     
     # Generate button
@@ -144,8 +153,15 @@ with tab1:
                 # Save uploaded file temporarily if needed
                 if uploaded_file:
                     temp_path = f"/tmp/{uploaded_file.name}"
-                    with open(temp_path, "wb") as f:
-                        f.write(uploaded_file.getbuffer())
+                    # Rewriting an identical upload would change its mtime and defeat the schema cache
+                    upload_bytes = uploaded_file.getbuffer()
+                    unchanged = os.path.exists(temp_path) and os.path.getsize(temp_path) == upload_bytes.nbytes
+                    if unchanged:
+                        with open(temp_path, "rb") as f:
+                            unchanged = f.read() == upload_bytes
+                    if not unchanged:
+                        with open(temp_path, "wb") as f:
+                            f.write(upload_bytes)
                     file_to_process = temp_path
                 
                 # Create orchestrator
@@ -161,11 +177,38 @@ with tab1:
                     "frequency": frequency
                 }
                 
-                # Generate config
-                result = orchestrator.orchestrate_config_generation(
-                    file_path=file_to_process,
-                    feed_details=feed_details
-                )
+                # Show config sections as the LLM streams them, with early validation warnings
+                progress = st.empty()
+                partial_config = {}
+                section_warnings = []
+                section_checker = ValidationAgent()
+                
+                def show_section(name, value):
+                    partial_config[name] = value
+                    section_warnings.extend(section_checker.check_section(name, value)["warnings"])
+                    with progress.container():
+                        st.caption(f"Received {len(partial_config)} section(s)...")
+                        for warning in section_warnings:
+                            st.warning(warning)
+                        st.json(partial_config, expanded=False)
+                
+                # Generate config, and the ETL specification alongside it when requirements are given
+                if etl_description.strip():
+                    result = orchestrator.orchestrate_combined_generation(
+                        file_path=file_to_process,
+                        feed_details=feed_details,
+                        transformation_description=etl_description,
+                        on_section=show_section
+                    )
+                    st.session_state.generated_etl = result["etl_transformation"]
+                    st.session_state.generated_sql = None
+                else:
+                    result = orchestrator.orchestrate_config_generation(
+                        file_path=file_to_process,
+                        feed_details=feed_details,
+                        on_section=show_section
+                    )
+                progress.empty()
                 
                 # Store results
                 st.session_state.generated_config = result["config"]
@@ -175,6 +218,17 @@ with tab1:
                 # Display results
                 if result["status"] == "completed":
                     st.success("✅ Configuration Generated Successfully!")
+                    if result.get("template_match"):
+                        st.info(f"⚡ Built from template `{result['template_match']['template_id']}` "
+                                f"(confidence {result['template_match']['confidence']:.0%}) without an LLM call")
+                    if result.get("section_repairs"):
+                        repaired = sorted({name for repair in result["section_repairs"] for name in repair["repaired"]})
+                        st.info(f"🔧 Regenerated {', '.join(repaired)} after validation flagged them")
+                    if result.get("timings", {}).get("etl_seconds") is not None:
+                        timings = result["timings"]
+                        st.info(f"🔄 ETL specification generated alongside in {timings['etl_seconds']:.1f}s "
+                                f"(config {timings['config_seconds']:.1f}s, total {timings['total_seconds']:.1f}s); "
+                                "see the ETL Transformations tab")
                     
                     col1, col2, col3 = st.columns(3)
                     with col1:
@@ -219,11 +273,16 @@ with tab2:
             schema = st.session_state.source_schema
             st.write(f"**File Type:** {schema.get('file_type', 'N/A')}")
             st.write(f"**Columns:** {schema.get('column_count', 0)}")
+            if 'dialect' in schema:
+                dialect = schema['dialect']
+                st.write(f"**Delimiter:** `{dialect['delimiter']!r}` · **Encoding:** {dialect['encoding']} · "
+                         f"**Header:** {'yes' if dialect['has_header'] else 'no'}")
             
             # Display columns in a table
             if 'columns' in schema:
                 cols_df = pd.DataFrame(schema['columns'])
-                st.dataframe(cols_df[['name', 'dtype', 'null_count', 'unique_count']], use_container_width=True)
+                display_cols = [c for c in ['name', 'dtype', 'semantic_type', 'null_count', 'unique_count'] if c in cols_df.columns]
+                st.dataframe(cols_df[display_cols], use_container_width=True)
         
         st.markdown("---")
         st.header("Describe Your ETL Transformations")
@@ -264,12 +323,22 @@ with tab2:
                         # Create ETL agent
                         etl_agent = ETLTransformationAgent()
                         
+                        # Show sections of the spec as the LLM streams them
+                        etl_progress = st.empty()
+                        partial_etl = {}
+                        
+                        def show_etl_section(name, value):
+                            partial_etl[name] = value
+                            etl_progress.json(partial_etl, expanded=False)
+                        
                         # Generate transformation
                         etl_json = etl_agent.generate_etl_transformation(
                             source_schema=st.session_state.source_schema,
                             target_table=etl_target_table,
-                            transformation_description=transformation_desc
+                            transformation_description=transformation_desc,
+                            on_section=show_etl_section
                         )
+                        etl_progress.empty()
                         
                         # Store result
                         st.session_state.generated_etl = etl_json
@@ -279,7 +348,11 @@ with tab2:
                             st.session_state.agent_logs = {}
                         st.session_state.agent_logs["etl_transformation"] = etl_agent.get_memory()
                         
-                        st.success("✅ ETL Transformation JSON Generated!")
+                        if etl_json.get("metadata", {}).get("cache_hit"):
+                            st.success(f"⚡ ETL Transformation JSON loaded from cache "
+                                       f"(generated {etl_json['metadata'].get('generated_at', 'earlier')})")
+                        else:
+                            st.success("✅ ETL Transformation JSON Generated!")
         
         with col2:
             # Generate SQL button
@@ -354,6 +427,32 @@ with tab3:
     st.header("🤖 Agent Activity Monitor")
     st.markdown("Real-time view of AI agent actions and decisions")
     
+    # LLM call telemetry for this server process
+    telemetry = get_telemetry()
+    if telemetry.get_records():
+        st.subheader("⏱️ LLM Call Latency")
+        group_by = st.radio("Group by", ["agent", "model"], horizontal=True)
+        rows = []
+        for key, stats in telemetry.summary(by=group_by).items():
+            row = {group_by: key, "calls": stats["calls"], "errors": stats["errors"], "retries": stats["retries"]}
+            for metric, label in [("latency_seconds", "latency"), ("ttft_seconds", "ttft"), ("queue_seconds", "queue")]:
+                for pct in ("p50", "p95", "p99"):
+                    row[f"{label} {pct} (s)"] = stats[metric][pct]
+            row["prompt tokens"] = stats["prompt_tokens"]
+            row["completion tokens"] = stats["completion_tokens"]
+            row["cost (USD)"] = stats["cost_usd"]
+            rows.append(row)
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        breaker = get_circuit_breaker().stats()
+        st.caption(f"LLM circuit breaker: {breaker['state']} "
+                   f"({breaker['consecutive_failures']} consecutive failures, {breaker['rejected']} calls short-circuited)")
+        flights = get_single_flight().stats()
+        st.caption(f"Request coalescing: {flights['coalesced']} identical requests shared "
+                   f"{flights['computations']} computations across sessions ({flights['in_flight']} in flight)")
+        with st.expander("Recent LLM calls"):
+            st.dataframe(pd.DataFrame(telemetry.get_records()[-50:][::-1]), use_container_width=True, hide_index=True)
+        st.markdown("---")
+    
     if not st.session_state.agent_logs:
         st.info("No agent activity yet. Generate a configuration to see agents in action!")
     else:
@@ -428,7 +527,7 @@ with tab5:
     ## How to Use This Tool
     
     ### Step 1: Generate Configuration
-    1. Upload your source data file (CSV or JSON) or use a sample
+    1. Upload your source data file (CSV, JSON or XML) or use a sample
     2. Fill in the feed details (Process ID, Feed Name, etc.)
     3. Click "Generate Configuration"
     4. Download the generated JSON configuration
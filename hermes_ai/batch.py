@@ -0,0 +1,143 @@
+"""
+Hermes Config Generator - Batch Generation
+Concurrent configuration generation for many feeds of a source system
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple, AsyncIterator
+
+from agents import OrchestratorAgent
+from compression import detect_file_type
+from llm_telemetry import queued_since
+
+# LLM calls in flight at once; keep within the account's rate limits
+DEFAULT_CONCURRENCY = 8
+
+# Each analysis worker process keeps one orchestrator (and its schema cache)
+_worker_orchestrator = None
+
+
+def _analyze_in_worker(file_path: str, file_type: str, use_schema_cache: bool) -> Tuple[Dict[str, Any], bool]:
+    """Worker: analyze one file, returning (schema, cache_hit)"""
+    global _worker_orchestrator
+    if _worker_orchestrator is None:
+        _worker_orchestrator = OrchestratorAgent(use_schema_cache=use_schema_cache)
+    return _worker_orchestrator.analyze_schema(file_path, file_type)
+
+
+def _shutdown_pools(*pools: Executor):
+    """Wait for the pools' workers to exit, dropping queued work of abandoned jobs"""
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+class BatchConfigGenerator:
+    """
+    Generates configurations for a batch of (file_path, feed_details) jobs
+
+    Schema analysis runs in a process pool. The LLM-bound steps run in a
+    thread pool, with a semaphore bounding how many are in flight, so a
+    batch takes roughly ceil(jobs / concurrency) round trips rather than
+    one per feed.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, analysis_workers: Optional[int] = None,
+                 use_schema_cache: bool = True, use_llm_cache: bool = True):
+        self.concurrency = concurrency
+        self.analysis_workers = analysis_workers or os.cpu_count() or 1
+        self.use_schema_cache = use_schema_cache
+        self.use_llm_cache = use_llm_cache
+        # Logs batch progress only; every job generates with an orchestrator of its own
+        self.orchestrator = OrchestratorAgent(use_schema_cache=use_schema_cache, use_llm_cache=use_llm_cache)
+
+    async def generate(self, jobs: List[Tuple[str, Dict[str, Any]]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield one result per job as soon as it completes
+
+        Each result is the v2 result format (see
+        OrchestratorAgent.to_v2_result) plus "index" (position in jobs),
+        "file_path", "feed_name" and "elapsed_seconds".
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        analysis_pool = ProcessPoolExecutor(max_workers=self.analysis_workers)
+        llm_pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="hermes-llm")
+        tasks = [asyncio.ensure_future(self._run_job(index, file_path, feed_details,
+                                                     semaphore, analysis_pool, llm_pool))
+                 for index, (file_path, feed_details) in enumerate(jobs)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Waiting for workers to exit would block the event loop, so it happens off-loop
+            await asyncio.get_running_loop().run_in_executor(None, _shutdown_pools, analysis_pool, llm_pool)
+
+    async def _run_job(self, index: int, file_path: str, feed_details: Dict[str, Any],
+                       semaphore: asyncio.Semaphore, analysis_pool: Executor, llm_pool: Executor) -> Dict[str, Any]:
+        """Analyze one file in the process pool, then generate under the concurrency limit"""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        feed_name = feed_details.get("feed_name", "unknown_feed")
+        source_system = feed_details.get("source_system", "unknown_system")
+        try:
+            file_type = feed_details.get("file_type") or detect_file_type(file_path)
+            schema, cache_hit = await loop.run_in_executor(
+                analysis_pool, _analyze_in_worker, file_path, file_type, self.use_schema_cache
+            )
+            enqueued_at = time.perf_counter()
+            async with semaphore:
+                result = await loop.run_in_executor(
+                    llm_pool, self._generate_queued, enqueued_at, schema, cache_hit, feed_name, source_system
+                )
+            output = OrchestratorAgent.to_v2_result(result)
+        except Exception as e:
+            output = {"status": "failed", "error": str(e)}
+        output.update({
+            "index": index,
+            "file_path": file_path,
+            "feed_name": feed_name,
+            "elapsed_seconds": round(time.perf_counter() - started, 3)
+        })
+        self.orchestrator.log_action("batch_job_complete", {
+            "index": index, "feed_name": feed_name, "status": output["status"]
+        })
+        return output
+
+    def _generate_queued(self, enqueued_at: float, schema: Dict[str, Any], cache_hit: bool,
+                         feed_name: str, source_system: str) -> Dict[str, Any]:
+        """LLM pool worker: generate, reporting the wait for a slot as queueing time"""
+        # A job-local orchestrator keeps each result's agent_memories to that job's own actions
+        orchestrator = OrchestratorAgent(use_schema_cache=self.use_schema_cache, use_llm_cache=self.use_llm_cache)
+        with queued_since(enqueued_at):
+            return orchestrator.generate_from_schema(schema, cache_hit, feed_name, source_system)
+
+
+async def generate_configs_async(jobs: List[Tuple[str, Dict[str, Any]]],
+                                 concurrency: int = DEFAULT_CONCURRENCY,
+                                 analysis_workers: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Generate configurations for many feeds concurrently, yielding results as they complete
+
+    Args:
+        jobs: (file_path, feed_details) pairs; feed_details as for
+            OrchestratorAgent.orchestrate_config_generation
+        concurrency: Maximum LLM calls in flight
+        analysis_workers: Processes used for schema analysis (default: CPU count)
+    """
+    generator = BatchConfigGenerator(concurrency=concurrency, analysis_workers=analysis_workers)
+    async for result in generator.generate(jobs):
+        yield result
+
+
+def generate_configs_batch(jobs: List[Tuple[str, Dict[str, Any]]],
+                           concurrency: int = DEFAULT_CONCURRENCY,
+                           analysis_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Synchronous wrapper around generate_configs_async; results are returned in job order"""
+    async def collect() -> List[Dict[str, Any]]:
+        return [result async for result in generate_configs_async(jobs, concurrency, analysis_workers)]
+
+    return sorted(asyncio.run(collect()), key=lambda result: result["index"])
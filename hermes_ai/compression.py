@@ -0,0 +1,160 @@
+"""
+Hermes Config Generator - Compression
+Transparent streaming decompression of compressed source files
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import os
+import zipfile
+from typing import Dict, Any, Optional, Union, IO
+
+# Leading bytes identifying each supported compression format
+MAGIC_BYTES = [
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"PK\x03\x04", "zip")
+]
+
+COMPRESSION_EXTENSIONS = {"gz", "gzip", "bz2", "xz", "zip"}
+
+# Extensions that are read with the same reader as a canonical file type
+FILE_TYPE_ALIASES = {
+    "jsonl": "json",
+    "ndjson": "json",
+    "tsv": "csv",
+    "psv": "csv",
+    "txt": "csv",
+    "dat": "csv"
+}
+
+
+def detect_compression(file_path: str) -> Optional[str]:
+    """Compression format from the file's magic bytes, or None for plain files"""
+    with open(file_path, 'rb') as f:
+        head = f.read(8)
+    for magic, compression in MAGIC_BYTES:
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def _zip_member(archive: zipfile.ZipFile) -> str:
+    """The data file inside a zip archive: its first regular file"""
+    for info in archive.infolist():
+        if not info.is_dir() and not info.filename.startswith("__MACOSX"):
+            return info.filename
+    raise ValueError("Zip archive contains no files")
+
+
+def detect_file_type(file_path: str, default: str = "csv") -> str:
+    """
+    File type from the name with compression suffixes removed
+
+    "trades.csv.gz" -> "csv"; for zip archives the member name is used.
+    """
+    name = os.path.basename(file_path).lower()
+    if os.path.exists(file_path) and detect_compression(file_path) == "zip":
+        with zipfile.ZipFile(file_path) as archive:
+            name = os.path.basename(_zip_member(archive)).lower()
+    parts = name.split('.')
+    while len(parts) > 2 and parts[-1] in COMPRESSION_EXTENSIONS:
+        parts.pop()
+    if len(parts) < 2 or parts[-1] in COMPRESSION_EXTENSIONS:
+        return default
+    return FILE_TYPE_ALIASES.get(parts[-1], parts[-1])
+
+
+class _CountingStream(io.RawIOBase):
+    """Binary stream wrapper that adds the bytes it reads to a SourceFile counter"""
+
+    def __init__(self, stream: IO[bytes], source: "SourceFile", attribute: str, closes: tuple = ()):
+        self.stream = stream
+        self.source = source
+        self.attribute = attribute
+        # Decompressors do not close the file objects they were given
+        self.closes = closes
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return self.stream.seekable()
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self.stream.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self.stream.tell()
+
+    def readinto(self, buffer) -> int:
+        data = self.stream.read(len(buffer))
+        buffer[:len(data)] = data
+        setattr(self.source, self.attribute, getattr(self.source, self.attribute) + len(data))
+        return len(data)
+
+    def close(self):
+        self.stream.close()
+        for closable in self.closes:
+            closable.close()
+        super().close()
+
+
+class SourceFile:
+    """
+    A source file that may be compressed
+
+    Every stream opened from it decompresses on the fly and counts both
+    the compressed bytes read from disk and the uncompressed bytes handed
+    to the readers, so throughput can be reported on both sides.
+    """
+
+    def __init__(self, file_path: str):
+        self.path = file_path
+        self.compression = detect_compression(file_path)
+        self.compressed_bytes = 0
+        self.uncompressed_bytes = 0
+
+    def open(self, text: bool = True, encoding: str = "utf-8") -> IO:
+        """Open a decompressing, counting stream over the file's contents"""
+        raw = _CountingStream(open(self.path, 'rb'), self, "compressed_bytes")
+        closes = (raw,)
+        if self.compression == "gzip":
+            stream = gzip.GzipFile(fileobj=raw)
+        elif self.compression == "bz2":
+            stream = bz2.BZ2File(raw)
+        elif self.compression == "xz":
+            stream = lzma.LZMAFile(raw)
+        elif self.compression == "zip":
+            archive = zipfile.ZipFile(raw)
+            stream = archive.open(_zip_member(archive))
+            closes = (archive, raw)
+        else:
+            stream, closes = raw, ()
+        binary = io.BufferedReader(_CountingStream(stream, self, "uncompressed_bytes", closes))
+        if text:
+            return io.TextIOWrapper(binary, encoding=encoding, newline='')
+        return binary
+
+    def throughput(self, elapsed_seconds: float) -> Dict[str, Any]:
+        """Bytes read and MB/s on the compressed and uncompressed side"""
+        def mb_per_sec(num_bytes: int) -> float:
+            return round(num_bytes / 1e6 / elapsed_seconds, 2) if elapsed_seconds > 0 else 0.0
+
+        return {
+            "compression": self.compression,
+            "compressed_bytes": self.compressed_bytes,
+            "uncompressed_bytes": self.uncompressed_bytes,
+            "compressed_mb_per_sec": mb_per_sec(self.compressed_bytes),
+            "uncompressed_mb_per_sec": mb_per_sec(self.uncompressed_bytes)
+        }
+
+
+def open_source(source: Union[str, SourceFile], text: bool = True, encoding: str = "utf-8") -> IO:
+    """Open a path or SourceFile as a (decompressed) stream"""
+    if not isinstance(source, SourceFile):
+        source = SourceFile(source)
+    return source.open(text=text, encoding=encoding)
@@ -0,0 +1,231 @@
+"""
+Hermes Config Generator - Dialect Detection
+Delimiter, quoting, header and encoding sniffing on a small byte prefix
+"""
+
+import codecs
+import csv
+import io
+import mmap
+import os
+import re
+from itertools import islice
+from typing import Dict, List, Any, Optional, Union
+
+from compression import SourceFile, detect_compression
+from type_inference import zero_padded_columns
+
+# Bytes inspected at the start of the file; enough for a few hundred wide rows
+SNIFF_BYTES = 256 * 1024
+
+# Rows parsed per candidate delimiter
+SNIFF_ROWS = 200
+
+DELIMITER_CANDIDATES = [",", "\t", "|", ";"]
+QUOTE_CANDIDATES = ['"', "'"]
+
+DEFAULT_DIALECT = {
+    "delimiter": ",",
+    "quotechar": '"',
+    "has_header": True,
+    "encoding": "utf-8",
+    "field_count": None,
+    "text_columns": []
+}
+
+# Byte-order marks, longest first so UTF-32 is not mistaken for UTF-16
+BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16")
+]
+
+_NUMBER = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
+
+def read_prefix(file_path: Union[str, SourceFile], size: int = SNIFF_BYTES) -> bytes:
+    """
+    First `size` bytes of the (decompressed) file
+
+    Plain files are read through a memory-mapped view, so only the pages
+    that are touched are faulted in and nothing past the prefix is read.
+    """
+    path = file_path.path if isinstance(file_path, SourceFile) else file_path
+    if detect_compression(path):
+        with SourceFile(path).open(text=False) as f:
+            return f.read(size)
+    length = min(size, os.path.getsize(path))
+    if length == 0:
+        return b""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ) as view:
+        return view[:length]
+
+
+def detect_encoding(prefix: bytes) -> str:
+    """Text encoding of a byte prefix: BOM, then pure ASCII, then UTF-8, then legacy code pages"""
+    for bom, encoding in BOMS:
+        if prefix.startswith(bom):
+            return encoding
+    # Fast path: most feeds are plain ASCII and need no trial decoding
+    if prefix.isascii():
+        return "utf-8"
+    try:
+        # final=False tolerates a multi-byte character cut at the end of the prefix
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    # cp1252 leaves a handful of bytes undefined; latin-1 decodes anything
+    try:
+        prefix.decode("cp1252")
+        return "cp1252"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+def _detect_quotechar(text: str) -> str:
+    """The quote character that most often opens or closes a field"""
+    delimiters = re.escape("".join(DELIMITER_CANDIDATES))
+    best, best_hits = '"', 0
+    for quote in QUOTE_CANDIDATES:
+        q = re.escape(quote)
+        hits = len(re.findall(rf"(?:^|[{delimiters}]){q}|{q}(?=[{delimiters}]|\r?$)", text, re.MULTILINE))
+        if hits > best_hits:
+            best, best_hits = quote, hits
+    return best
+
+
+def _parse_rows(text: str, delimiter: str, quotechar: str, complete: bool) -> List[List[str]]:
+    """Parse up to SNIFF_ROWS rows; a truncated prefix loses its last, possibly partial row"""
+    reader = csv.reader(io.StringIO(text), delimiter=delimiter, quotechar=quotechar)
+    try:
+        rows = [row for row in islice(reader, SNIFF_ROWS + 1) if row]
+    except csv.Error:
+        return []
+    if not complete or len(rows) > SNIFF_ROWS:
+        rows = rows[:-1]
+    return rows
+
+
+def _detect_delimiter(text: str, quotechar: str, complete: bool) -> Optional[str]:
+    """
+    The candidate that splits rows into the most consistent field count
+
+    Candidates are ranked by the share of rows having the modal field count,
+    then by that count; a delimiter must split rows into at least two fields.
+    """
+    best, best_score = None, (0.0, 0)
+    for delimiter in DELIMITER_CANDIDATES:
+        rows = _parse_rows(text, delimiter, quotechar, complete)
+        if not rows:
+            continue
+        counts = [len(row) for row in rows]
+        modal = max(set(counts), key=counts.count)
+        if modal < 2:
+            continue
+        score = (counts.count(modal) / len(counts), modal)
+        if score > best_score:
+            best, best_score = delimiter, score
+    return best
+
+
+def _is_number(value: str) -> bool:
+    return bool(_NUMBER.fullmatch(value.strip()))
+
+
+def _detect_header(rows: List[List[str]]) -> bool:
+    """
+    Whether the first row names the columns
+
+    A header is assumed when a column whose body is numeric has a
+    non-numeric first value, or, for all-text files, when the first row's
+    values are distinct and never repeat in their column.
+    """
+    if len(rows) < 2:
+        return True
+    first, body = rows[0], rows[1:]
+    width = len(first)
+    body = [row for row in body if len(row) == width]
+    if not body:
+        return True
+
+    numeric_columns = 0
+    for idx in range(width):
+        values = [row[idx] for row in body if row[idx].strip()]
+        if values and sum(_is_number(v) for v in values) >= 0.9 * len(values):
+            numeric_columns += 1
+            if not _is_number(first[idx]):
+                return True
+    if numeric_columns:
+        return False
+
+    names = [value.strip() for value in first]
+    if not all(names) or len(set(names)) < width:
+        return False
+    return all(first[idx] not in {row[idx] for row in body} for idx in range(width))
+
+
+def sniff_dialect(file_path: Union[str, SourceFile], prefix_bytes: int = SNIFF_BYTES) -> Dict[str, Any]:
+    """
+    Detect how a delimited text file is written
+
+    Args:
+        file_path: Path to the (possibly compressed) file
+        prefix_bytes: Bytes read from the start of the file
+
+    Returns:
+        {"delimiter", "quotechar", "has_header", "encoding", "field_count",
+         "text_columns"}; text_columns are read as strings so zero-padded
+        IDs keep their padding
+    """
+    prefix = read_prefix(file_path, prefix_bytes)
+    if not prefix:
+        return dict(DEFAULT_DIALECT)
+    complete = len(prefix) < prefix_bytes
+
+    encoding = detect_encoding(prefix)
+    # BOM-aware codecs drop the byte-order mark while decoding
+    text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(prefix, final=complete)
+
+    quotechar = _detect_quotechar(text)
+    delimiter = _detect_delimiter(text, quotechar, complete) or DEFAULT_DIALECT["delimiter"]
+    rows = _parse_rows(text, delimiter, quotechar, complete)
+    dialect = {
+        "delimiter": delimiter,
+        "quotechar": quotechar,
+        "has_header": _detect_header(rows),
+        "encoding": encoding,
+        "field_count": len(rows[0]) if rows else None
+    }
+    names = column_names(dialect) or (rows[0] if rows else [])
+    dialect["text_columns"] = zero_padded_columns(names, rows[1:] if dialect["has_header"] else rows)
+    return dialect
+
+
+def column_names(dialect: Dict[str, Any]) -> Optional[List[str]]:
+    """Generated column names for headerless files, None when the file has a header"""
+    if dialect.get("has_header", True) or not dialect.get("field_count"):
+        return None
+    return [f"column_{idx + 1}" for idx in range(dialect["field_count"])]
+
+
+def read_csv_options(dialect: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """pd.read_csv keyword arguments for a sniffed dialect (encoding is applied when opening)"""
+    if not dialect:
+        return {}
+    options = {"sep": dialect["delimiter"], "quotechar": dialect["quotechar"]}
+    names = column_names(dialect)
+    if names:
+        options.update(header=None, names=names)
+    if dialect.get("text_columns"):
+        options["dtype"] = {name: str for name in dialect["text_columns"]}
+    return options
+
+
+def csv_reader_options(dialect: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """csv.reader keyword arguments for a sniffed dialect"""
+    if not dialect:
+        return {}
+    return {"delimiter": dialect["delimiter"], "quotechar": dialect["quotechar"]}
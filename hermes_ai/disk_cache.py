@@ -0,0 +1,140 @@
+"""
+Hermes Config Generator - Disk Cache
+Persistent key/value cache with TTL and LRU eviction shared across processes
+"""
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+# Root directory for all Hermes caches
+CACHE_DIR = os.environ.get("HERMES_CACHE_DIR", "./.hermes_cache")
+
+
+class DiskCache:
+    """
+    SQLite-backed JSON cache with least-recently-used eviction
+
+    Entries older than ttl_seconds are treated as misses and dropped.
+    Eviction keeps both the entry count and, if max_bytes is set, the
+    total payload size within their limits.
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 1000,
+                 ttl_seconds: Optional[float] = None, max_bytes: Optional[int] = None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection; one per operation keeps the cache thread-safe"""
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        """Create the entries table if not exists"""
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON entries (last_access)")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or when the entry has expired"""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None and self._expired(row[1], now):
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any):
+        """Store value under key and evict least-recently-used entries over the limit"""
+        payload = json.dumps(value, default=str)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created_at, last_access, size) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, now, now, len(payload))
+            )
+            self._evict(conn)
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and created_at < now - self.ttl_seconds
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop expired entries, then least-recently-used entries beyond max_entries or max_bytes"""
+        if self.ttl_seconds is not None:
+            conn.execute("DELETE FROM entries WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        conn.execute(
+            """DELETE FROM entries WHERE key IN (
+                SELECT key FROM entries ORDER BY last_access DESC LIMIT -1 OFFSET ?
+            )""",
+            (self.max_entries,)
+        )
+        if self.max_bytes is not None:
+            conn.execute(
+                """DELETE FROM entries WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY last_access DESC, key) AS retained
+                        FROM entries
+                    ) WHERE retained > ?
+                )""",
+                (self.max_bytes,)
+            )
+
+    def delete(self, key: str):
+        """Remove a single entry"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        """Remove all entries and reset counters"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries")
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def size_bytes(self) -> int:
+        """Total payload size of all entries"""
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self),
+            "max_entries": self.max_entries
+        }
+        if self.max_bytes is not None:
+            stats.update(size_bytes=self.size_bytes(), max_bytes=self.max_bytes)
+        if self.ttl_seconds is not None:
+            stats["ttl_seconds"] = self.ttl_seconds
+        return stats
@@ -0,0 +1,67 @@
+"""
+Hermes Config Generator - ETL Cache
+Reuses ETL specs for requests that differ only in formatting
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Any, Optional
+
+from disk_cache import DiskCache, CACHE_DIR
+
+# Generated specs are reused for a month; the key already covers the schema shape
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+
+
+def schema_shape_fingerprint(schema: Dict[str, Any]) -> str:
+    """Hash of column names and types only, ignoring statistics and sample values"""
+    shape = [[col.get("name"), col.get("semantic_type") or col.get("dtype")] for col in schema.get("columns", [])]
+    return hashlib.blake2b(json.dumps(shape, default=str).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def canonical_description(description: str) -> str:
+    """Lower-cased description with runs of whitespace collapsed"""
+    return re.sub(r"\s+", " ", description).strip().lower()
+
+
+class ETLCache:
+    """Persistent cache of generated ETL specs keyed by a normalized request"""
+
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+                 max_entries: int = 1000):
+        self.cache = DiskCache(db_path or os.path.join(CACHE_DIR, "etl_cache.sqlite"), max_entries,
+                               ttl_seconds=ttl_seconds)
+
+    def make_key(self, source_schema: Dict[str, Any], target_table: str, description: str) -> str:
+        """Cache key from the schema shape, target table and canonical description"""
+        request = [schema_shape_fingerprint(source_schema), target_table.strip().lower(),
+                   canonical_description(description)]
+        return hashlib.sha256(json.dumps(request).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached spec, with its original metadata, or None"""
+        return self.cache.get(key)
+
+    def put(self, key: str, etl_json: Dict[str, Any]):
+        """Store a generated spec"""
+        spec = copy.deepcopy(etl_json)
+        spec.get("metadata", {}).pop("cache_hit", None)
+        self.cache.put(key, spec)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        return self.cache.stats()
+
+
+_etl_cache = None
+
+
+def get_etl_cache() -> ETLCache:
+    """Get the process-wide ETL cache instance"""
+    global _etl_cache
+    if _etl_cache is None:
+        _etl_cache = ETLCache()
+    return _etl_cache
@@ -3,22 +3,59 @@ ETL Transformation Agent
 Converts natural language transformation descriptions into executable ETL JSON
 """
 
-import json
-from typing import Dict, List, Any
+import math
+import time
+from typing import Dict, List, Any, Optional, Tuple, Callable, Iterator
 from datetime import datetime
-from openai import OpenAI
 
-# Initialize OpenAI client
-client = OpenAI()
+from sketches import key_columns
+from etl_cache import ETLCache, get_etl_cache
+from llm_streaming import JSONSectionParser, iter_completion_text
+from json_repair import extract_json
+from prompt_packing import pack_schema, estimate_tokens, estimate_messages_tokens, DEFAULT_TOKEN_BUDGET
+from llm_telemetry import get_telemetry
+from llm_resilience import ResiliencePolicy
+from llm_client import get_openai_client
+from llm_cache import request_key
+from single_flight import get_single_flight
+
+# ETL specs are longer than configs (max_tokens 3000), so they get a longer deadline
+ETL_DEADLINE_SECONDS = 90.0
+
+# Target SQL types for the semantic types reported by the Schema Analyzer
+SEMANTIC_TARGET_TYPES = {
+    "boolean": "BOOLEAN",
+    "date": "DATE",
+    "timestamp": "TIMESTAMP",
+    "time": "STRING",
+    "integer": "INTEGER",
+    "decimal": "DECIMAL",
+    "identifier": "STRING",
+    "string": "STRING"
+}
+
+# Text columns with at most this many distinct values get an accepted-values rule
+ACCEPTED_VALUES_MAX = 5
+
+# Share of the p01-p99 spread added on each side of a RANGE rule built from a sample
+RANGE_HEADROOM = 0.5
+
+# Top-level sections the prompt asks for; any lost from a completion come from the fallback transformation
+ETL_SECTIONS = ["column_mappings", "derived_columns", "filter_conditions", "aggregations", "data_quality_rules",
+                "join_specifications", "pre_processing_steps", "post_processing_steps", "sql_generation_metadata"]
 
 
 class ETLTransformationAgent:
     """Agent responsible for generating ETL transformation specifications from natural language"""
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = True, prompt_token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET,
+                 resilience: Optional[ResiliencePolicy] = None):
         self.name = "ETL Transformation Agent"
         self.role = "Converts natural language ETL requirements into executable JSON specifications"
         self.memory = []
+        self.cache = get_etl_cache() if use_cache else None
+        self.prompt_token_budget = prompt_token_budget
+        self.resilience = resilience or ResiliencePolicy(deadline_seconds=ETL_DEADLINE_SECONDS)
     
     def log_action(self, action: str, result: Any):
         """Log agent actions for transparency"""
@@ -35,7 +72,9 @@ class ETLTransformationAgent:
     def generate_etl_transformation(self, 
                                    source_schema: Dict[str, Any],
                                    target_table: str,
-                                   transformation_description: str) -> Dict[str, Any]:
+                                   transformation_description: str,
+                                   use_cache: bool = True,
+                                   on_section: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
         """
         Generate ETL transformation JSON from natural language description
         
@@ -43,16 +82,138 @@ class ETLTransformationAgent:
             source_schema: Schema of the source data (from Schema Analyzer)
             target_table: Name of the destination table
             transformation_description: Natural language description of transformations
+            use_cache: Reuse a spec generated for the same column names and types,
+                target table and description (ignoring case and whitespace)
+            on_section: Optional callback receiving (name, value) for each
+                top-level section (column_mappings, ...) as the LLM output streams in
         
         Returns:
-            Complete ETL transformation JSON with mappings and SQL logic
+            Complete ETL transformation JSON with mappings and SQL logic;
+            metadata.cache_hit tells whether it came from the cache
+        """
+        if on_section is not None:
+            for event in self.generate_etl_transformation_stream(
+                    source_schema, target_table, transformation_description, use_cache):
+                if event["event"] == "section":
+                    on_section(event["section"], event["value"])
+                else:
+                    return event["etl_json"]
+        
+        cache = self.cache if use_cache else None
+        cache_key = cache.make_key(source_schema, target_table, transformation_description) if cache else None
+        etl_json = self._cached_transformation(cache, cache_key, target_table)
+        if etl_json is not None:
+            return etl_json
+        
+        model, messages, params = self._build_request(source_schema, target_table, transformation_description)
+        
+        try:
+            # Call LLM, or wait for the identical call another session already made
+            etl_text, shared = get_single_flight().do(
+                f"etl:{request_key(model, messages, **params)}", lambda: self._complete(model, messages, params)
+            )
+            if shared:
+                self.log_action("llm_coalesced", get_single_flight().stats())
+            
+            # Extract and parse JSON; the leader of a shared call caches the spec
+            etl_json, repair = extract_json(etl_text, ETL_SECTIONS)
+            return self._finish_transformation(etl_json, repair, source_schema, target_table,
+                                               transformation_description, None if shared else cache, cache_key)
+            
+        except Exception as e:
+            return self._fallback_after_error(e, source_schema, target_table)
+    
+    def generate_etl_transformation_stream(self,
+                                           source_schema: Dict[str, Any],
+                                           target_table: str,
+                                           transformation_description: str,
+                                           use_cache: bool = True) -> Iterator[Dict[str, Any]]:
         """
+        Stream the ETL specification, yielding events as the completion arrives
+        
+        Yields:
+            {"event": "section", "section", "value", "elapsed_seconds"} for each
+            top-level section as soon as it is complete, then one
+            {"event": "complete", "etl_json", "cache_hit", "elapsed_seconds"}
+            (with "error" if the fallback transformation was used)
+        """
+        started = time.perf_counter()
+        cache = self.cache if use_cache else None
+        cache_key = cache.make_key(source_schema, target_table, transformation_description) if cache else None
+        etl_json = self._cached_transformation(cache, cache_key, target_table)
+        if etl_json is not None:
+            for name, value in etl_json.items():
+                yield {"event": "section", "section": name, "value": value, "elapsed_seconds": 0.0}
+            yield {"event": "complete", "etl_json": etl_json, "cache_hit": True,
+                   "elapsed_seconds": round(time.perf_counter() - started, 3)}
+            return
+        
+        model, messages, params = self._build_request(source_schema, target_table, transformation_description)
+        parser = JSONSectionParser()
+        flights = get_single_flight()
+        flight, leader = flights.join(f"etl:{request_key(model, messages, **params)}")
+        try:
+            if leader:
+                self.resilience.check()
+                with get_telemetry().track(self.name, model, streamed=True) as call:
+                    pieces = self.resilience.stream(
+                        lambda timeout: iter_completion_text(get_openai_client(), model, messages, call=call,
+                                                             timeout=timeout, **params),
+                        call
+                    )
+                    for piece in pieces:
+                        for name, value in parser.feed(piece):
+                            yield {"event": "section", "section": name, "value": value,
+                                   "elapsed_seconds": round(time.perf_counter() - started, 3)}
+                flights.land(flight, parser.text.strip())
+            else:
+                # Another session is already making this exact call; replay its completion
+                for name, value in parser.feed(flight.wait()):
+                    yield {"event": "section", "section": name, "value": value,
+                           "elapsed_seconds": round(time.perf_counter() - started, 3)}
+                self.log_action("llm_coalesced", flights.stats())
+            flight = None
+            etl_json, repair = parser.close(ETL_SECTIONS)
+            etl_json = self._finish_transformation(etl_json, repair, source_schema, target_table,
+                                                   transformation_description, cache if leader else None, cache_key)
+            yield {"event": "complete", "etl_json": etl_json, "cache_hit": False,
+                   "elapsed_seconds": round(time.perf_counter() - started, 3)}
+        except Exception as e:
+            if leader and flight is not None:
+                flights.land(flight, error=e)
+                flight = None
+            yield {"event": "complete", "etl_json": self._fallback_after_error(e, source_schema, target_table),
+                   "cache_hit": False, "elapsed_seconds": round(time.perf_counter() - started, 3), "error": str(e)}
+        finally:
+            if leader and flight is not None:
+                # The consumer stopped reading before the completion finished
+                flights.land(flight, error=RuntimeError("Streamed request abandoned before it completed"))
+    
+    def _complete(self, model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+        """Text of one non-streamed completion, within the resilience policy and tracked in telemetry"""
+        self.resilience.check()
+        with get_telemetry().track(self.name, model) as call:
+            response = self.resilience.call(
+                lambda timeout: get_openai_client().chat.completions.create(model=model, messages=messages,
+                                                               timeout=timeout, **params),
+                call
+            )
+            etl_text = response.choices[0].message.content.strip()
+            call.set_usage(getattr(response, "usage", None),
+                           prompt_tokens=estimate_messages_tokens(messages),
+                           completion_tokens=estimate_tokens(etl_text))
+        return etl_text
+    
+    def _build_request(self, source_schema: Dict[str, Any], target_table: str,
+                       transformation_description: str) -> Tuple[str, List[Dict[str, str]], Dict[str, Any]]:
+        """(model, messages, parameters) of the chat completion for one request"""
+        packed_schema, packing = pack_schema(source_schema, self.prompt_token_budget)
         
         # Prepare detailed prompt for LLM
         prompt = f"""You are an expert ETL developer. Generate a comprehensive ETL transformation specification in JSON format.
 
-SOURCE SCHEMA:
-{json.dumps(source_schema, indent=2)}
+SOURCE SCHEMA (columns grouped by type; "pos" is the column's position in the file):
+{packed_schema}
 
 TARGET TABLE: {target_table}
 
@@ -131,71 +292,101 @@ IMPORTANT:
 - Include sensible data quality rules
 """
 
-        try:
-            # Call LLM
-            response = client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are an expert ETL developer. Generate detailed, executable ETL transformation specifications in JSON format. Be specific and include actual SQL logic."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                temperature=0.2,  # Low temperature for consistency
-                max_tokens=3000   # Increased for detailed transformations
-            )
-            
-            # Extract and parse JSON
-            etl_text = response.choices[0].message.content.strip()
-            
-            # Remove markdown code blocks if present
-            if etl_text.startswith("```"):
-                etl_text = etl_text.split("```")[1]
-                if etl_text.startswith("json"):
-                    etl_text = etl_text[4:]
-            
-            etl_json = json.loads(etl_text)
-            
-            # Add metadata
-            etl_json["metadata"] = {
-                "generated_at": datetime.now().isoformat(),
-                "generated_by": "ETL Transformation Agent",
-                "source_columns_count": len(source_schema.get("columns", [])),
-                "transformation_description": transformation_description
-            }
-            
-            self.log_action("generate_etl_transformation", {
-                "success": True, 
-                "target_table": target_table,
-                "mappings_count": len(etl_json.get("column_mappings", []))
-            })
-            
-            return etl_json
-            
-        except Exception as e:
-            error_result = {
-                "error": str(e),
-                "fallback_transformation": self._generate_fallback_transformation(
-                    source_schema, target_table
-                )
+        messages = [
+            {
+                "role": "system", 
+                "content": "You are an expert ETL developer. Generate detailed, executable ETL transformation specifications in JSON format. Be specific and include actual SQL logic."
+            },
+            {
+                "role": "user", 
+                "content": prompt
             }
-            self.log_action("generate_etl_transformation_error", error_result)
-            return error_result["fallback_transformation"]
+        ]
+        params = {
+            "temperature": 0.2,  # Low temperature for consistency
+            "max_tokens": 3000   # Increased for detailed transformations
+        }
+        self.log_action("prompt_packed", {**packing, "prompt_tokens": estimate_messages_tokens(messages)})
+        return "gpt-4.1-mini", messages, params
+    
+    def _cached_transformation(self, cache: Optional[ETLCache], cache_key: Optional[str],
+                               target_table: str) -> Optional[Dict[str, Any]]:
+        """A previously generated spec for the same normalized request, or None"""
+        if cache is None:
+            return None
+        etl_json = cache.get(cache_key)
+        if etl_json is not None:
+            # generated_at is kept from the original run
+            etl_json.setdefault("metadata", {})["cache_hit"] = True
+            self.log_action("etl_cache_hit", {"target_table": target_table, **cache.stats()})
+        return etl_json
+    
+    def _finish_transformation(self, etl_json: Dict[str, Any], repair: Dict[str, Any],
+                               source_schema: Dict[str, Any], target_table: str,
+                               transformation_description: str,
+                               cache: Optional[ETLCache], cache_key: Optional[str]) -> Dict[str, Any]:
+        """
+        Add metadata to a parsed LLM spec and cache it
+
+        Sections lost to truncation are replaced with those of the fallback
+        transformation; such specs are not cached.
+        """
+        lost = repair["truncated_sections"] + repair["missing_sections"]
+        filled = []
+        if lost:
+            fallback = self._generate_fallback_transformation(source_schema, target_table)
+            filled = [name for name in lost if name in fallback]
+            for name in filled:
+                etl_json[name] = fallback[name]
+        if repair["repaired"] or filled:
+            self.log_action("completion_salvaged", {**repair, "sections_filled": filled})
+        
+        etl_json["metadata"] = {
+            "generated_at": datetime.now().isoformat(),
+            "generated_by": "ETL Transformation Agent",
+            "source_columns_count": len(source_schema.get("columns", [])),
+            "transformation_description": transformation_description,
+            "cache_hit": False
+        }
+        if filled:
+            etl_json["metadata"]["sections_filled"] = filled
+        
+        # Fallback specs are never cached, so a later call retries the LLM
+        if cache is not None and not repair["truncated"]:
+            cache.put(cache_key, etl_json)
+        
+        self.log_action("generate_etl_transformation", {
+            "success": True, 
+            "target_table": target_table,
+            "mappings_count": len(etl_json.get("column_mappings", []))
+        })
+        return etl_json
+    
+    def _fallback_after_error(self, error: Exception, source_schema: Dict[str, Any],
+                              target_table: str) -> Dict[str, Any]:
+        """Log an LLM failure and return the rule-based transformation"""
+        error_result = {
+            "error": str(error),
+            "fallback_transformation": self._generate_fallback_transformation(
+                source_schema, target_table
+            )
+        }
+        self.log_action("generate_etl_transformation_error", error_result)
+        return error_result["fallback_transformation"]
     
     def _generate_fallback_transformation(self, source_schema: Dict, target_table: str) -> Dict:
-        """Generate basic transformation if LLM fails"""
+        """Generate basic transformation if LLM fails, guided by the analyzer's column statistics"""
         columns = source_schema.get("columns", [])
+        keys = key_columns(source_schema)
+        key_column = keys[0] if keys else (columns[0]["name"] if columns else "id")
+        date_columns = [col["name"] for col in columns if col.get("semantic_type") in ("date", "timestamp")]
         
         return {
             "column_mappings": [
                 {
                     "source_column": col["name"],
                     "target_column": col["name"],
-                    "data_type": self._infer_target_type(col["dtype"]),
+                    "data_type": self._infer_target_type(col["dtype"], col.get("semantic_type")),
                     "transformation_type": "DIRECT",
                     "transformation_logic": col["name"],
                     "is_nullable": True,
@@ -211,17 +402,17 @@ IMPORTANT:
                 {
                     "rule_name": "check_not_null_primary_key",
                     "rule_type": "NOT_NULL",
-                    "column_name": columns[0]["name"] if columns else "id",
-                    "validation_logic": f"{columns[0]['name']} IS NOT NULL",
+                    "column_name": key_column,
+                    "validation_logic": f"{key_column} IS NOT NULL",
                     "action_on_failure": "REJECT"
                 }
-            ],
+            ] + self._profile_quality_rules(columns, bool(source_schema.get("profile_complete"))),
             "join_specifications": [],
             "pre_processing_steps": [
                 {
                     "step_order": 1,
                     "step_type": "DEDUPLICATION",
-                    "step_logic": f"Remove duplicates based on {columns[0]['name']}"
+                    "step_logic": f"Remove duplicates based on {key_column}"
                 }
             ],
             "post_processing_steps": [
@@ -235,8 +426,8 @@ IMPORTANT:
                 "source_table_name": "staging_table",
                 "target_table_name": target_table,
                 "target_schema": "gold",
-                "partition_columns": [],
-                "sort_columns": [],
+                "partition_columns": date_columns[:1],
+                "sort_columns": [key_column] if keys else [],
                 "incremental_load": False,
                 "incremental_key_column": None
             },
@@ -247,8 +438,65 @@ IMPORTANT:
             }
         }
     
-    def _infer_target_type(self, pandas_dtype: str) -> str:
-        """Infer target SQL data type from pandas dtype"""
+    def _profile_quality_rules(self, columns: List[Dict[str, Any]], complete: bool) -> List[Dict[str, Any]]:
+        """
+        RANGE rules from observed numeric bounds and accepted-values rules from frequent values
+        
+        Only a complete (full-file stream) profile has seen the true min and
+        max. A sample's extremes would flag valid rows in the rest of the
+        feed, so sampled columns get p01/p99 widened by RANGE_HEADROOM,
+        marked as warnings.
+        """
+        rules = []
+        for col in columns:
+            name = col["name"]
+            # Exact bounds are kept alongside the t-digest centroids
+            digest = col.get("sketches", {}).get("tdigest", {})
+            bounds = self._range_bounds(col, digest, complete) if digest.get("min") is not None else None
+            if bounds is not None:
+                low, high = (int(v) if float(v).is_integer() else v for v in bounds)
+                rules.append({
+                    "rule_name": f"check_range_{name}",
+                    "rule_type": "RANGE",
+                    "column_name": name,
+                    "validation_logic": f"{name} BETWEEN {low} AND {high}",
+                    "action_on_failure": "FLAG",
+                    "severity": "ERROR" if complete else "WARNING"
+                })
+            elif col.get("semantic_type") == "string" and 0 < col.get("unique_count", 0) <= ACCEPTED_VALUES_MAX \
+                    and len(col.get("top_values", [])) == col["unique_count"]:
+                values = ", ".join("'" + str(item["value"]).replace("'", "''") + "'" for item in col["top_values"])
+                rules.append({
+                    "rule_name": f"check_accepted_values_{name}",
+                    "rule_type": "CUSTOM",
+                    "column_name": name,
+                    "validation_logic": f"{name} IN ({values})",
+                    "action_on_failure": "FLAG"
+                })
+        return rules
+    
+    def _range_bounds(self, col: Dict[str, Any], digest: Dict[str, Any],
+                      complete: bool) -> Optional[Tuple[float, float]]:
+        """Exact min/max of a complete profile, else p01/p99 widened by RANGE_HEADROOM"""
+        if complete:
+            return digest["min"], digest["max"]
+        quantiles = col.get("quantiles", {})
+        if quantiles.get("p01") is None or quantiles.get("p99") is None:
+            return None
+        low, high = quantiles["p01"], quantiles["p99"]
+        headroom = (high - low) * RANGE_HEADROOM
+        # Headroom never pushes a non-negative column below zero
+        low = max(low - headroom, 0) if low >= 0 else low - headroom
+        high = high + headroom
+        if col.get("semantic_type") == "integer":
+            return math.floor(low), math.ceil(high)
+        return float(f"{low:.6g}"), float(f"{high:.6g}")
+    
+    def _infer_target_type(self, pandas_dtype: str, semantic_type: Optional[str] = None) -> str:
+        """Infer target SQL data type, preferring the analyzer's semantic type over the pandas dtype"""
+        if semantic_type in SEMANTIC_TARGET_TYPES:
+            return SEMANTIC_TARGET_TYPES[semantic_type]
+        
         dtype_lower = pandas_dtype.lower()
         
         if 'int' in dtype_lower:
@@ -0,0 +1,286 @@
+"""
+Hermes Config Generator - File Readers
+Incremental readers that yield records without materializing whole files
+"""
+
+import csv
+import io
+import json
+import xml.etree.ElementTree as ET
+import pandas as pd
+from typing import Dict, List, Any, Optional, Iterator, TextIO, Tuple, Union
+
+from compression import SourceFile, open_source
+from type_inference import zero_padded_columns
+
+# Source files are given as a path or as a SourceFile (to share byte counters)
+Source = Union[str, SourceFile]
+
+# Characters read from disk per refill of the parse buffer
+READ_BLOCK_SIZE = 64 * 1024
+
+JSON_WHITESPACE = " \t\r\n"
+
+# Elements inspected when looking for the repeating XML record element
+XML_PROBE_ELEMENTS = 5000
+
+
+class JSONRecordReader:
+    """
+    Lazily yields records from a JSON array or JSON Lines document
+
+    Only the record currently being decoded (plus one read block) is held in
+    memory, so stopping after N records costs memory proportional to N.
+    """
+
+    def __init__(self, stream: TextIO, block_size: int = READ_BLOCK_SIZE):
+        self.stream = stream
+        self.block_size = block_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _refill(self) -> bool:
+        """Append the next block to the unread part of the buffer"""
+        if self.eof:
+            return False
+        block = self.stream.read(self.block_size)
+        if not block:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + block
+        self.pos = 0
+        return True
+
+    def _next_char(self, skip: str) -> str:
+        """Skip over the given characters and return the next one ('' at EOF)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in skip:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._refill():
+                return ""
+
+    def _decode_value(self) -> Any:
+        """Decode one complete JSON value starting at the current position"""
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number at the end of the buffer may continue in the next block
+                if end < len(self.buffer) or self.eof or not isinstance(value, (int, float)):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Grow reads geometrically so a very large record is not re-parsed per block
+            if len(self.buffer) - self.pos >= self.block_size:
+                self.block_size *= 2
+            self._refill()
+
+    def __iter__(self) -> Iterator[Any]:
+        first = self._next_char(JSON_WHITESPACE)
+        if first == "[":
+            self.pos += 1
+            while True:
+                char = self._next_char(JSON_WHITESPACE + ",")
+                if char in ("]", ""):
+                    return
+                yield self._decode_value()
+        else:
+            # JSON Lines, or a single top-level object
+            while self._next_char(JSON_WHITESPACE):
+                yield self._decode_value()
+
+
+def iter_json_records(file_path: Source, limit: Optional[int] = None) -> Iterator[Any]:
+    """Yield records from a (possibly compressed) JSON array or JSON Lines file, stopping after limit"""
+    with open_source(file_path) as f:
+        for count, record in enumerate(JSONRecordReader(f)):
+            if limit is not None and count >= limit:
+                return
+            yield record
+
+
+def records_to_frame(records: List[Any]) -> pd.DataFrame:
+    """
+    Build a DataFrame from decoded records
+
+    Goes through pd.read_json so date and numeric handling matches what a
+    full-document pd.read_json would have produced. JSON strings stay
+    strings (dtype=False); coercing "00000001" to 1 would hide zero-padded
+    IDs from type inference.
+    """
+    if not records:
+        return pd.DataFrame()
+    return pd.read_json(io.StringIO(json.dumps(records, default=str)), dtype=False, precise_float=True)
+
+
+def read_json_sample(file_path: Source, nrows: int = 100) -> pd.DataFrame:
+    """Read the first nrows records of a JSON feed"""
+    return records_to_frame(list(iter_json_records(file_path, limit=nrows)))
+
+
+def iter_json_chunks(file_path: Source, chunk_rows: int,
+                     max_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """Yield DataFrames of up to chunk_rows records from a JSON feed"""
+    batch = []
+    for record in iter_json_records(file_path, limit=max_rows):
+        batch.append(record)
+        if len(batch) >= chunk_rows:
+            yield records_to_frame(batch)
+            batch = []
+    if batch:
+        yield records_to_frame(batch)
+
+
+def _local_name(tag: str) -> str:
+    """Strip an XML namespace from a tag"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def detect_xml_record_element(file_path: Source, probe_elements: int = XML_PROBE_ELEMENTS) -> Dict[str, Any]:
+    """
+    Find the repeating record element of an XML feed
+
+    Counts element tags by depth over the first probe_elements elements and
+    picks the shallowest tag that repeats and has children or attributes.
+
+    Returns:
+        {"root_element", "record_element"}
+    """
+    counts: Dict[Tuple[int, str], int] = {}
+    structured = set()
+    stack = []
+    root = None
+    root_tag = None
+    seen = 0
+    with open_source(file_path, text=False) as f:
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                key = (len(stack), _local_name(elem.tag))
+                if root is None:
+                    root, root_tag = elem, key[1]
+                else:
+                    counts[key] = counts.get(key, 0) + 1
+                    if elem.attrib:
+                        structured.add(key)
+                    if len(stack) > 1:
+                        structured.add(stack[-1])
+                stack.append(key)
+                seen += 1
+                continue
+            stack.pop()
+            if len(stack) == 1:
+                root.clear()
+            if seen >= probe_elements:
+                break
+
+    repeating = [key for key, count in counts.items() if count > 1 and key in structured]
+    # A single record or a flat document: fall back to the first child level
+    candidates = sorted(repeating or counts, key=lambda key: (key[0], -counts[key]))
+    record_tag = candidates[0][1] if candidates else root_tag
+    return {"root_element": root_tag, "record_element": record_tag}
+
+
+def _flatten_xml_record(elem: ET.Element) -> Dict[str, str]:
+    """
+    Flatten a record element into {column: text}
+
+    Child paths are joined with underscores and attributes become columns
+    of their own. A leaf's text is a column when it has text or nothing
+    else, so attribute-only leaves like <item sku="A"/> add no empty column.
+    When a child repeats, its first occurrence is kept.
+    """
+    record = {}
+
+    def visit(node: ET.Element, prefix: str):
+        for name, value in node.attrib.items():
+            record.setdefault(f"{prefix}{_local_name(name)}", value)
+        children = list(node)
+        if not children:
+            text = (node.text or "").strip()
+            if prefix and (text or not node.attrib):
+                record.setdefault(prefix.rstrip('_'), text if text else None)
+            return
+        for child in children:
+            visit(child, f"{prefix}{_local_name(child.tag)}_")
+
+    visit(elem, "")
+    return record
+
+
+def iter_xml_records(file_path: Source, record_element: Optional[str] = None,
+                     limit: Optional[int] = None) -> Iterator[Dict[str, str]]:
+    """
+    Yield flattened records from an XML feed with constant memory
+
+    Each record is flattened when its end tag is parsed and then removed
+    from the tree, as is anything outside records, so memory does not grow
+    with the number of records.
+    """
+    if record_element is None:
+        record_element = detect_xml_record_element(file_path)["record_element"]
+
+    count = 0
+    stack = []
+    record_depth = None
+    with open_source(file_path, text=False) as f:
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                if record_depth is None and _local_name(elem.tag) == record_element:
+                    record_depth = len(stack)
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            if record_depth is None:
+                if stack:
+                    stack[-1].remove(elem)
+                continue
+            if len(stack) != record_depth:
+                # Still inside a record; keep children until the record is flattened
+                continue
+
+            record_depth = None
+            if limit is not None and count >= limit:
+                return
+            yield _flatten_xml_record(elem)
+            count += 1
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+
+
+def text_records_to_frame(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Build a DataFrame from all-text records with the same dtype inference as pd.read_csv"""
+    if not records:
+        return pd.DataFrame()
+    columns = list(dict.fromkeys(key for record in records for key in record))
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+    writer.writeheader()
+    writer.writerows(records)
+    buffer.seek(0)
+    padded = zero_padded_columns(columns, [[record.get(name) for name in columns] for record in records])
+    return pd.read_csv(buffer, dtype={name: str for name in padded})
+
+
+def read_xml_sample(file_path: Source, nrows: int = 100) -> pd.DataFrame:
+    """Read the first nrows records of an XML feed"""
+    return text_records_to_frame(list(iter_xml_records(file_path, limit=nrows)))
+
+
+def iter_xml_chunks(file_path: Source, chunk_rows: int,
+                    max_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """Yield DataFrames of up to chunk_rows flattened records from an XML feed"""
+    batch = []
+    for record in iter_xml_records(file_path, limit=max_rows):
+        batch.append(record)
+        if len(batch) >= chunk_rows:
+            yield text_records_to_frame(batch)
+            batch = []
+    if batch:
+        yield text_records_to_frame(batch)
@@ -0,0 +1,170 @@
+"""
+Hermes Config Generator - JSON Repair
+Tolerant extraction of the JSON object in an LLM completion, salvaging malformed or truncated output
+"""
+
+import json
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+_decoder = json.JSONDecoder()
+
+# Characters that may continue a bare number or literal (true, false, null)
+TOKEN_CHARS = frozenset("0123456789+-.eEtrufalsn")
+
+CLOSERS = {"{": "}", "[": "]"}
+
+# Raw control characters LLMs leave inside strings, as JSON escapes
+CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+
+
+def _empty_report() -> Dict[str, Any]:
+    return {"repaired": False, "repairs": [], "truncated": False,
+            "truncated_sections": [], "missing_sections": []}
+
+
+def repair_json_text(text: str, start: int = 0) -> Tuple[str, Dict[str, Any]]:
+    """
+    Rewrite the object opening at text[start] as valid JSON text
+
+    A single pass keeps a bracket stack and string state. Trailing commas
+    are dropped, single-quoted strings become double-quoted, raw control
+    characters in strings are escaped and anything after the outermost
+    object closes is ignored. If the text ends first (max_tokens
+    truncation), it is cut back to the last complete value and the open
+    brackets are closed.
+    """
+    report = _empty_report()
+    repairs = set()
+    out: List[str] = []
+    stack: List[str] = []
+    quote = None          # '"' or "'" while inside a string
+    escape = False
+    in_token = False
+    string_is_value = False
+    last_significant = ""
+    top_key = None        # key of the top-level member being written
+    key_start = None
+    # (output length, open brackets, top-level key) where the output could be closed off
+    safe = (0, "", None)
+
+    i, end = start, len(text)
+    while i < end:
+        ch = text[i]
+        if quote is not None:
+            if escape:
+                escape = False
+                if ch == "'":
+                    # \' is not a JSON escape
+                    out[-1] = "'"
+                    repairs.add("invalid_escape")
+                else:
+                    out.append(ch)
+            elif ch == "\\":
+                escape = True
+                out.append(ch)
+            elif ch == quote:
+                quote = None
+                out.append('"')
+                if string_is_value:
+                    safe = (len(out), "".join(stack), top_key)
+                elif len(stack) == 1:
+                    top_key = "".join(out[key_start:-1])
+            elif ch == '"':
+                out.append('\\"')
+            elif ch in CONTROL_ESCAPES:
+                out.append(CONTROL_ESCAPES[ch])
+                repairs.add("control_characters")
+            else:
+                out.append(ch)
+            i += 1
+            continue
+
+        if in_token and ch not in TOKEN_CHARS:
+            in_token = False
+            safe = (len(out), "".join(stack), top_key)
+
+        if ch == '"' or ch == "'":
+            if ch == "'":
+                repairs.add("single_quotes")
+            quote = ch
+            string_is_value = bool(stack) and (stack[-1] == "[" or last_significant == ":")
+            key_start = len(out) + 1
+            out.append('"')
+        elif ch in "{[":
+            stack.append(ch)
+            out.append(ch)
+            safe = (len(out), "".join(stack), top_key)
+        elif ch in "}]":
+            if not stack or CLOSERS[stack[-1]] != ch:
+                repairs.add("unbalanced_brackets")
+                i += 1
+                continue
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+                repairs.add("trailing_commas")
+            stack.pop()
+            out.append(ch)
+            if not stack:
+                break
+            if len(stack) == 1:
+                top_key = None
+            safe = (len(out), "".join(stack), top_key)
+        elif ch in TOKEN_CHARS:
+            in_token = True
+            out.append(ch)
+        elif ch == "," and len(stack) == 1:
+            top_key = None
+            out.append(ch)
+        else:
+            out.append(ch)
+
+        if not ch.isspace():
+            last_significant = ch
+        i += 1
+
+    if stack:
+        length, open_brackets, cut_key = safe
+        del out[length:]
+        out.extend(CLOSERS[bracket] for bracket in reversed(open_brackets))
+        report["truncated"] = True
+        if cut_key is not None and len(open_brackets) > 1:
+            report["truncated_sections"].append(cut_key)
+        repairs.add("truncation")
+
+    report["repairs"] = sorted(repairs)
+    report["repaired"] = bool(repairs)
+    return "".join(out), report
+
+
+def extract_json(text: str, expected_sections: Optional[Sequence[str]] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Parse the outermost JSON object in an LLM completion
+
+    Markdown fences and prose around the object are ignored. Well-formed
+    objects are decoded directly; anything else goes through
+    repair_json_text. Returns (object, report) where the report lists the
+    repairs made, whether the completion was truncated, the top-level
+    sections cut short and the expected sections that are absent. Raises
+    ValueError if there is no object or it cannot be repaired.
+    """
+    start = text.find("{")
+    if start < 0:
+        raise ValueError("Completion contains no JSON object")
+
+    try:
+        obj, _ = _decoder.raw_decode(text, start)
+        report = _empty_report()
+    except ValueError:
+        repaired, report = repair_json_text(text, start)
+        try:
+            obj = json.loads(repaired)
+        except ValueError as e:
+            raise ValueError(f"Completion JSON could not be repaired ({', '.join(report['repairs'])}): {e}") from e
+
+    if not isinstance(obj, dict):
+        raise ValueError("Completion JSON is not an object")
+    if expected_sections:
+        report["missing_sections"] = [name for name in expected_sections if name not in obj]
+    return obj, report
@@ -0,0 +1,62 @@
+"""
+Hermes Config Generator - LLM Response Cache
+Reuses completions for identical model, parameters and prompt
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Any, Optional
+
+from disk_cache import DiskCache, CACHE_DIR
+
+# Cached completions expire after a week so prompt or model drift is picked up
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+# Total size of stored completions
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def request_key(model: str, messages: List[Dict[str, str]], **params) -> str:
+    """Canonical hash of a chat completion request"""
+    canonical = json.dumps({"model": model, "messages": messages, "params": params},
+                           sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Persistent cache of completion texts with TTL, LRU eviction and latency accounting"""
+
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+                 max_bytes: Optional[int] = DEFAULT_MAX_BYTES, max_entries: int = 5000):
+        self.cache = DiskCache(db_path or os.path.join(CACHE_DIR, "llm_cache.sqlite"), max_entries,
+                               ttl_seconds=ttl_seconds, max_bytes=max_bytes)
+        self.latency_saved_seconds = 0.0
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached completion text or None"""
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        # A hit saves the time the original call took
+        self.latency_saved_seconds += entry["latency_seconds"]
+        return entry["content"]
+
+    def put(self, key: str, content: str, latency_seconds: float):
+        """Store a completion along with how long the call took"""
+        self.cache.put(key, {"content": content, "latency_seconds": latency_seconds})
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, latency saved and current size"""
+        return {**self.cache.stats(), "latency_saved_seconds": round(self.latency_saved_seconds, 3)}
+
+
+_llm_cache = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Get the process-wide LLM response cache instance"""
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = LLMResponseCache()
+    return _llm_cache
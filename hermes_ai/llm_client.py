@@ -0,0 +1,75 @@
+"""
+Hermes Config Generator - LLM Client
+Lazily created OpenAI client with one keep-alive connection pool shared by all agents
+"""
+
+import os
+import threading
+from typing import Dict, Any, Optional
+
+import httpx
+from openai import OpenAI, DefaultHttpxClient
+
+# Alternative OpenAI-compatible endpoint, e.g. a local stand-in server
+BASE_URL = os.environ.get("HERMES_LLM_BASE_URL")
+
+# Connections kept open per process; size it to the batch concurrency
+POOL_SIZE = int(os.environ.get("HERMES_LLM_POOL_SIZE", "32"))
+KEEPALIVE_SECONDS = float(os.environ.get("HERMES_LLM_KEEPALIVE_SECONDS", "60"))
+
+CONNECT_TIMEOUT_SECONDS = float(os.environ.get("HERMES_LLM_CONNECT_TIMEOUT", "5"))
+# Default per-read timeout; ResiliencePolicy passes the remaining deadline per request
+READ_TIMEOUT_SECONDS = float(os.environ.get("HERMES_LLM_READ_TIMEOUT", "60"))
+
+# Local stand-in servers do not check keys, but the SDK insists on one
+LOCAL_API_KEY = "hermes-local"
+
+_settings: Dict[str, Any] = {}
+_client = None
+_client_lock = threading.Lock()
+
+
+def _create_client(base_url: Optional[str] = None, api_key: Optional[str] = None,
+                   pool_size: int = POOL_SIZE, keepalive_seconds: float = KEEPALIVE_SECONDS,
+                   connect_timeout: float = CONNECT_TIMEOUT_SECONDS,
+                   read_timeout: float = READ_TIMEOUT_SECONDS) -> OpenAI:
+    base_url = base_url or BASE_URL
+    if api_key is None and base_url and not os.environ.get("OPENAI_API_KEY"):
+        api_key = LOCAL_API_KEY
+    http_client = DefaultHttpxClient(
+        limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size,
+                            keepalive_expiry=keepalive_seconds),
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+    )
+    # Retries are left to ResiliencePolicy so they stay within each request's deadline
+    return OpenAI(api_key=api_key, base_url=base_url, http_client=http_client, max_retries=0)
+
+
+def get_openai_client() -> OpenAI:
+    """
+    Get the process-wide OpenAI client, creating it on first use
+
+    Settings come from configure_openai_client, then the HERMES_LLM_*
+    environment variables; the API key from OPENAI_API_KEY as usual.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _create_client(**_settings)
+    return _client
+
+
+def configure_openai_client(client: Optional[Any] = None, **settings):
+    """
+    Replace the shared client
+
+    Pass an existing OpenAI-compatible client, or settings (base_url,
+    api_key, pool_size, keepalive_seconds, connect_timeout, read_timeout)
+    for the next one get_openai_client creates.
+    """
+    global _client, _settings
+    # The previous client is not closed, since other threads may still be using it
+    with _client_lock:
+        _client = client
+        _settings = settings
@@ -0,0 +1,231 @@
+"""
+Hermes Config Generator - LLM Resilience
+Per-request deadlines, jittered retries and a circuit breaker for LLM calls
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Any, Callable, Iterator, Optional, TypeVar
+
+import openai
+
+from llm_telemetry import LLMCall
+
+# Whole budget for one completion, including retries and backoff
+DEFAULT_DEADLINE_SECONDS = 60.0
+
+# Backoff before retry n is uniform in [0, min(MAX_BACKOFF, BASE_BACKOFF * 2**n)]
+BASE_BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 8.0
+
+# Consecutive provider failures that open the circuit, and how long it stays open
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT_SECONDS = 30.0
+
+RETRYABLE_ERRORS = (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError,
+                    TimeoutError, ConnectionError)
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """The provider is treated as degraded; callers should fall back without calling it"""
+
+
+class DeadlineExceededError(TimeoutError):
+    """The request's deadline passed before a complete response arrived"""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an error is transient on the provider side (timeouts, 429s, 5xx)"""
+    if isinstance(error, RETRYABLE_ERRORS):
+        return True
+    status = getattr(error, "status_code", None)
+    return status in RETRYABLE_STATUS_CODES or (status is not None and status >= 500)
+
+
+def _retry_after(error: BaseException) -> float:
+    """Seconds the provider asked us to wait, if it sent Retry-After"""
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after", 0)) if response is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker shared by every caller of one provider
+
+    After failure_threshold consecutive provider failures the circuit opens
+    and calls are rejected at once. Once reset_timeout has passed, a single
+    probe call is let through; its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD,
+                 reset_timeout: float = RESET_TIMEOUT_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.probing or time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go to the provider now"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if not self.probing and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.failures, "rejected": self.rejected}
+
+
+class ResiliencePolicy:
+    """
+    Deadline, retry and circuit-breaker policy for one kind of LLM request
+
+    A request gets deadline_seconds in total. Transient failures are
+    retried with full-jitter exponential backoff, but only while the
+    backoff still leaves time before the deadline. Each attempt's timeout
+    is whatever remains of the deadline.
+    """
+
+    def __init__(self, deadline_seconds: float = DEFAULT_DEADLINE_SECONDS,
+                 base_backoff: float = BASE_BACKOFF_SECONDS, max_backoff: float = MAX_BACKOFF_SECONDS,
+                 breaker: Optional[CircuitBreaker] = None, sleep: Callable[[float], None] = time.sleep):
+        self.deadline_seconds = deadline_seconds
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.breaker = breaker or get_circuit_breaker()
+        self.sleep = sleep
+
+    def check(self):
+        """Raise CircuitOpenError if the provider should not be called now"""
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"LLM provider circuit is open ({self.breaker.stats()})")
+
+    def call(self, request: Callable[[float], T], call: Optional[LLMCall] = None) -> T:
+        """
+        Run request(timeout_seconds) under the policy
+
+        Call check() first; the first attempt uses the permission it granted.
+        """
+        deadline = time.monotonic() + self.deadline_seconds
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.breaker.record_failure()
+                raise DeadlineExceededError(f"LLM request exceeded its {self.deadline_seconds}s deadline")
+            try:
+                result = request(remaining)
+            except Exception as e:
+                if not is_retryable(e):
+                    # The provider answered; the request itself is at fault
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                self._backoff(e, attempt, deadline, call)
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return result
+
+    def stream(self, open_stream: Callable[[float], Iterator[str]],
+               call: Optional[LLMCall] = None) -> Iterator[str]:
+        """
+        Yield a streamed completion under the policy
+
+        Attempts are retried only until the first piece has been yielded,
+        since consumers may already have acted on it. The deadline covers
+        the whole stream.
+        """
+        deadline = time.monotonic() + self.deadline_seconds
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.breaker.record_failure()
+                raise DeadlineExceededError(f"LLM request exceeded its {self.deadline_seconds}s deadline")
+            pieces = open_stream(remaining)
+            started = False
+            try:
+                for piece in pieces:
+                    started = True
+                    yield piece
+                    if time.monotonic() > deadline:
+                        raise DeadlineExceededError(
+                            f"LLM stream exceeded its {self.deadline_seconds}s deadline"
+                        )
+            except GeneratorExit:
+                # The consumer stopped reading; the provider was responding
+                self.breaker.record_success()
+                raise
+            except Exception as e:
+                if not is_retryable(e):
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if started:
+                    raise
+                self._backoff(e, attempt, deadline, call)
+                attempt += 1
+                continue
+            finally:
+                close = getattr(pieces, "close", None)
+                if close is not None:
+                    close()
+            self.breaker.record_success()
+            return
+
+    def _backoff(self, error: Exception, attempt: int, deadline: float, call: Optional[LLMCall]):
+        """Sleep before the next attempt, or re-raise if that would pass the deadline"""
+        delay = random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+        delay = max(delay, _retry_after(error))
+        if time.monotonic() + delay >= deadline or not self.breaker.allow():
+            raise error
+        if call is not None:
+            call.retry()
+        self.sleep(delay)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str = "openai") -> CircuitBreaker:
+    """Get the process-wide circuit breaker for a provider"""
+    with _breakers_lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker()
+        return _breakers[provider]
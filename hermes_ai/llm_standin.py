@@ -0,0 +1,286 @@
+"""
+Hermes Config Generator - LLM Stand-in Server
+Local OpenAI-compatible chat-completions endpoint for load and latency testing
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional
+
+from prompt_packing import estimate_tokens, estimate_messages_tokens, CHARS_PER_TOKEN
+from templates import TemplateLibrary
+
+# Characters per streamed chunk, roughly what the real API sends
+CHUNK_CHARS = 12
+
+
+class StandInSettings:
+    """
+    Behaviour of the stand-in server
+
+    Time to first token is log-normal around ttft_median_ms. Completion
+    text then arrives at tokens_per_second. Each request independently
+    fails with a 500 (error_rate), a 429 (rate_limit_rate) or hangs for
+    hang_seconds before failing (hang_rate).
+
+    response_mode "template" answers config prompts with the template
+    whose typical columns appear most in the prompt, and ETL prompts with
+    direct mappings of the prompt's columns. "canned" returns the
+    contents of response_file verbatim, malformed or not.
+    """
+
+    def __init__(self, ttft_median_ms: float = 600.0, ttft_sigma: float = 0.5,
+                 tokens_per_second: float = 150.0, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, hang_rate: float = 0.0, hang_seconds: float = 120.0,
+                 response_mode: str = "template", response_file: Optional[str] = None,
+                 seed: Optional[int] = None):
+        self.ttft_median_ms = ttft_median_ms
+        self.ttft_sigma = ttft_sigma
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.response_mode = response_mode
+        self.canned_response = None
+        if response_file:
+            with open(response_file, encoding="utf-8") as f:
+                self.canned_response = f.read()
+        self.rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def draw(self) -> Dict[str, Any]:
+        """Outcome and time to first token for one request"""
+        with self._rng_lock:
+            roll = self.rng.random()
+            ttft = self.ttft_median_ms / 1000 * self.rng.lognormvariate(0, self.ttft_sigma)
+        if roll < self.error_rate:
+            outcome = "error"
+        elif roll < self.error_rate + self.rate_limit_rate:
+            outcome = "rate_limit"
+        elif roll < self.error_rate + self.rate_limit_rate + self.hang_rate:
+            outcome = "hang"
+        else:
+            outcome = "ok"
+        return {"outcome": outcome, "ttft": ttft}
+
+
+class ResponseFactory:
+    """Completion text for config and ETL prompts"""
+
+    def __init__(self, settings: StandInSettings):
+        self.settings = settings
+        self.library = TemplateLibrary()
+
+    def completion(self, messages: List[Dict[str, str]]) -> str:
+        if self.settings.response_mode == "canned" and self.settings.canned_response is not None:
+            return self.settings.canned_response
+        system = " ".join(m["content"] for m in messages if m.get("role") == "system")
+        prompt = " ".join(m["content"] for m in messages if m.get("role") == "user")
+        if "ETL" in system:
+            return json.dumps(self._etl_spec(prompt))
+        return json.dumps(self._config(prompt))
+
+    def _config(self, prompt: str) -> Dict[str, Any]:
+        words = set(re.findall(r"\w+", prompt.lower()))
+        template_id = max(self.library.templates, key=lambda tid: sum(
+            name in words for name in self.library.templates[tid]["metadata"].get("typical_columns", [])
+        ))
+        config = json.loads(json.dumps(self.library.get_template(template_id)))
+        config.pop("metadata", None)
+        feed = re.search(r"Feed Name: (.+)", prompt)
+        if feed:
+            feed_name = feed.group(1).strip()
+            config["process_config"]["process_id"] = feed_name.upper().replace(" ", "_")
+            config["process_config"]["process_name"] = feed_name
+        # Section repair prompts ask for only some sections
+        requested = re.search(r"exactly the keys ([\w, ]+?), without", prompt)
+        if requested:
+            names = [name.strip() for name in requested.group(1).split(",")]
+            config = {name: config[name] for name in names if name in config}
+        return config
+
+    def _etl_spec(self, prompt: str) -> Dict[str, Any]:
+        columns = re.findall(r'"name":"([^"]+)"', prompt)
+        return {
+            "column_mappings": [{"source_column": name, "target_column": name, "data_type": "STRING",
+                                 "transformation_type": "DIRECT", "transformation_logic": name}
+                                for name in columns],
+            "derived_columns": [],
+            "filter_conditions": [],
+            "aggregations": [],
+            "data_quality_rules": [],
+            "target_schema": {"columns": [{"name": name, "type": "STRING"} for name in columns]}
+        }
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """POST /v1/chat/completions, streamed (SSE) or not"""
+
+    protocol_version = "HTTP/1.1"
+    server: "StandInServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        settings = self.server.settings
+        draw = settings.draw()
+        self.server.count(draw["outcome"])
+
+        if draw["outcome"] == "error":
+            time.sleep(draw["ttft"] / 2)
+            self._send_json(500, {"error": {"message": "Stand-in injected server error", "type": "server_error"}})
+            return
+        if draw["outcome"] == "rate_limit":
+            self._send_json(429, {"error": {"message": "Stand-in injected rate limit", "type": "rate_limit_error"}},
+                            {"retry-after": "1"})
+            return
+        if draw["outcome"] == "hang":
+            time.sleep(settings.hang_seconds)
+            self._send_json(504, {"error": {"message": "Stand-in injected hang", "type": "server_error"}})
+            return
+
+        messages = body.get("messages", [])
+        model = body.get("model", "stand-in")
+        text = self.server.responses.completion(messages)
+        usage = {"prompt_tokens": estimate_messages_tokens(messages), "completion_tokens": estimate_tokens(text)}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        time.sleep(draw["ttft"])
+        if body.get("stream"):
+            self._stream(model, text, usage, body.get("stream_options") or {})
+        else:
+            time.sleep(usage["completion_tokens"] / settings.tokens_per_second)
+            self._send_json(200, {
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                             "finish_reason": "stop"}],
+                "usage": usage
+            })
+
+    def _stream(self, model: str, text: str, usage: Dict[str, int], stream_options: Dict[str, Any]):
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None, with_usage: bool = False):
+            event = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": model,
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}] if not with_usage else []}
+            if with_usage:
+                event["usage"] = usage
+            self._write_event(json.dumps(event))
+
+        chunk_seconds = CHUNK_CHARS / CHARS_PER_TOKEN / self.server.settings.tokens_per_second
+        chunk({"role": "assistant", "content": ""})
+        for start in range(0, len(text), CHUNK_CHARS):
+            chunk({"content": text[start:start + CHUNK_CHARS]})
+            time.sleep(chunk_seconds)
+        chunk({}, finish_reason="stop")
+        if stream_options.get("include_usage"):
+            chunk({}, with_usage=True)
+        self._write_event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_event(self, data: str):
+        payload = f"data: {data}\n\n".encode("utf-8")
+        self.wfile.write(f"{len(payload):x}\r\n".encode("ascii") + payload + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Threaded stand-in server; start() serves in a background thread
+
+    Point the agents at it with
+    llm_client.configure_openai_client(base_url=server.base_url).
+    """
+
+    daemon_threads = True
+
+    def __init__(self, settings: Optional[StandInSettings] = None, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), StandInHandler)
+        self.settings = settings or StandInSettings()
+        self.responses = ResponseFactory(self.settings)
+        self.outcomes: Dict[str, int] = {}
+        self._outcomes_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def count(self, outcome: str):
+        with self._outcomes_lock:
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="hermes-llm-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def add_settings_arguments(parser: argparse.ArgumentParser):
+    """Command-line options for StandInSettings, shared with the load driver"""
+    parser.add_argument("--ttft-ms", type=float, default=600.0, help="Median time to first token (ms)")
+    parser.add_argument("--ttft-sigma", type=float, default=0.5, help="Log-normal spread of time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=150.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share answered with a 429")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Share that hang for --hang-seconds")
+    parser.add_argument("--hang-seconds", type=float, default=120.0)
+    parser.add_argument("--response-mode", choices=["template", "canned"], default="template")
+    parser.add_argument("--response-file", help="Completion text returned in canned mode")
+    parser.add_argument("--seed", type=int)
+
+
+def settings_from_arguments(args: argparse.Namespace) -> StandInSettings:
+    return StandInSettings(ttft_median_ms=args.ttft_ms, ttft_sigma=args.ttft_sigma,
+                           tokens_per_second=args.tokens_per_second, error_rate=args.error_rate,
+                           rate_limit_rate=args.rate_limit_rate, hang_rate=args.hang_rate,
+                           hang_seconds=args.hang_seconds, response_mode=args.response_mode,
+                           response_file=args.response_file, seed=args.seed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stand-in server for Hermes load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    add_settings_arguments(parser)
+    args = parser.parse_args()
+    server = StandInServer(settings_from_arguments(args), args.host, args.port)
+    print(f"Stand-in LLM serving at {server.base_url} (set HERMES_LLM_BASE_URL to use it)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,126 @@
+"""
+Hermes Config Generator - LLM Streaming
+Incremental parsing of streamed JSON completions into top-level sections
+"""
+
+import json
+from typing import Dict, List, Any, Iterator, Tuple, Optional, Sequence
+
+from json_repair import extract_json
+from llm_telemetry import LLMCall
+from prompt_packing import estimate_tokens, estimate_messages_tokens
+
+
+def iter_completion_text(client, model: str, messages: List[Dict[str, str]],
+                         call: Optional[LLMCall] = None, **params) -> Iterator[str]:
+    """
+    Yield the text of a chat completion piece by piece as it is generated
+
+    With a telemetry call, the first token is timestamped and the usage
+    reported in the final chunk is recorded (estimated if none is sent).
+    """
+    if call is not None:
+        params.setdefault("stream_options", {"include_usage": True})
+    stream = client.chat.completions.create(model=model, messages=messages, stream=True, **params)
+    pieces = []
+    for chunk in stream:
+        if call is not None and getattr(chunk, "usage", None) is not None:
+            call.set_usage(chunk.usage)
+        if chunk.choices and chunk.choices[0].delta.content:
+            if call is not None:
+                call.first_token()
+            pieces.append(chunk.choices[0].delta.content)
+            yield chunk.choices[0].delta.content
+    if call is not None:
+        call.set_usage(prompt_tokens=estimate_messages_tokens(messages),
+                       completion_tokens=estimate_tokens("".join(pieces)))
+
+
+class JSONSectionParser:
+    """
+    Emits the members of a streamed top-level JSON object as each one completes
+
+    Text before the opening brace (such as a markdown code fence) is
+    skipped. Every character is scanned once, tracking nesting depth and
+    string state, so a completion of n characters costs O(n) overall plus
+    one json.loads per section.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.pos = 0
+        self.start = None
+        self.end = None
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.key = None
+        self.key_start = None
+        self.value_start = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the top-level object has been closed"""
+        return self.end is not None
+
+    def feed(self, piece: str) -> List[Tuple[str, Any]]:
+        """Add streamed text and return the (name, value) sections it completed"""
+        self.text += piece
+        text = self.text
+        sections = []
+        i = self.pos
+        while i < len(text) and not self.done:
+            ch = text[i]
+            if self.start is None:
+                if ch == "{":
+                    self.start, self.depth = i, 1
+            elif self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                    if self.depth == 1 and self.key is None:
+                        self.key = json.loads(text[self.key_start:i + 1])
+            elif ch == '"':
+                self.in_string = True
+                if self.depth == 1 and self.key is None:
+                    self.key_start = i
+            elif ch == ":" and self.depth == 1 and self.key is not None and self.value_start is None:
+                self.value_start = i + 1
+            elif ch in "{[":
+                self.depth += 1
+            elif ch in "}]":
+                self.depth -= 1
+                if self.depth == 1:
+                    # A container value just closed; no need to wait for the comma
+                    self._emit(text[self.value_start:i + 1] if self.value_start is not None else None, sections)
+                elif self.depth == 0:
+                    self._emit(text[self.value_start:i] if self.value_start is not None else None, sections)
+                    self.end = i + 1
+            elif ch == "," and self.depth == 1:
+                self._emit(text[self.value_start:i] if self.value_start is not None else None, sections)
+            i += 1
+        self.pos = i
+        return sections
+
+    def _emit(self, value_text, sections: List[Tuple[str, Any]]):
+        """Decode a finished member value and reset for the next key"""
+        if value_text is not None and self.key is not None:
+            try:
+                sections.append((self.key, json.loads(value_text)))
+            except ValueError:
+                # Left for the final parse to repair
+                pass
+        self.key = self.key_start = self.value_start = None
+
+    def close(self, expected_sections: Optional[Sequence[str]] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Parse the complete object, repairing it if the stream ended early or
+        the JSON is malformed; returns (object, repair report) as extract_json
+        """
+        if self.done:
+            return extract_json(self.text[self.start:self.end], expected_sections)
+        return extract_json(self.text, expected_sections)
+
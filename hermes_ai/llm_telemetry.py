@@ -0,0 +1,201 @@
+"""
+Hermes Config Generator - LLM Telemetry
+Per-call latency, token and retry records with percentile aggregates
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Iterator
+
+import numpy as np
+
+# Most recent calls kept for aggregates
+MAX_RECORDS = 10000
+
+PERCENTILES = (50, 95, 99)
+
+# USD per million (prompt, completion) tokens
+MODEL_PRICES_PER_MILLION = {
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60)
+}
+
+# Start of the wait for an LLM slot, set per thread by callers that queue work
+_queue_state = threading.local()
+
+
+@contextmanager
+def queued_since(enqueued_at: float):
+    """
+    Attribute the time since enqueued_at (a time.perf_counter() value) to
+    queueing for the next LLM call made on this thread
+    """
+    _queue_state.enqueued_at = enqueued_at
+    try:
+        yield
+    finally:
+        _queue_state.enqueued_at = None
+
+
+def _take_enqueued_at() -> Optional[float]:
+    enqueued_at = getattr(_queue_state, "enqueued_at", None)
+    _queue_state.enqueued_at = None
+    return enqueued_at
+
+
+class LLMCall:
+    """
+    Timing and usage of one chat completion, from request to last token
+
+    Created by LLMTelemetry.track; the caller marks the first token (for
+    streamed completions), retries and the final usage.
+    """
+
+    def __init__(self, agent: str, model: str, streamed: bool):
+        self.agent = agent
+        self.model = model
+        self.streamed = streamed
+        self.started = time.perf_counter()
+        enqueued_at = _take_enqueued_at()
+        self.queue_seconds = self.started - enqueued_at if enqueued_at is not None else 0.0
+        self.first_token_at = None
+        self.retries = 0
+        self.prompt_tokens = None
+        self.completion_tokens = None
+        self.tokens_estimated = False
+
+    def first_token(self):
+        """Mark the arrival of the first content token"""
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+
+    def retry(self):
+        """Count one retry of the request"""
+        self.retries += 1
+
+    def set_usage(self, usage: Any = None, prompt_tokens: Optional[int] = None,
+                  completion_tokens: Optional[int] = None):
+        """
+        Record token counts from the API's usage object, or from estimates
+        when the server did not report usage
+        """
+        if usage is not None and getattr(usage, "prompt_tokens", None) is not None:
+            self.prompt_tokens = usage.prompt_tokens
+            self.completion_tokens = usage.completion_tokens
+        elif self.prompt_tokens is None:
+            self.prompt_tokens, self.completion_tokens = prompt_tokens, completion_tokens
+            self.tokens_estimated = True
+
+    def to_record(self, error: Optional[BaseException] = None) -> Dict[str, Any]:
+        """Finished call as a flat record"""
+        finished = time.perf_counter()
+        latency = finished - self.started
+        prompt_price, completion_price = MODEL_PRICES_PER_MILLION.get(self.model, (None, None))
+        cost = None
+        if prompt_price is not None and self.prompt_tokens is not None:
+            cost = (self.prompt_tokens * prompt_price + (self.completion_tokens or 0) * completion_price) / 1e6
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "agent": self.agent,
+            "model": self.model,
+            "streamed": self.streamed,
+            "success": error is None,
+            "error": (str(error) or type(error).__name__) if error is not None else None,
+            "queue_seconds": round(self.queue_seconds, 4),
+            # A non-streamed response delivers its first token with the last
+            "ttft_seconds": round((self.first_token_at or finished) - self.started, 4),
+            "latency_seconds": round(latency, 4),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "tokens_estimated": self.tokens_estimated,
+            "retries": self.retries,
+            "cost_usd": round(cost, 6) if cost is not None else None
+        }
+
+
+class LLMTelemetry:
+    """Thread-safe store of recent LLM call records"""
+
+    def __init__(self, max_records: int = MAX_RECORDS):
+        self.records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self, agent: str, model: str, streamed: bool = False) -> Iterator[LLMCall]:
+        """
+        Time one completion; the record is stored when the block exits,
+        marked as failed if it raised
+        """
+        call = LLMCall(agent, model, streamed)
+        try:
+            yield call
+        except BaseException as e:
+            self._add(call.to_record(e))
+            raise
+        self._add(call.to_record())
+
+    def _add(self, record: Dict[str, Any]):
+        with self._lock:
+            self.records.append(record)
+
+    def get_records(self, agent: Optional[str] = None, model: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Stored records, optionally filtered by agent and model"""
+        with self._lock:
+            records = list(self.records)
+        return [record for record in records
+                if (agent is None or record["agent"] == agent) and (model is None or record["model"] == model)]
+
+    def summary(self, by: str = "agent") -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregates per agent or per model (by="agent" or "model")
+
+        Returns:
+            {key: {"calls", "errors", "retries", "prompt_tokens",
+            "completion_tokens", "cost_usd", "latency_seconds",
+            "ttft_seconds", "queue_seconds"}} where the timing entries are
+            {"p50", "p95", "p99", "mean"}
+        """
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for record in self.get_records():
+            groups.setdefault(record[by], []).append(record)
+
+        summary = {}
+        for key, records in groups.items():
+            summary[key] = {
+                "calls": len(records),
+                "errors": sum(not record["success"] for record in records),
+                "retries": sum(record["retries"] for record in records),
+                "prompt_tokens": sum(record["prompt_tokens"] or 0 for record in records),
+                "completion_tokens": sum(record["completion_tokens"] or 0 for record in records),
+                "cost_usd": round(sum(record["cost_usd"] or 0 for record in records), 6)
+            }
+            for metric in ("latency_seconds", "ttft_seconds", "queue_seconds"):
+                values = np.array([record[metric] for record in records])
+                stats = {f"p{q}": round(float(v), 4) for q, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+                stats["mean"] = round(float(values.mean()), 4)
+                summary[key][metric] = stats
+        return summary
+
+    def clear(self):
+        """Drop all records"""
+        with self._lock:
+            self.records.clear()
+
+
+_telemetry = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry() -> LLMTelemetry:
+    """Get the process-wide telemetry store"""
+    global _telemetry
+    with _telemetry_lock:
+        if _telemetry is None:
+            _telemetry = LLMTelemetry()
+        return _telemetry
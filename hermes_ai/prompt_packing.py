@@ -0,0 +1,144 @@
+"""
+Hermes Config Generator - Prompt Packing
+Compact, token-budgeted schema serialization for LLM prompts
+"""
+
+import json
+import math
+from typing import Dict, List, Any, Optional, Tuple
+
+# Tokens the packed schema may use in a prompt
+DEFAULT_TOKEN_BUDGET = 4000
+
+# Rough average for compact JSON with the GPT-4 family tokenizers
+CHARS_PER_TOKEN = 3.5
+
+# Sample strings longer than this are cut once samples are being shortened
+MAX_SAMPLE_CHARS = 24
+
+# Formats matter most for these, so their samples are dropped last
+FORMAT_SEMANTIC_TYPES = {"date", "timestamp", "time"}
+NUMERIC_SEMANTIC_TYPES = {"integer", "decimal", "boolean"}
+
+# Applied cumulatively, cheapest information loss first, until the schema fits
+REDUCTIONS = [
+    "top_values",        # frequency lists
+    "numeric_samples",   # numeric columns keep min/max and quantiles
+    "short_samples",     # one sample per column, long strings truncated
+    "quantiles",         # keep p50 only
+    "text_samples",      # keep samples only where they show a date/time format
+    "all_samples",
+    "statistics",        # null/distinct counts and ranges
+    "names_only"         # {name: position} per type group
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a prompt fragment"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _compact(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _shorten(value: Any) -> Any:
+    if isinstance(value, str) and len(value) > MAX_SAMPLE_CHARS:
+        return value[:MAX_SAMPLE_CHARS - 1] + "…"
+    return value
+
+
+def _pack_column(col: Dict[str, Any], position: int, applied: set) -> Dict[str, Any]:
+    """One column entry; type fields live on the group"""
+    semantic_type = col.get("semantic_type", "string")
+    packed = {"name": col["name"], "pos": position}
+    if col.get("parse_format"):
+        packed["format"] = col["parse_format"]
+
+    if "statistics" not in applied:
+        packed["nulls"] = col.get("null_count", 0)
+        packed["distinct"] = col.get("unique_count", 0)
+        if col.get("min") is not None:
+            packed["range"] = [_shorten(col.get("min")), _shorten(col.get("max"))]
+
+    samples = [val for val in col.get("sample_values", []) if val is not None]
+    if "all_samples" in applied:
+        samples = []
+    elif "text_samples" in applied and semantic_type not in FORMAT_SEMANTIC_TYPES:
+        samples = []
+    elif "numeric_samples" in applied and semantic_type in NUMERIC_SEMANTIC_TYPES:
+        samples = []
+    if "short_samples" in applied:
+        samples = [_shorten(val) for val in samples[:1]]
+    if samples:
+        packed["samples"] = samples
+
+    if col.get("quantiles") and "statistics" not in applied:
+        if "quantiles" in applied:
+            packed["p50"] = col["quantiles"].get("p50")
+        else:
+            packed["quantiles"] = col["quantiles"]
+    if col.get("top_values") and "top_values" not in applied:
+        packed["top"] = [[_shorten(top["value"]), top["count"]] for top in col["top_values"]]
+    return packed
+
+
+def _pack(schema: Dict[str, Any], applied: set) -> Dict[str, Any]:
+    """Compact schema with columns grouped by (semantic type, dtype)"""
+    groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for position, col in enumerate(schema.get("columns", [])):
+        key = (col.get("semantic_type", "string"), col.get("dtype", "object"))
+        groups.setdefault(key, []).append(_pack_column(col, position, applied))
+
+    packed = {key: schema[key] for key in ("file_type", "row_count_sample", "column_count", "dialect")
+              if key in schema}
+    packed["column_groups"] = []
+    for (semantic_type, dtype), columns in groups.items():
+        if "names_only" in applied:
+            columns = {col["name"]: col["pos"] for col in columns}
+        packed["column_groups"].append({"type": semantic_type, "dtype": dtype, "columns": columns})
+    return packed
+
+
+def pack_schema(schema: Dict[str, Any], token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET) -> Tuple[str, Dict[str, Any]]:
+    """
+    Serialize a schema for a prompt within a token budget
+
+    Columns sharing a semantic type and dtype are grouped, with each
+    column's original position kept as "pos". Reductions from REDUCTIONS
+    are applied in order until the estimate fits; every column name is
+    always kept, so an oversized schema is reported rather than cut.
+
+    Returns:
+        (compact JSON text, report) where report holds estimated_tokens,
+        original_tokens, token_budget, fits and the reductions applied
+    """
+    original_tokens = estimate_tokens(json.dumps(
+        {key: value for key, value in schema.items() if key != "columns"}, indent=2, default=str
+    )) + sum(estimate_tokens(json.dumps({k: v for k, v in col.items() if k != "sketches"}, indent=2, default=str))
+             for col in schema.get("columns", []))
+
+    applied: List[str] = []
+    text = _compact(_pack(schema, set()))
+    tokens = estimate_tokens(text)
+    for reduction in REDUCTIONS:
+        if token_budget is None or tokens <= token_budget:
+            break
+        applied.append(reduction)
+        text = _compact(_pack(schema, set(applied)))
+        tokens = estimate_tokens(text)
+
+    report = {
+        "estimated_tokens": tokens,
+        "original_tokens": original_tokens,
+        "token_budget": token_budget,
+        "fits": token_budget is None or tokens <= token_budget,
+        "reductions": applied,
+        "columns": len(schema.get("columns", []))
+    }
+    return text, report
+
+
+def estimate_messages_tokens(messages: List[Dict[str, str]]) -> int:
+    """Approximate prompt tokens of a chat request, including per-message overhead"""
+    return sum(estimate_tokens(message["content"]) + 4 for message in messages) + 2
@@ -0,0 +1,274 @@
+"""
+Hermes Config Generator - Rule-Based Config Synthesis
+Complete configurations derived from the profiled schema alone, without an LLM
+"""
+
+import re
+import time
+import pandas as pd
+from typing import Dict, List, Any, Optional
+
+from sketches import key_columns
+from type_inference import parse_values
+from template_matcher import SEMANTIC_CONFIG_TYPES
+
+# VARCHAR lengths offered, leaving twice the longest observed value as headroom
+VARCHAR_LENGTHS = (16, 32, 64, 128, 256, 1024, 4000)
+DEFAULT_VARCHAR_LENGTH = 256
+
+DECIMAL_PRECISION = 18
+MIN_DECIMAL_SCALE = 2
+MAX_DECIMAL_SCALE = 6
+
+# Integers whose observed magnitude is within this factor of INT32 get BIGINT
+INTEGER_HEADROOM = 10
+INT32_MAX = 2 ** 31 - 1
+
+# Preferred business date columns, by name, before falling back to the first date column
+BUSINESS_DATE_HINTS = ("business_date", "as_of", "cob", "trade_date", "value_date", "date")
+
+# Names that mark an identifier when choosing among several unique columns
+KEY_NAME_PATTERN = re.compile(r"(^|_)(id|key|code|number|no)$")
+
+FIXED_SQL_TYPES = {
+    "boolean": "BOOLEAN",
+    "date": "DATE",
+    "timestamp": "TIMESTAMP",
+    "time": "TIME"
+}
+
+
+def _observed_values(col: Dict[str, Any]) -> List[Any]:
+    values = [val for val in col.get("sample_values", []) if val is not None]
+    values.extend(top["value"] for top in col.get("top_values", []) if top.get("value") is not None)
+    return values
+
+
+def _is_number(val: Any) -> bool:
+    """Stream profiles keep the raw text of thousands-separated values, so min/max may be strings"""
+    return isinstance(val, (int, float)) and not isinstance(val, bool)
+
+
+def _magnitude(col: Dict[str, Any]) -> Optional[float]:
+    """Largest absolute value seen, from exact min/max or else the quantile sketch"""
+    bounds = [col.get("min"), col.get("max")]
+    quantiles = col.get("quantiles") or {}
+    bounds += [quantiles.get("p01"), quantiles.get("p99")]
+    bounds += _observed_values(col)
+    numeric = [abs(float(val)) for val in bounds if _is_number(val)]
+    return max(numeric) if numeric else None
+
+
+def _lower_bound(col: Dict[str, Any]) -> Optional[float]:
+    """Smallest value seen: the exact min (parsed when kept as text), else the sketch's p01, else None"""
+    low = col.get("min")
+    if isinstance(low, str):
+        parsed = parse_values(pd.Series([low]), col.get("semantic_type"), col.get("parse_format"))
+        low = None if parsed is None or pd.isna(parsed.iloc[0]) else float(parsed.iloc[0])
+    for val in (low, (col.get("quantiles") or {}).get("p01")):
+        if _is_number(val):
+            return float(val)
+    return None
+
+
+def sql_type(col: Dict[str, Any]) -> str:
+    """SQL column type from a schema column's semantic type and statistics"""
+    semantic_type = col.get("semantic_type", "string")
+    if semantic_type in FIXED_SQL_TYPES:
+        return FIXED_SQL_TYPES[semantic_type]
+
+    if semantic_type == "integer":
+        magnitude = _magnitude(col)
+        return "BIGINT" if magnitude is not None and magnitude * INTEGER_HEADROOM > INT32_MAX else "INTEGER"
+
+    if semantic_type == "decimal":
+        scale = MIN_DECIMAL_SCALE
+        for val in _observed_values(col):
+            text = str(val)
+            if "." in text and "e" not in text.lower():
+                scale = max(scale, len(text.rsplit(".", 1)[1]))
+        return f"DECIMAL({DECIMAL_PRECISION},{min(scale, MAX_DECIMAL_SCALE)})"
+
+    lengths = [len(str(val)) for val in _observed_values(col)]
+    if not lengths:
+        return f"VARCHAR({DEFAULT_VARCHAR_LENGTH})"
+    wanted = 2 * max(lengths)
+    length = next((size for size in VARCHAR_LENGTHS if size >= wanted), None)
+    return f"VARCHAR({length})" if length else "TEXT"
+
+
+def dedup_keys(schema: Dict[str, Any]) -> List[str]:
+    """
+    Columns identifying a record: the unique, never-null column whose name
+    looks most like an identifier, or every column (whole-row dedup) if
+    none is unique
+    """
+    keys = key_columns(schema)
+    if not keys:
+        return [col["name"] for col in schema.get("columns", [])]
+    semantic = {col["name"]: col.get("semantic_type") for col in schema.get("columns", [])}
+    ranked = sorted(keys, key=lambda name: (not KEY_NAME_PATTERN.search(name.lower()),
+                                            semantic.get(name) != "identifier"))
+    return ranked[:1]
+
+
+def business_date_column(columns: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """The date column a feed is controlled by: a hinted name first, then the first date, then timestamp"""
+    dated = [col for col in columns if col.get("semantic_type") in ("date", "timestamp")]
+    for hint in BUSINESS_DATE_HINTS:
+        for col in dated:
+            if hint in col["name"].lower():
+                return col
+    dates = [col for col in dated if col.get("semantic_type") == "date"]
+    return (dates or dated or [None])[0]
+
+
+def _date_format(col: Dict[str, Any]) -> str:
+    parse_format = col.get("parse_format")
+    if parse_format and parse_format.startswith("%"):
+        return parse_format
+    return "%Y-%m-%dT%H:%M:%S" if col.get("semantic_type") == "timestamp" else "%Y-%m-%d"
+
+
+def synthesize_config(schema: Dict[str, Any], feed_name: str, source_system: str) -> Dict[str, Any]:
+    """
+    Build a complete Hermes configuration from a profiled schema
+
+    Columns get SQL types from their semantic types and statistics,
+    deduplication keys come from uniqueness statistics, date control from
+    the detected date columns and file patterns from the feed name. Rules
+    drawn from observed bounds are errors only for a complete profile; a
+    sample's bounds make them warnings.
+    """
+    process_id = feed_name.upper().replace(" ", "_")
+    slug = re.sub(r"[^a-z0-9]+", "_", feed_name.lower()).strip("_") or "feed"
+    file_type = (schema.get("file_type") or "csv").lower()
+    columns = schema.get("columns", [])
+    keys = dedup_keys(schema)
+    single_key = keys[0] if len(keys) == 1 else None
+
+    config_columns = []
+    for col in columns:
+        semantic_type = col.get("semantic_type", "string")
+        entry = {
+            "name": col["name"],
+            "type": SEMANTIC_CONFIG_TYPES.get(semantic_type, semantic_type),
+            "sql_type": sql_type(col),
+            "nullable": col.get("null_count", 0) > 0
+        }
+        if col["name"] == single_key:
+            entry["primary_key"] = True
+        if semantic_type in ("date", "timestamp", "time"):
+            entry["format"] = _date_format(col)
+        config_columns.append(entry)
+
+    feed_file_config = {
+        "feed_id": process_id,
+        "file_format": file_type.upper(),
+        "columns": config_columns
+    }
+    if file_type == "csv":
+        dialect = schema.get("dialect", {})
+        feed_file_config.update({
+            "delimiter": dialect.get("delimiter", ","),
+            "quotechar": dialect.get("quotechar", '"'),
+            "header_row": dialect.get("has_header", True),
+            "encoding": dialect.get("encoding", "utf-8")
+        })
+
+    date_col = business_date_column(columns)
+    etl_steps = [{"step_name": "Remove Duplicates", "step_type": "deduplication", "key_columns": keys}]
+
+    required = [name for name in (single_key, date_col["name"] if date_col else None) if name]
+    if required:
+        etl_steps.append({"step_name": "Validate Required Fields", "step_type": "validation",
+                          "rule": " AND ".join(f"{name} IS NOT NULL" for name in required)})
+
+    lower_bounds = {col["name"]: _lower_bound(col) for col in columns
+                    if col.get("semantic_type") in ("integer", "decimal")}
+    non_negative = [name for name, bound in lower_bounds.items() if bound is not None and bound >= 0]
+    if non_negative:
+        etl_steps.append({"step_name": "Validate Non-Negative Amounts", "step_type": "validation",
+                          "rule": " AND ".join(f"{name} >= 0" for name in non_negative),
+                          "severity": "ERROR" if schema.get("profile_complete") else "WARNING"})
+
+    dated = [col["name"] for col in columns if col.get("semantic_type") in ("date", "timestamp")]
+    if dated:
+        etl_steps.append({"step_name": "Parse Dates", "step_type": "transformation",
+                          "action": "convert_to_datetime", "columns": dated})
+    etl_steps = [{"step_id": step_id, **step} for step_id, step in enumerate(etl_steps, 1)]
+
+    config = {
+        "process_config": {
+            "process_id": process_id,
+            "process_name": feed_name,
+            "source_system": source_system,
+            "schedule": "Daily at 6 PM",
+            "enabled": True,
+            "retry_count": 3,
+            "timeout_minutes": 30
+        },
+        "feed_file_config": feed_file_config,
+        "etl_steps": etl_steps,
+        "file_pattern": {
+            "output_pattern": f"{slug}_{{business_date}}.{file_type}" if date_col else f"{slug}_{{run_timestamp}}.{file_type}",
+            "output_format": file_type.upper(),
+            "output_location": f"s3://bucket/output/{slug}/"
+        }
+    }
+    if date_col is not None:
+        config["date_control"] = {
+            "business_date_column": date_col["name"],
+            "date_format": _date_format(date_col),
+            "timezone": "UTC"
+        }
+    return config
+
+
+def benchmark_rule_based_config(column_counts: List[int] = (10, 50, 200), iterations: int = 2000) -> List[Dict[str, Any]]:
+    """Configs per second for synthetic schemas of increasing width"""
+    semantic_cycle = [
+        ("identifier", "object", ["TRD001", "TRD002"]),
+        ("string", "object", ["John Smith", "Sarah Johnson"]),
+        ("integer", "int64", [100, 250]),
+        ("decimal", "float64", [175.5, 142.25]),
+        ("date", "object", ["2025-10-31", "2025-11-01"]),
+        ("timestamp", "object", ["2025-10-31T09:30:15", "2025-10-31T09:31:22"])
+    ]
+    results = []
+    for column_count in column_counts:
+        columns = []
+        for idx in range(column_count):
+            semantic_type, dtype, samples = semantic_cycle[idx % len(semantic_cycle)]
+            columns.append({
+                "name": f"{semantic_type}_{idx}",
+                "dtype": dtype,
+                "null_count": idx % 3,
+                "unique_count": 1000 if idx == 0 else 40,
+                "sample_values": samples,
+                "semantic_type": semantic_type,
+                "parse_format": "%Y-%m-%d" if semantic_type == "date" else None
+            })
+        schema = {"file_type": "csv", "row_count_sample": 1000, "column_count": column_count,
+                  "columns": columns, "dialect": {"delimiter": ",", "quotechar": '"', "has_header": True,
+                                                  "encoding": "utf-8"}}
+
+        start = time.perf_counter()
+        for idx in range(iterations):
+            synthesize_config(schema, f"feed {idx}", "Benchmark")
+        elapsed = time.perf_counter() - start
+        results.append({
+            "columns": column_count,
+            "configs": iterations,
+            "seconds": round(elapsed, 3),
+            "configs_per_second": round(iterations / elapsed) if elapsed > 0 else None,
+            "microseconds_per_config": round(elapsed / iterations * 1e6, 1)
+        })
+    return results
+
+
+if __name__ == "__main__":
+    print(f"{'columns':>8} {'configs':>8} {'seconds':>8} {'configs/s':>10} {'us/config':>10}")
+    for row in benchmark_rule_based_config():
+        print(f"{row['columns']:>8} {row['configs']:>8} {row['seconds']:>8} "
+              f"{row['configs_per_second']:>10} {row['microseconds_per_config']:>10}")
@@ -0,0 +1,236 @@
+"""
+Hermes Config Generator - Sampling
+Representative row samples from large files for schema inference
+"""
+
+import csv
+import io
+import json
+import math
+import os
+import random
+import pandas as pd
+from collections import deque
+from itertools import islice
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple
+
+from compression import detect_compression, open_source
+from dialect import column_names, csv_reader_options
+from file_readers import iter_json_records, records_to_frame, iter_xml_records, text_records_to_frame
+from type_inference import zero_padded_columns
+
+DEFAULT_SAMPLE_SIZE = 100
+
+# Encodings whose line breaks are not single bytes
+WIDE_ENCODINGS = {"utf-16", "utf-32"}
+
+_EXHAUSTED = object()
+
+
+class _CountingIterator:
+    """Wraps an iterator and counts how many items were consumed"""
+
+    def __init__(self, items: Iterable):
+        self.items = iter(items)
+        self.count = 0
+
+    def __iter__(self) -> Iterator:
+        return self
+
+    def __next__(self):
+        item = next(self.items)
+        self.count += 1
+        return item
+
+
+def reservoir_sample(items: Iterable, k: int, seed: Optional[int] = None) -> Tuple[List[Any], int]:
+    """
+    Uniform sample of k items in a single pass (Li's Algorithm L)
+
+    Items between reservoir replacements are skipped without drawing random
+    numbers, so the cost is dominated by the underlying sequential read.
+
+    Returns:
+        (sampled items in their original order, number of items scanned)
+    """
+    rng = random.Random(seed)
+    stream = _CountingIterator(items)
+    reservoir = list(enumerate(islice(stream, k)))
+    if len(reservoir) < k:
+        return [item for _, item in reservoir], stream.count
+
+    w = math.exp(math.log(rng.random()) / k)
+    while True:
+        skip = int(math.log(rng.random()) / math.log(1 - w))
+        deque(islice(stream, skip), maxlen=0)
+        item = next(stream, _EXHAUSTED)
+        if item is _EXHAUSTED:
+            break
+        reservoir[rng.randrange(k)] = (stream.count - 1, item)
+        w *= math.exp(math.log(rng.random()) / k)
+
+    reservoir.sort(key=lambda entry: entry[0])
+    return [item for _, item in reservoir], stream.count
+
+
+def _rows_to_frame(header: List[str], rows: List[List[str]]) -> pd.DataFrame:
+    """Re-parse sampled CSV rows so dtype inference matches pd.read_csv"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    writer.writerows(rows)
+    buffer.seek(0)
+    return pd.read_csv(buffer, dtype={name: str for name in zero_padded_columns(header, rows)})
+
+
+def _seek_offsets(data_start: int, file_size: int, k: int, rng: random.Random) -> List[int]:
+    """One random offset inside each of k equal byte ranges of the data region"""
+    span = (file_size - data_start) / k
+    # The first range starts at the first data row so it is never skipped
+    return [data_start] + [data_start + int((i + rng.random()) * span) for i in range(1, k)]
+
+
+def _seek_lines(file_path: str, k: int, seed: Optional[int],
+                skip_header: bool) -> Tuple[Optional[bytes], List[bytes]]:
+    """
+    Read one whole line after each of k evenly spread byte offsets
+
+    Returns:
+        (header line or None, sampled lines in file order, without duplicates)
+    """
+    rng = random.Random(seed)
+    file_size = os.path.getsize(file_path)
+    lines = {}
+    with open(file_path, 'rb') as f:
+        header = f.readline() if skip_header else None
+        data_start = f.tell()
+        if file_size <= data_start:
+            return header, []
+        for offset in _seek_offsets(data_start, file_size, k, rng):
+            f.seek(offset)
+            if offset > data_start:
+                # Discard the partial line the offset landed in
+                f.readline()
+            line_start = f.tell()
+            line = f.readline()
+            if line.strip() and line_start not in lines:
+                lines[line_start] = line
+    return header, [lines[start] for start in sorted(lines)]
+
+
+def _header(reader: Iterator[List[str]], dialect: Optional[Dict[str, Any]]) -> List[str]:
+    """Column names from the first row, or generated names for headerless files"""
+    names = column_names(dialect) if dialect else None
+    return names if names is not None else next(reader, [])
+
+
+def reservoir_sample_csv(file_path: str, k: int = DEFAULT_SAMPLE_SIZE, seed: Optional[int] = None,
+                         dialect: Optional[Dict[str, Any]] = None) -> Tuple[pd.DataFrame, int]:
+    """Uniform sample of k delimited rows in one sequential pass"""
+    encoding = dialect["encoding"] if dialect else "utf-8"
+    with open_source(file_path, encoding=encoding) as f:
+        reader = csv.reader(f, **csv_reader_options(dialect))
+        header = _header(reader, dialect)
+        rows, scanned = reservoir_sample(reader, k, seed)
+    return _rows_to_frame(header, rows), scanned
+
+
+def seek_sample_csv(file_path: str, k: int = DEFAULT_SAMPLE_SIZE, seed: Optional[int] = None,
+                    dialect: Optional[Dict[str, Any]] = None) -> Tuple[pd.DataFrame, int]:
+    """
+    Sample delimited rows evenly across the file's byte range using seeks
+
+    Rows containing quoted line breaks may be cut at a seek point; such
+    fragments are detected by their field count and dropped. Compressed
+    files cannot be seeked into, and UTF-16/32 lines cannot be found by
+    byte, so both fall back to a reservoir pass.
+    """
+    encoding = dialect["encoding"] if dialect else "utf-8"
+    if detect_compression(file_path) or encoding in WIDE_ENCODINGS:
+        return reservoir_sample_csv(file_path, k, seed, dialect)
+    names = column_names(dialect) if dialect else None
+    header_line, lines = _seek_lines(file_path, k, seed, skip_header=names is None)
+    decoded = [line.decode(encoding, errors='replace') for line in lines]
+    options = csv_reader_options(dialect)
+    if names is None:
+        header_text = header_line.decode(encoding, errors='replace') if header_line else ""
+        names = next(csv.reader([header_text], **options), [])
+    rows = [row for row in csv.reader(decoded, **options) if len(row) == len(names)]
+    return _rows_to_frame(names, rows), len(lines)
+
+
+def reservoir_sample_json(file_path: str, k: int = DEFAULT_SAMPLE_SIZE,
+                          seed: Optional[int] = None) -> Tuple[pd.DataFrame, int]:
+    """Uniform sample of k records from a JSON array or JSON Lines file"""
+    records, scanned = reservoir_sample(iter_json_records(file_path), k, seed)
+    return records_to_frame(records), scanned
+
+
+def seek_sample_json(file_path: str, k: int = DEFAULT_SAMPLE_SIZE,
+                     seed: Optional[int] = None) -> Tuple[pd.DataFrame, int]:
+    """
+    Sample JSON Lines records evenly across the file's byte range
+
+    JSON arrays have no reliable record boundary to seek to, and compressed
+    files cannot be seeked into, so both fall back to a single-pass
+    reservoir sample.
+    """
+    with open_source(file_path) as f:
+        is_array = f.read(64).lstrip().startswith('[')
+    if is_array or detect_compression(file_path):
+        return reservoir_sample_json(file_path, k, seed)
+
+    _, lines = _seek_lines(file_path, k, seed, skip_header=False)
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records_to_frame(records), len(lines)
+
+
+def reservoir_sample_xml(file_path: str, k: int = DEFAULT_SAMPLE_SIZE,
+                         seed: Optional[int] = None) -> Tuple[pd.DataFrame, int]:
+    """
+    Uniform sample of k records from an XML feed
+
+    Also used for seek mode: XML has no line-aligned record boundary to seek to.
+    """
+    records, scanned = reservoir_sample(iter_xml_records(file_path), k, seed)
+    return text_records_to_frame(records), scanned
+
+
+SAMPLERS = {
+    ("reservoir", "csv"): reservoir_sample_csv,
+    ("seek", "csv"): seek_sample_csv,
+    ("reservoir", "json"): reservoir_sample_json,
+    ("seek", "json"): seek_sample_json,
+    ("reservoir", "xml"): reservoir_sample_xml,
+    ("seek", "xml"): reservoir_sample_xml
+}
+
+
+def sample_file(file_path: str, file_type: str, method: str, k: int = DEFAULT_SAMPLE_SIZE,
+                seed: Optional[int] = None,
+                dialect: Optional[Dict[str, Any]] = None) -> Tuple[pd.DataFrame, int]:
+    """
+    Draw a sample of k rows using the given method
+
+    Args:
+        file_path: Path to the source data file
+        file_type: Type of file (csv, json, xml)
+        method: "reservoir" (single sequential pass) or "seek" (byte-offset strata)
+        k: Sample size
+        seed: Random seed for reproducible samples
+        dialect: Sniffed delimiter, quoting, header and encoding of a delimited file
+
+    Returns:
+        (sampled rows as a DataFrame, number of rows scanned)
+    """
+    sampler = SAMPLERS.get((method, file_type.lower()))
+    if sampler is None:
+        raise ValueError(f"Unsupported sampling method {method!r} for file type: {file_type}")
+    if file_type.lower() == 'csv':
+        return sampler(file_path, k, seed, dialect)
+    return sampler(file_path, k, seed)
@@ -0,0 +1,84 @@
+"""
+Hermes Config Generator - Schema Cache
+Skips re-profiling of landing files whose content has not changed
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Any, Optional
+
+from disk_cache import DiskCache, CACHE_DIR
+
+# Bytes hashed at the head and tail of the file
+EDGE_BLOCK_SIZE = 64 * 1024
+
+# Bytes hashed at each evenly spaced interior offset
+SAMPLE_BLOCK_SIZE = 4 * 1024
+SAMPLE_BLOCK_COUNT = 8
+
+# Part of every key; bump it whenever the analyzer changes the schema it produces,
+# so schemas written by older code are never served (last: per-analysis format cache)
+SCHEMA_VERSION = 9
+
+
+def file_fingerprint(file_path: str) -> str:
+    """
+    Fast content fingerprint of a file
+
+    Combines size and mtime with hashes of the head, the tail and a few
+    interior blocks, so the cost is constant regardless of file size.
+    """
+    stat = os.stat(file_path)
+    size = stat.st_size
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{size}:{stat.st_mtime_ns}".encode())
+
+    offsets = [0, max(size - EDGE_BLOCK_SIZE, 0)]
+    interior = size - 2 * EDGE_BLOCK_SIZE
+    if interior > 0:
+        step = interior // (SAMPLE_BLOCK_COUNT + 1)
+        offsets[1:1] = [EDGE_BLOCK_SIZE + step * (i + 1) for i in range(SAMPLE_BLOCK_COUNT)]
+
+    with open(file_path, 'rb') as f:
+        for offset in offsets:
+            f.seek(offset)
+            block_size = EDGE_BLOCK_SIZE if offset in (0, offsets[-1]) else SAMPLE_BLOCK_SIZE
+            digest.update(f.read(block_size))
+    return digest.hexdigest()
+
+
+class SchemaCache:
+    """Persistent cache of analyzed schemas keyed by file fingerprint"""
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 500):
+        self.cache = DiskCache(db_path or os.path.join(CACHE_DIR, "schema_cache.sqlite"), max_entries)
+
+    def make_key(self, file_path: str, file_type: str, **analysis_options) -> str:
+        """Cache key from the schema version, the file fingerprint and the options that shape the schema"""
+        options = json.dumps(analysis_options, sort_keys=True, default=str)
+        return f"v{SCHEMA_VERSION}:{file_fingerprint(file_path)}:{file_type.lower()}:{options}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached schema or None"""
+        return self.cache.get(key)
+
+    def put(self, key: str, schema: Dict[str, Any]):
+        """Store a schema; failed analyses are never cached"""
+        if "error" not in schema:
+            self.cache.put(key, schema)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        return self.cache.stats()
+
+
+_schema_cache = None
+
+
+def get_schema_cache() -> SchemaCache:
+    """Get the process-wide schema cache instance"""
+    global _schema_cache
+    if _schema_cache is None:
+        _schema_cache = SchemaCache()
+    return _schema_cache
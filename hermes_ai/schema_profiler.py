@@ -0,0 +1,321 @@
+"""
+Hermes Config Generator - Schema Profiler
+Streaming, bounded-memory column profiling for large source files
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any, Optional, Iterable
+
+from file_readers import read_json_sample, iter_json_chunks, read_xml_sample, iter_xml_chunks
+from type_inference import SemanticTypeInferer, infer_semantic_type, merge_semantic_types, parse_values
+from compression import SourceFile, open_source
+from dialect import read_csv_options
+from sketches import HyperLogLog, TDigest, SpaceSaving, QUANTILES
+
+# Default memory ceiling for a single in-flight chunk
+DEFAULT_MAX_MEMORY_MB = 256
+
+# Rows read to estimate the in-memory width of a row
+PROBE_ROWS = 1000
+
+# Parsing and per-column temporaries need headroom on top of the chunk itself
+MEMORY_OVERHEAD_FACTOR = 4
+
+MIN_CHUNK_ROWS = 1000
+
+SAMPLE_VALUE_COUNT = 3
+
+# Most frequent values listed per column; the sketch tracks more
+TOP_VALUE_COUNT = 5
+
+
+def to_json_value(value: Any) -> Any:
+    """Convert pandas/numpy scalars into JSON-serializable values"""
+    if value is None:
+        return None
+    if hasattr(value, 'isoformat'):
+        return str(value)
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def merge_dtypes(current: Optional[str], new: str) -> str:
+    """Promote the dtype seen so far with the dtype of a new chunk"""
+    if current is None or current == new:
+        return new
+    try:
+        current_dtype, new_dtype = np.dtype(current), np.dtype(new)
+    except TypeError:
+        return "object"
+    numeric = (np.issubdtype(current_dtype, np.number) and np.issubdtype(new_dtype, np.number))
+    if numeric:
+        return str(np.result_type(current_dtype, new_dtype))
+    return "object"
+
+
+class ColumnSketches:
+    """Distinct-count, quantile and top-k sketches for one column, mergeable across chunks and workers"""
+
+    def __init__(self):
+        self.distinct = HyperLogLog()
+        self.quantiles = TDigest()
+        self.top_k = SpaceSaving()
+
+    def update(self, non_null: pd.Series, numeric_values: Optional[np.ndarray] = None):
+        """Add the non-null values of a chunk (and their float64 form for numeric columns)"""
+        if non_null.empty:
+            return
+        self.distinct.update(non_null)
+        if numeric_values is not None:
+            self.quantiles.update(numeric_values)
+        try:
+            counts = non_null.value_counts()
+        except TypeError:
+            # Unhashable values (e.g. nested JSON) have no meaningful frequencies
+            return
+        capacity = self.top_k.capacity
+        floor = int(counts.iloc[capacity]) if len(counts) > capacity else 0
+        self.top_k.update({to_json_value(value): int(count) for value, count in counts.head(capacity).items()}, floor)
+
+    def merge(self, other: "ColumnSketches"):
+        """Combine with the sketches of another chunk or worker"""
+        self.distinct.merge(other.distinct)
+        self.quantiles.merge(other.quantiles)
+        self.top_k.merge(other.top_k)
+
+    def summary(self) -> Dict[str, Any]:
+        """Readable quantiles and frequent values plus the serialized sketches"""
+        info = {"top_values": [{"value": item["value"], "count": item["count"]}
+                               for item in self.top_k.top(TOP_VALUE_COUNT)]}
+        if self.quantiles.count:
+            info["quantiles"] = {f"p{round(q * 100):02d}": self.quantiles.quantile(q) for q in QUANTILES}
+        info["sketches"] = self.to_dict()
+        return info
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "hll": self.distinct.to_dict(),
+            "tdigest": self.quantiles.to_dict(),
+            "top_k": self.top_k.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ColumnSketches":
+        sketches = cls()
+        sketches.distinct = HyperLogLog.from_dict(data["hll"])
+        sketches.quantiles = TDigest.from_dict(data["tdigest"])
+        sketches.top_k = SpaceSaving.from_dict(data["top_k"])
+        return sketches
+
+
+class ColumnProfile:
+    """Running statistics for a single column, updated one chunk at a time"""
+
+    def __init__(self, name: str, inferer: Optional[SemanticTypeInferer] = None):
+        self.name = name
+        # Format cache shared by the columns of one analysis
+        self.inferer = inferer
+        self.dtype = None
+        self.row_count = 0
+        self.null_count = 0
+        self.min = None
+        self.max = None
+        # Values min/max are compared by: parsed dates or numbers for text columns
+        self.min_key = None
+        self.max_key = None
+        self.range_format = None
+        self.range_comparable = True
+        self.numeric_count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sample_values = []
+        self.sketches = ColumnSketches()
+        self.semantic_type = None
+        self.parse_format = None
+
+    def update(self, series: pd.Series):
+        """Fold a chunk of this column into the running statistics"""
+        self.dtype = merge_dtypes(self.dtype, str(series.dtype))
+        self.row_count += len(series)
+
+        if len(self.sample_values) < SAMPLE_VALUE_COUNT:
+            needed = SAMPLE_VALUE_COUNT - len(self.sample_values)
+            self.sample_values.extend(series.head(needed).tolist())
+
+        non_null = series.dropna()
+        self.null_count += len(series) - len(non_null)
+        if non_null.empty:
+            return
+
+        self._update_semantic_type(non_null)
+        self._update_range(non_null)
+
+        values = None
+        if pd.api.types.is_numeric_dtype(non_null) and not pd.api.types.is_bool_dtype(non_null):
+            values = non_null.to_numpy(dtype=np.float64)
+            self._update_moments(len(values), float(values.mean()),
+                                 float(((values - values.mean()) ** 2).sum()))
+        self.sketches.update(non_null, values)
+
+    def _update_range(self, non_null: pd.Series):
+        """
+        Track min/max in the column's natural order
+
+        Text columns are compared after parsing with the inferred format, so
+        dd/mm/yyyy dates and separated amounts are not ordered as strings;
+        min/max keep the feed's own text. Columns with incomparable values,
+        a format that changed between chunks or text whose order is
+        meaningless keep no range.
+        """
+        if not self.range_comparable:
+            return
+        keys = non_null
+        if pd.api.types.is_object_dtype(non_null) or pd.api.types.is_string_dtype(non_null):
+            range_format = (self.semantic_type, self.parse_format)
+            if self.range_format not in (None, range_format):
+                return self._drop_range()
+            self.range_format = range_format
+            if self.semantic_type != "string" and self.parse_format != "zero_padded":
+                keys = parse_values(non_null, *range_format)
+                if keys is None:
+                    return self._drop_range()
+                keys = keys.dropna()
+                if keys.empty:
+                    return
+        try:
+            chunk_min, chunk_max = keys.min(), keys.max()
+            if self.min_key is None or chunk_min < self.min_key:
+                self.min_key, self.min = chunk_min, non_null.loc[keys.index[keys == chunk_min][0]]
+            if self.max_key is None or chunk_max > self.max_key:
+                self.max_key, self.max = chunk_max, non_null.loc[keys.index[keys == chunk_max][0]]
+        except TypeError:
+            self._drop_range()
+
+    def _drop_range(self):
+        self.min = self.max = self.min_key = self.max_key = None
+        self.range_comparable = False
+
+    def _update_semantic_type(self, non_null: pd.Series):
+        """Widen the semantic type when a chunk disagrees with earlier ones"""
+        inferred = infer_semantic_type(non_null, self.inferer)
+        merged = merge_semantic_types(self.semantic_type, inferred["semantic_type"])
+        if merged != self.semantic_type or self.parse_format != inferred["parse_format"]:
+            self.parse_format = inferred["parse_format"] if merged == inferred["semantic_type"] else None
+        self.semantic_type = merged
+
+    def _update_moments(self, count: int, mean: float, m2: float):
+        """Combine mean/variance with another partition (Chan et al.)"""
+        total = self.numeric_count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.numeric_count * count / total
+        self.numeric_count = total
+
+    def to_column_info(self) -> Dict[str, Any]:
+        """Render in the schema["columns"] format used by the other agents"""
+        col_info = {
+            "name": self.name,
+            "dtype": self.dtype or "object",
+            "null_count": int(self.null_count),
+            "unique_count": int(self.sketches.distinct.estimate()),
+            "sample_values": [to_json_value(val) for val in self.sample_values],
+            "min": to_json_value(self.min),
+            "max": to_json_value(self.max),
+            "semantic_type": self.semantic_type or "string",
+            "parse_format": self.parse_format
+        }
+        if self.numeric_count:
+            col_info["mean"] = self.mean
+            col_info["variance"] = self.m2 / (self.numeric_count - 1) if self.numeric_count > 1 else 0.0
+        col_info.update(self.sketches.summary())
+        return col_info
+
+
+class StreamingProfiler:
+    """Profiles whole files in bounded-memory chunks"""
+
+    def __init__(self, max_memory_mb: int = DEFAULT_MAX_MEMORY_MB):
+        self.max_memory_mb = max_memory_mb
+
+    def chunk_rows_for(self, probe: pd.DataFrame) -> int:
+        """Rows per chunk that keep a chunk within the memory ceiling"""
+        if probe.empty:
+            return MIN_CHUNK_ROWS
+        bytes_per_row = probe.memory_usage(deep=True).sum() / len(probe)
+        budget = self.max_memory_mb * 1024 * 1024 / MEMORY_OVERHEAD_FACTOR
+        return max(MIN_CHUNK_ROWS, int(budget / max(bytes_per_row, 1)))
+
+    def profile_csv(self, file_path: str, max_rows: Optional[int] = None,
+                    usecols: Optional[List[int]] = None,
+                    dialect: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Profile every row of a (possibly compressed) delimited file, optionally a column subset"""
+        source = SourceFile(file_path)
+        encoding = dialect["encoding"] if dialect else "utf-8"
+        options = read_csv_options(dialect)
+        with open_source(source, encoding=encoding) as f:
+            probe = pd.read_csv(f, nrows=PROBE_ROWS, usecols=usecols, **options)
+        chunk_rows = self.chunk_rows_for(probe)
+        with open_source(source, encoding=encoding) as f:
+            with pd.read_csv(f, chunksize=chunk_rows, nrows=max_rows, usecols=usecols, **options) as reader:
+                profile = self.profile_chunks(reader, chunk_rows)
+        return self._with_throughput(profile, source)
+
+    def profile_json(self, file_path: str, max_rows: Optional[int] = None) -> Dict[str, Any]:
+        """Profile every record of a JSON array or JSON Lines file, or the first max_rows"""
+        source = SourceFile(file_path)
+        probe = read_json_sample(source, nrows=PROBE_ROWS)
+        chunk_rows = self.chunk_rows_for(probe)
+        profile = self.profile_chunks(iter_json_chunks(source, chunk_rows, max_rows), chunk_rows)
+        return self._with_throughput(profile, source)
+
+    def profile_xml(self, file_path: str, max_rows: Optional[int] = None) -> Dict[str, Any]:
+        """Profile every record of an XML feed, or the first max_rows"""
+        source = SourceFile(file_path)
+        probe = read_xml_sample(source, nrows=PROBE_ROWS)
+        chunk_rows = self.chunk_rows_for(probe)
+        profile = self.profile_chunks(iter_xml_chunks(source, chunk_rows, max_rows), chunk_rows)
+        return self._with_throughput(profile, source)
+
+    def _with_throughput(self, profile: Dict[str, Any], source: SourceFile) -> Dict[str, Any]:
+        """Add compressed and uncompressed read throughput to the profile stats"""
+        profile["profile_stats"].update(source.throughput(profile["profile_stats"]["elapsed_seconds"]))
+        return profile
+
+    def profile_chunks(self, chunks: Iterable[pd.DataFrame],
+                       chunk_rows: Optional[int] = None) -> Dict[str, Any]:
+        """Fold an iterable of DataFrame chunks into per-column profiles"""
+        start = time.perf_counter()
+        profiles: Dict[str, ColumnProfile] = {}
+        inferer = SemanticTypeInferer()
+        rows = 0
+
+        for chunk in chunks:
+            for col in chunk.columns:
+                if col not in profiles:
+                    profiles[col] = ColumnProfile(col, inferer)
+                    # Column first seen in a later chunk was null in all earlier rows
+                    profiles[col].null_count = rows
+                    profiles[col].row_count = rows
+                profiles[col].update(chunk[col])
+            for col, profile in profiles.items():
+                if col not in chunk.columns:
+                    profile.null_count += len(chunk)
+                    profile.row_count += len(chunk)
+            rows += len(chunk)
+
+        elapsed = time.perf_counter() - start
+        return {
+            "rows_profiled": rows,
+            "columns": [profile.to_column_info() for profile in profiles.values()],
+            "profile_stats": {
+                "elapsed_seconds": round(elapsed, 3),
+                "rows_per_sec": int(rows / elapsed) if elapsed > 0 else rows,
+                "chunk_rows": chunk_rows,
+                "max_memory_mb": self.max_memory_mb
+            }
+        }
@@ -0,0 +1,106 @@
+"""
+Hermes Config Generator - Single-Flight Coalescing
+Concurrent identical requests in one process share a single in-flight computation
+"""
+
+import copy
+import threading
+from typing import Dict, Any, Callable, Optional, Tuple
+
+
+class Flight:
+    """One in-flight computation; followers wait on it for the leader's outcome"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.followers = 0
+        self.value = None
+        self.error: Optional[BaseException] = None
+        self._done = threading.Event()
+
+    def wait(self) -> Any:
+        """Block until the leader finishes, then return a private copy of its value or raise its error"""
+        self._done.wait()
+        if self.error is not None:
+            raise self.error
+        # Followers may change what they get back, so each gets its own copy
+        return copy.deepcopy(self.value)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent requests with the same key
+
+    The first caller for a key becomes the leader and computes the result;
+    callers arriving while it is in flight become followers and receive a
+    copy of the leader's result (or its exception) instead of repeating the
+    work. Nothing is kept once the flight lands, so this never serves stale
+    results; caching is left to the caches.
+
+    do() covers the usual case. Callers that need to stream their own
+    progress, like a streamed LLM completion, use join() and then land()
+    as leader or Flight.wait() as follower.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, Flight] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def join(self, key: str) -> Tuple[Flight, bool]:
+        """(flight, is_leader) for a key; a leader must call land() exactly once"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.followers += 1
+                self.followers += 1
+                return flight, False
+            flight = self._flights[key] = Flight(key)
+            self.leaders += 1
+            return flight, True
+
+    def land(self, flight: Flight, value: Any = None, error: Optional[BaseException] = None):
+        """Publish the leader's outcome to its followers and retire the key"""
+        with self._lock:
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+        flight.value, flight.error = value, error
+        flight._done.set()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run fn, or wait for an identical call already running; returns (value, shared)"""
+        flight, leader = self.join(key)
+        if not leader:
+            return flight.wait(), True
+        try:
+            value = fn()
+        except BaseException as e:
+            self.land(flight, error=e)
+            raise
+        self.land(flight, value)
+        return value, False
+
+    def stats(self) -> Dict[str, Any]:
+        """Computations run, requests that shared one, and keys now in flight"""
+        with self._lock:
+            requests = self.leaders + self.followers
+            return {
+                "computations": self.leaders,
+                "coalesced": self.followers,
+                "in_flight": len(self._flights),
+                "coalesced_rate": round(self.followers / requests, 4) if requests else 0.0
+            }
+
+
+_single_flight = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide coalescing group, shared by all sessions and agents"""
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+        return _single_flight
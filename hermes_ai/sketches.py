@@ -0,0 +1,246 @@
+"""
+Hermes Config Generator - Sketches
+Fixed-size, mergeable summaries of column distributions
+"""
+
+import base64
+import zlib
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any, Optional, Tuple
+
+# 2**12 one-byte registers: about 1.6% standard error on distinct counts
+HLL_PRECISION = 12
+HLL_ERROR = 1.04 / 2 ** (HLL_PRECISION / 2)
+
+# Upper bound on t-digest centroids; tails get the smallest centroids
+TDIGEST_COMPRESSION = 100
+
+# Values tracked by the space-saving summary; only the top few are reported
+TOP_K_CAPACITY = 64
+
+QUANTILES = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+# Share of rows holding a single value above which a column counts as skewed
+SKEW_THRESHOLD = 0.5
+
+# Semantic types that can serve as a deduplication key
+KEY_SEMANTIC_TYPES = ("integer", "identifier", "string")
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Exact bit length of uint64 values, via 32-bit halves that float64 represents exactly"""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter; merging takes the register-wise maximum"""
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values: pd.Series):
+        """Add the non-null values of a chunk"""
+        if values.empty:
+            return
+        hashed = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        index = (hashed >> np.uint64(64 - self.precision)).astype(np.int64)
+        remainder = hashed << np.uint64(self.precision)
+        # Position of the leftmost 1-bit in the remaining 64 - precision bits
+        rank = np.minimum(65 - _bit_length(remainder), 64 - self.precision + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog"):
+        """Combine with a counter built from another chunk or worker"""
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        """Estimated number of distinct values"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            return int(round(m * np.log(m / zeros)))
+        return int(round(raw))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "precision": self.precision,
+            "registers": base64.b64encode(zlib.compress(self.registers.tobytes())).decode("ascii")
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HyperLogLog":
+        sketch = cls(data["precision"])
+        registers = zlib.decompress(base64.b64decode(data["registers"]))
+        sketch.registers = np.frombuffer(registers, dtype=np.uint8).copy()
+        return sketch
+
+
+class TDigest:
+    """
+    Merging t-digest for quantiles of numeric columns
+
+    Each update sorts the new values together with the existing centroids
+    and regroups them under the arcsine scale function, so a chunk is
+    folded in with a handful of vectorized passes.
+    """
+
+    def __init__(self, compression: int = TDIGEST_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0, dtype=np.float64)
+        self.weights = np.empty(0, dtype=np.float64)
+        self.min = None
+        self.max = None
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values: np.ndarray):
+        """Add a chunk of numeric values"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        if len(values):
+            self._absorb(values, np.ones(len(values)), float(values.min()), float(values.max()))
+
+    def merge(self, other: "TDigest"):
+        """Combine with a digest built from another chunk or worker"""
+        if len(other.means):
+            self._absorb(other.means, other.weights, other.min, other.max)
+
+    def _absorb(self, means: np.ndarray, weights: np.ndarray, low: float, high: float):
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        means = np.concatenate([self.means, means])
+        weights = np.concatenate([self.weights, weights])
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+
+        centers = (np.cumsum(weights) - weights / 2) / weights.sum()
+        scale = np.floor(self.compression * (np.arcsin(2 * centers - 1) / np.pi + 0.5))
+        starts = np.flatnonzero(np.r_[True, scale[1:] != scale[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate value at quantile q (0..1)"""
+        if not len(self.means):
+            return None
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centers, [total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(q * total, positions, values))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "compression": self.compression,
+            "min": self.min,
+            "max": self.max,
+            "centroids": [[float(m), float(w)] for m, w in zip(self.means, self.weights)]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TDigest":
+        sketch = cls(data["compression"])
+        sketch.min, sketch.max = data["min"], data["max"]
+        if data["centroids"]:
+            sketch.means, sketch.weights = (np.array(axis, dtype=np.float64) for axis in zip(*data["centroids"]))
+        return sketch
+
+
+class SpaceSaving:
+    """
+    Space-saving summary of the most frequent values
+
+    Counts are upper bounds; count - error is a guaranteed lower bound.
+    `floor` is the most any untracked value can have occurred.
+    """
+
+    def __init__(self, capacity: int = TOP_K_CAPACITY):
+        self.capacity = capacity
+        self.counters: Dict[Any, Tuple[int, int]] = {}
+        self.floor = 0
+
+    def update(self, counts: Dict[Any, int], floor: int = 0):
+        """
+        Add the exact counts of a chunk's most frequent values
+
+        Args:
+            counts: Up to `capacity` values of the chunk with their counts
+            floor: Largest count among the chunk's values left out of counts
+        """
+        other = SpaceSaving(self.capacity)
+        other.counters = {value: (int(count), 0) for value, count in counts.items()}
+        other.floor = int(floor)
+        other._truncate()
+        self.merge(other)
+
+    def merge(self, other: "SpaceSaving"):
+        """Combine with a summary built from another chunk or worker"""
+        merged = {}
+        for value in set(self.counters) | set(other.counters):
+            count_a, error_a = self.counters.get(value, (self.floor, self.floor))
+            count_b, error_b = other.counters.get(value, (other.floor, other.floor))
+            merged[value] = (count_a + count_b, error_a + error_b)
+        self.counters = merged
+        self.floor += other.floor
+        self._truncate()
+
+    def _truncate(self):
+        """Keep the `capacity` largest counters"""
+        if len(self.counters) <= self.capacity:
+            return
+        ranked = sorted(self.counters.items(), key=lambda item: item[1][0], reverse=True)
+        self.counters = dict(ranked[:self.capacity])
+        self.floor = max(self.floor, ranked[self.capacity][1][0])
+
+    def top(self, k: int) -> List[Dict[str, Any]]:
+        """The k most frequent values with their estimated counts"""
+        ranked = sorted(self.counters.items(), key=lambda item: item[1][0], reverse=True)[:k]
+        return [{"value": value, "count": count, "error": error} for value, (count, error) in ranked]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "floor": self.floor,
+            "counters": [[value, count, error] for value, (count, error) in self.counters.items()]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpaceSaving":
+        sketch = cls(data["capacity"])
+        sketch.floor = data["floor"]
+        sketch.counters = {value: (count, error) for value, count, error in data["counters"]}
+        return sketch
+
+
+def key_columns(schema: Dict[str, Any]) -> List[str]:
+    """Integer, identifier or text columns without nulls whose distinct count matches the row count"""
+    rows = schema.get("row_count_sample", 0)
+    if not rows:
+        return []
+    return [col["name"] for col in schema.get("columns", [])
+            if col.get("semantic_type", "string") in KEY_SEMANTIC_TYPES and col.get("null_count", 0) == 0
+            and col.get("unique_count", 0) >= (1 - 3 * HLL_ERROR) * rows]
+
+
+def top_value_share(col: Dict[str, Any], rows: int) -> Optional[float]:
+    """Share of non-null rows holding the column's most frequent value"""
+    present = rows - col.get("null_count", 0)
+    if not col.get("top_values") or present <= 0:
+        return None
+    return col["top_values"][0]["count"] / present
+
+
+def is_skewed(col: Dict[str, Any], rows: int) -> bool:
+    """Whether one value dominates the column, well beyond an even split of its distinct values"""
+    share = top_value_share(col, rows)
+    distinct = col.get("unique_count", 0)
+    return share is not None and distinct > 1 and share >= max(SKEW_THRESHOLD, 2 / distinct)
@@ -0,0 +1,237 @@
+"""
+Hermes Config Generator - Template Matcher
+Deterministic configs for schemas that fit a pre-built template
+"""
+
+import copy
+import re
+from difflib import SequenceMatcher
+from typing import Dict, List, Any, Optional, Tuple
+
+from templates import TemplateLibrary
+
+# Confidence at which a template is used instead of the LLM
+TEMPLATE_MATCH_THRESHOLD = 0.8
+
+# Similarity at which two normalized column names are taken as the same column
+NAME_SIMILARITY = 0.85
+
+# Templates for another file format still apply, at a discount
+FORMAT_MISMATCH_FACTOR = 0.9
+
+# Schema semantic types each template column type accepts
+COMPATIBLE_TYPES = {
+    "string": {"string", "identifier"},
+    "integer": {"integer"},
+    "decimal": {"decimal", "integer"},
+    "date": {"date", "timestamp"},
+    "timestamp": {"timestamp", "date"},
+    "json": {"string"},
+    "boolean": {"boolean"}
+}
+
+# Any value can be held as a string, so a string column matching on name alone scores this much
+WEAK_TYPE_SCORE = 0.5
+
+# Config column type for each semantic type of columns the template does not know
+SEMANTIC_CONFIG_TYPES = {
+    "identifier": "string",
+    "time": "string"
+}
+
+
+def normalize_name(name: str) -> str:
+    """Lower-case name with camelCase and punctuation turned into underscores"""
+    name = re.sub(r"(?<=[a-z0-9])(?=[A-Z])", "_", str(name))
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+def type_score(template_type: str, semantic_type: str) -> float:
+    """1.0 for compatible types, WEAK_TYPE_SCORE for a string template column, else 0"""
+    if semantic_type in COMPATIBLE_TYPES.get(template_type, {template_type}):
+        return 1.0
+    return WEAK_TYPE_SCORE if template_type == "string" else 0.0
+
+
+class TemplateMatcher:
+    """
+    Scores analyzed schemas against the template library
+
+    A template's confidence is the type-weighted share of its columns
+    found in the schema (by normalized name), scaled down slightly by the
+    share of schema columns the template does not know and by a file
+    format mismatch.
+    """
+
+    def __init__(self, library: Optional[TemplateLibrary] = None,
+                 threshold: float = TEMPLATE_MATCH_THRESHOLD):
+        self.library = library or TemplateLibrary()
+        self.threshold = threshold
+        # template_id -> [(normalized name, template column)]
+        self._columns = {
+            template_id: [(normalize_name(col["name"]), col)
+                          for col in template.get("feed_file_config", {}).get("columns", [])]
+            for template_id, template in self.library.templates.items()
+        }
+
+    def _match_columns(self, template_id: str, schema: Dict[str, Any]) -> Tuple[Dict[str, Dict[str, Any]], float]:
+        """(template column name -> schema column, summed type scores)"""
+        by_name = {normalize_name(col["name"]): col for col in schema.get("columns", [])}
+        matched, total = {}, 0.0
+        for normalized, template_col in self._columns[template_id]:
+            schema_col = by_name.get(normalized)
+            if schema_col is None:
+                candidates = [(SequenceMatcher(None, normalized, name).ratio(), name) for name in by_name]
+                ratio, name = max(candidates, default=(0.0, None))
+                schema_col = by_name[name] if ratio >= NAME_SIMILARITY else None
+            if schema_col is None:
+                continue
+            score = type_score(template_col.get("type", "string"), schema_col.get("semantic_type", "string"))
+            if score > 0:
+                matched[template_col["name"]] = schema_col
+                total += score
+        return matched, total
+
+    def score(self, template_id: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Confidence of one template for a schema, with the column mapping used"""
+        template_columns = self._columns[template_id]
+        schema_columns = schema.get("columns", [])
+        if not template_columns or not schema_columns:
+            return {"template_id": template_id, "confidence": 0.0, "column_mapping": {}}
+
+        matched, total = self._match_columns(template_id, schema)
+        recall = total / len(template_columns)
+        precision = len(matched) / len(schema_columns)
+        confidence = recall * (0.8 + 0.2 * precision)
+
+        template_format = self.library.templates[template_id].get("feed_file_config", {}).get("file_format", "")
+        if schema.get("file_type") and template_format and schema["file_type"].lower() != template_format.lower():
+            confidence *= FORMAT_MISMATCH_FACTOR
+
+        return {
+            "template_id": template_id,
+            "confidence": round(confidence, 3),
+            "column_mapping": {name: col["name"] for name, col in matched.items()}
+        }
+
+    def rank(self, schema: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Scores for every template, best first"""
+        scores = [self.score(template_id, schema) for template_id in self.library.templates]
+        return sorted(scores, key=lambda match: match["confidence"], reverse=True)
+
+    def best_match(self, schema: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The best template if its confidence reaches the threshold, else None"""
+        ranked = self.rank(schema)
+        if ranked and ranked[0]["confidence"] >= self.threshold:
+            return ranked[0]
+        return None
+
+    def instantiate(self, match: Dict[str, Any], schema: Dict[str, Any],
+                    feed_name: str, source_system: str) -> Dict[str, Any]:
+        """
+        Build a configuration from a matched template
+
+        Every schema column is listed in file order. Template columns keep
+        their flags under the schema's column names, and the others get
+        types from their semantic types. ETL steps and date control are
+        renamed to the schema's columns, and steps that use a column the
+        schema lacks are dropped.
+        """
+        template = copy.deepcopy(self.library.get_template(match["template_id"]))
+        template.pop("metadata", None)
+        mapping = match["column_mapping"]
+        template_columns = {col["name"]: col for _, col in self._columns[match["template_id"]]}
+        missing = set(template_columns) - set(mapping)
+        process_id = feed_name.upper().replace(" ", "_")
+
+        template["process_config"].update({
+            "process_id": process_id,
+            "process_name": feed_name,
+            "source_system": source_system
+        })
+
+        feed_config = template["feed_file_config"]
+        feed_config["feed_id"] = process_id
+        file_type = schema.get("file_type", feed_config.get("file_format", "csv"))
+        feed_config["file_format"] = file_type.upper()
+        if file_type == "csv":
+            dialect = schema.get("dialect", {})
+            feed_config["delimiter"] = dialect.get("delimiter", feed_config.get("delimiter", ","))
+            feed_config["header_row"] = dialect.get("has_header", True)
+            feed_config["encoding"] = dialect.get("encoding", feed_config.get("encoding", "utf-8"))
+            feed_config.pop("json_type", None)
+        else:
+            for key in ("delimiter", "header_row"):
+                feed_config.pop(key, None)
+        feed_config["columns"] = self._instantiate_columns(schema, mapping, template_columns)
+
+        template["etl_steps"] = [self._rename(step, mapping) for step in template.get("etl_steps", [])
+                                 if not self._references(step, missing)]
+        for step_id, step in enumerate(template["etl_steps"], 1):
+            step["step_id"] = step_id
+
+        if "date_control" in template:
+            template["date_control"] = self._instantiate_date_control(template["date_control"], schema, mapping)
+
+        if "file_pattern" in template:
+            slug = re.sub(r"[^a-z0-9]+", "_", feed_name.lower()).strip("_")
+            pattern = template["file_pattern"]
+            stem = pattern.get("output_pattern", "").split("_{")[0]
+            if stem:
+                pattern["output_pattern"] = slug + pattern["output_pattern"][len(stem):]
+            if pattern.get("output_location"):
+                pattern["output_location"] = re.sub(r"[^/]+/?$", slug + "/", pattern["output_location"])
+        return template
+
+    def _instantiate_columns(self, schema: Dict[str, Any], mapping: Dict[str, str],
+                             template_columns: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        reverse = {schema_name: template_name for template_name, schema_name in mapping.items()}
+        columns = []
+        for col in schema.get("columns", []):
+            has_nulls = col.get("null_count", 0) > 0
+            if col["name"] in reverse:
+                entry = dict(template_columns[reverse[col["name"]]], name=col["name"])
+                # The data wins over the template's expectation
+                entry["nullable"] = entry.get("nullable", True) or has_nulls
+            else:
+                semantic_type = col.get("semantic_type", "string")
+                entry = {"name": col["name"], "type": SEMANTIC_CONFIG_TYPES.get(semantic_type, semantic_type),
+                         "nullable": has_nulls}
+            columns.append(entry)
+        return columns
+
+    def _instantiate_date_control(self, date_control: Dict[str, Any], schema: Dict[str, Any],
+                                  mapping: Dict[str, str]) -> Dict[str, Any]:
+        columns = {col["name"]: col for col in schema.get("columns", [])}
+        date_column = mapping.get(date_control.get("business_date_column"))
+        if date_column is None:
+            date_column = next((col["name"] for col in schema.get("columns", [])
+                                if col.get("semantic_type") in ("date", "timestamp")), None)
+        date_control["business_date_column"] = date_column
+        parse_format = columns[date_column].get("parse_format") if date_column else None
+        if parse_format and parse_format.startswith("%"):
+            date_control["date_format"] = parse_format
+        return date_control
+
+    @staticmethod
+    def _references(step: Dict[str, Any], names: set) -> bool:
+        """Whether a step mentions any of the given column names"""
+        text = " ".join(str(value) for value in step.values())
+        return any(re.search(rf"\b{re.escape(name)}\b", text) for name in names)
+
+    @staticmethod
+    def _rename(step: Dict[str, Any], mapping: Dict[str, str]) -> Dict[str, Any]:
+        """Replace template column names in a step with the schema's"""
+        renames = {old: new for old, new in mapping.items() if old != new}
+        if not renames:
+            return step
+        pattern = re.compile(r"\b(" + "|".join(re.escape(name) for name in renames) + r")\b")
+
+        def rename(value):
+            if isinstance(value, str):
+                return pattern.sub(lambda m: renames[m.group(1)], value)
+            if isinstance(value, list):
+                return [rename(item) for item in value]
+            return value
+
+        return {key: rename(value) for key, value in step.items()}
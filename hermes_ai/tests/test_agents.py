@@ -0,0 +1,45 @@
+from agents import OrchestratorAgent
+
+
+def _orchestrator(fixes):
+    """Orchestrator whose repair call writes the given section values and records each request"""
+    orchestrator = OrchestratorAgent(use_schema_cache=False, use_llm_cache=False, offline=True)
+    calls = []
+
+    def repair_sections(config, sections, problems, schema, feed_name, source_system):
+        calls.append(list(sections))
+        for name in sections:
+            config[name] = fixes[name]
+        return list(sections)
+
+    orchestrator.config_generator.repair_sections = repair_sections
+    return orchestrator, calls
+
+
+def _config(**sections):
+    config = {"process_config": {"process_id": "P1", "process_name": "Feed", "source_system": "Test"}}
+    config.update(sections)
+    return config
+
+
+def _repair(orchestrator, config):
+    validation = orchestrator.validator.validate_config(config)
+    return orchestrator._repair_failing_sections(config, validation, {}, "Feed", "Test")
+
+
+def test_repair_stops_when_failing_sections_do_not_shrink():
+    config = _config(feed_file_config={"columns": []}, etl_steps=[{"step_name": "Load"}])
+    orchestrator, calls = _orchestrator({"feed_file_config": {"columns": []}})
+    validation, repairs = _repair(orchestrator, config)
+    assert len(calls) == 1
+    assert repairs == []
+    assert "feed_file_config" in validation["failing_sections"]
+
+
+def test_only_sections_passing_revalidation_count_as_repaired():
+    config = _config(feed_file_config={"columns": []}, etl_steps=[])
+    orchestrator, calls = _orchestrator({"feed_file_config": {"columns": [{"name": "id"}]}, "etl_steps": []})
+    validation, repairs = _repair(orchestrator, config)
+    assert [repair["repaired"] for repair in repairs] == [["feed_file_config"]]
+    assert calls[-1] == ["etl_steps"]
+    assert validation["failing_sections"] == ["etl_steps"]
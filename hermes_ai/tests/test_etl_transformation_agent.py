@@ -0,0 +1,32 @@
+from etl_transformation_agent import ETLTransformationAgent
+
+
+def _amount(**extra):
+    col = {"name": "amount", "dtype": "float64", "null_count": 0, "unique_count": 100, "semantic_type": "decimal",
+           "quantiles": {"p01": 10.0, "p99": 110.0},
+           "sketches": {"tdigest": {"min": 9.5, "max": 120.0}}}
+    col.update(extra)
+    return col
+
+
+def _range_rules(schema):
+    etl = ETLTransformationAgent(use_cache=False)._generate_fallback_transformation(schema, "target")
+    return [rule for rule in etl["data_quality_rules"] if rule["rule_type"] == "RANGE"]
+
+
+def test_complete_stream_profile_gives_exact_bounds():
+    rules = _range_rules({"columns": [_amount()], "profile_mode": "stream", "profile_complete": True})
+    assert rules[0]["validation_logic"] == "amount BETWEEN 9.5 AND 120"
+    assert rules[0]["severity"] == "ERROR"
+
+
+def test_sampled_profile_widens_quantiles_into_a_warning():
+    rules = _range_rules({"columns": [_amount()]})
+    assert rules[0]["validation_logic"] == "amount BETWEEN 0 AND 160"
+    assert rules[0]["severity"] == "WARNING"
+
+
+def test_sampled_profile_without_quantiles_gets_no_range_rule():
+    col = _amount()
+    del col["quantiles"]
+    assert _range_rules({"columns": [col]}) == []
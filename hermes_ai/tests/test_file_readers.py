@@ -0,0 +1,9 @@
+import xml.etree.ElementTree as ET
+
+from file_readers import _flatten_xml_record
+
+
+def test_attribute_only_leaf_adds_no_text_column():
+    record = _flatten_xml_record(ET.fromstring(
+        '<order id="7"><item sku="A"/><price currency="USD">10.5</price><note/></order>'))
+    assert record == {"id": "7", "item_sku": "A", "price_currency": "USD", "price": "10.5", "note": None}
@@ -0,0 +1,42 @@
+from rule_based_config import synthesize_config
+
+
+def _schema(columns):
+    return {"file_type": "psv", "row_count_sample": 100, "column_count": len(columns), "columns": columns,
+            "dialect": {"delimiter": "|", "quotechar": '"', "has_header": True, "encoding": "utf-8"}}
+
+
+def _rules(config):
+    return [(step["rule"], step["severity"]) for step in config["etl_steps"]
+            if step["step_name"] == "Validate Non-Negative Amounts"]
+
+
+def test_string_min_decimal_column_does_not_break_synthesis():
+    # Stream-mode profiles of thousands-separated decimals keep the raw text of min/max
+    schema = _schema([
+        {"name": "trade_id", "dtype": "object", "null_count": 0, "unique_count": 100,
+         "semantic_type": "identifier", "sample_values": ["T1", "T2"]},
+        {"name": "amount", "dtype": "object", "null_count": 0, "unique_count": 90,
+         "semantic_type": "decimal", "parse_format": "thousands=,", "min": "-1,017.55", "max": "2,500.00", "sample_values": ["1,017.55"]}
+    ])
+    config = synthesize_config(schema, "Amounts Feed", "Test")
+    assert config["feed_file_config"]["columns"][1]["name"] == "amount"
+    assert _rules(config) == []
+
+
+def test_complete_profile_parses_text_min_into_a_hard_rule():
+    # A full stream pass over thousands-separated decimals keeps min/max as text and has no quantiles
+    schema = _schema([
+        {"name": "amount", "dtype": "object", "null_count": 0, "unique_count": 90, "semantic_type": "decimal",
+         "parse_format": "thousands=,", "min": "1,017.55", "max": "2,500.00", "sample_values": ["1,017.55"]}
+    ])
+    schema.update(profile_mode="stream", profile_complete=True)
+    assert _rules(synthesize_config(schema, "Amounts Feed", "Test")) == [("amount >= 0", "ERROR")]
+
+
+def test_sampled_bounds_only_give_a_warning():
+    schema = _schema([
+        {"name": "amount", "dtype": "float64", "null_count": 0, "unique_count": 90, "semantic_type": "decimal",
+         "quantiles": {"p01": 12.5, "p99": 2400.0}, "sample_values": [12.5, 980.0]}
+    ])
+    assert _rules(synthesize_config(schema, "Amounts Feed", "Test")) == [("amount >= 0", "WARNING")]
@@ -0,0 +1,24 @@
+import pandas as pd
+
+from schema_profiler import StreamingProfiler
+
+
+def _profile(df, chunk_rows=3):
+    chunks = [df.iloc[start:start + chunk_rows] for start in range(0, len(df), chunk_rows)]
+    return {col["name"]: col for col in StreamingProfiler().profile_chunks(chunks)["columns"]}
+
+
+def test_text_ranges_follow_parsed_order_across_chunks():
+    columns = _profile(pd.DataFrame({
+        "trade_date": ["31/01/2024", "01/12/2024", "15/06/2024", "02/02/2024", "28/11/2024", "10/03/2024"],
+        "amount": ["9.50", "1,234,567.80", "455.10", "12.00", "3,400.75", "980.50"],
+        "side": ["buy", "sell", "buy", "sell", "buy", "sell"]
+    }))
+    assert (columns["trade_date"]["min"], columns["trade_date"]["max"]) == ("31/01/2024", "01/12/2024")
+    assert (columns["amount"]["min"], columns["amount"]["max"]) == ("9.50", "1,234,567.80")
+    assert (columns["side"]["min"], columns["side"]["max"]) == ("buy", "sell")
+
+
+def test_text_without_a_natural_order_keeps_no_range():
+    columns = _profile(pd.DataFrame({"active": ["true", "false", "true", "false"]}))
+    assert columns["active"]["min"] is None and columns["active"]["max"] is None
@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+from agents import SchemaAnalyzerAgent
+from type_inference import SemanticTypeInferer, infer_semantic_type
+
+
+def _columns(schema):
+    return {col["name"]: col for col in schema["columns"]}
+
+
+@pytest.mark.parametrize("mode", ["sample", "stream"])
+def test_zero_padded_csv_ids_are_identifiers(tmp_path, mode):
+    path = tmp_path / "accounts.csv"
+    path.write_text("account_id,balance\n" + "".join(f"{i:08d},{i * 1.5}\n" for i in range(1, 51)))
+    columns = _columns(SchemaAnalyzerAgent().analyze_file(str(path), "csv", mode=mode))
+    assert columns["account_id"]["semantic_type"] == "identifier"
+    assert columns["account_id"]["sample_values"][0] == "00000001"
+    assert columns["balance"]["semantic_type"] == "decimal"
+
+
+def test_zero_padded_json_ids_are_identifiers(tmp_path):
+    path = tmp_path / "accounts.json"
+    path.write_text("".join(f'{{"account_id": "{i:08d}", "units": {i}}}\n' for i in range(1, 51)))
+    columns = _columns(SchemaAnalyzerAgent().analyze_file(str(path), "json"))
+    assert columns["account_id"]["semantic_type"] == "identifier"
+    assert columns["units"]["semantic_type"] == "integer"
+
+
+def test_all_null_float_column_is_string_in_both_modes():
+    series = pd.Series([None, None], dtype="float64", name="unused")
+    assert infer_semantic_type(series)["semantic_type"] == "string"
+
+
+def test_separated_amounts_of_mixed_magnitude_are_decimal():
+    us = pd.Series(["1,250.00", "980.50", "12.00", "3,400.75", "455.10", "2,000.00"], name="us_amount")
+    eu = pd.Series(["1.250,00", "980,50", "12,00", "3.400,75"], name="eu_amount")
+    assert infer_semantic_type(us) == {"semantic_type": "decimal", "parse_format": "thousands=,"}
+    assert infer_semantic_type(eu) == {"semantic_type": "decimal", "parse_format": "thousands=.;decimal=,"}
+
+
+def test_learned_formats_do_not_leak_between_analyses():
+    us_dates = pd.Series(["12/31/2024", "11/30/2024"], name="trade_date")
+    ambiguous = pd.Series(["01/02/2024", "03/04/2024"], name="trade_date")
+    assert infer_semantic_type(us_dates)["parse_format"] == "%m/%d/%Y"
+    assert infer_semantic_type(ambiguous)["parse_format"] == "%d/%m/%Y"
+
+    # Chunks of one analysis share the inferer, so later chunks keep the column's format
+    inferer = SemanticTypeInferer()
+    infer_semantic_type(us_dates, inferer)
+    assert infer_semantic_type(ambiguous, inferer)["parse_format"] == "%m/%d/%Y"
@@ -0,0 +1,225 @@
+"""
+Hermes Config Generator - Type Inference
+Vectorized semantic type detection for columns that arrive as strings
+"""
+
+import warnings
+import pandas as pd
+from typing import Dict, List, Any, Optional, Tuple
+
+# Share of non-null values a candidate must parse to win
+MATCH_THRESHOLD = 0.95
+
+# Values tested per candidate before the winner is confirmed on a wider sample
+PROBE_SIZE = 1000
+
+# Evenly strided values used to confirm a candidate; bounds cost on huge columns
+VALIDATION_SIZE = 100000
+
+# Candidates are tried in order; the first one over the threshold wins.
+# Each entry is (semantic_type, parse_format).
+DATE_FORMATS = [
+    ("timestamp", "%Y-%m-%dT%H:%M:%SZ"),
+    ("timestamp", "%Y-%m-%dT%H:%M:%S.%fZ"),
+    ("timestamp", "%Y-%m-%dT%H:%M:%S"),
+    ("timestamp", "%Y-%m-%d %H:%M:%S"),
+    ("timestamp", "%Y-%m-%d %H:%M:%S.%f"),
+    ("date", "%Y-%m-%d"),
+    ("date", "%d/%m/%Y"),
+    ("date", "%m/%d/%Y"),
+    ("date", "%d-%b-%Y"),
+    ("date", "%d.%m.%Y"),
+    ("time", "%H:%M:%S"),
+    ("time", "%H:%M")
+]
+
+# Compact dates are indistinguishable from 8-digit integers unless the name says so
+COMPACT_DATE_FORMAT = ("date", "%Y%m%d")
+DATE_NAME_HINTS = ("date", "_dt", "dt_", "day")
+
+BOOLEAN_TOKENS = {"true", "false", "yes", "no", "y", "n", "t", "f"}
+
+# Regex candidates, matched against the whole stripped value
+PATTERNS = {
+    ("identifier", "zero_padded"): r"0\d+",
+    ("integer", "plain"): r"[+-]?(?:0|[1-9]\d*)",
+    ("decimal", "plain"): r"[+-]?\d*\.\d+|[+-]?\d+\.\d*",
+    # Separators are optional so amounts under 1,000 match the same candidate
+    ("decimal", "thousands=,"): r"[+-]?\d{1,3}(?:,\d{3})*(?:\.\d+)?",
+    ("decimal", "thousands=.;decimal=,"): r"[+-]?\d{1,3}(?:\.\d{3})*,\d+",
+    ("identifier", "prefixed"): r"[A-Za-z]{1,10}[-_]?\d+"
+}
+
+# Semantic types that one chunk may widen to when another disagrees
+WIDENING = {
+    frozenset(["integer", "decimal"]): "decimal",
+    frozenset(["date", "timestamp"]): "timestamp",
+    frozenset(["identifier", "integer"]): "identifier"
+}
+
+
+def merge_semantic_types(current: Optional[str], new: str) -> str:
+    """Combine semantic types inferred from different chunks of one column"""
+    if current is None or current == new:
+        return new
+    return WIDENING.get(frozenset([current, new]), "string")
+
+
+def _match_ratio(values: pd.Series, semantic_type: str, parse_format: str) -> float:
+    """Share of values that parse under one candidate, evaluated column-at-once"""
+    if values.empty:
+        return 0.0
+    if semantic_type == "boolean":
+        return float(values.str.lower().isin(BOOLEAN_TOKENS).mean())
+    if semantic_type in ("date", "timestamp", "time"):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            parsed = pd.to_datetime(values, format=parse_format, errors='coerce')
+        return float(parsed.notna().mean())
+    return float(values.str.fullmatch(PATTERNS[(semantic_type, parse_format)]).mean())
+
+
+def _candidates(column_name: str) -> List[Tuple[str, str]]:
+    """Candidate (semantic_type, parse_format) pairs in priority order"""
+    candidates = [("boolean", "tokens")] + list(DATE_FORMATS)
+    if any(hint in str(column_name).lower() for hint in DATE_NAME_HINTS):
+        candidates.append(COMPACT_DATE_FORMAT)
+    # Zero-padded IDs come first so integers do not swallow (and drop) the padding
+    candidates.extend(PATTERNS)
+    return candidates
+
+
+def _native_semantic_type(series: pd.Series) -> Optional[str]:
+    """Semantic type implied by a non-object pandas dtype"""
+    if pd.api.types.is_bool_dtype(series):
+        return "boolean"
+    if pd.api.types.is_integer_dtype(series):
+        return "integer"
+    if pd.api.types.is_float_dtype(series):
+        # Integer columns with nulls are read as float
+        non_null = series.dropna()
+        if non_null.empty:
+            # All-null columns carry no type; stream mode reports them as strings too
+            return None
+        return "integer" if bool((non_null % 1 == 0).all()) else "decimal"
+    if pd.api.types.is_datetime64_any_dtype(series):
+        non_null = series.dropna()
+        if non_null.empty:
+            return "timestamp"
+        return "date" if bool((non_null == non_null.dt.normalize()).all()) else "timestamp"
+    return None
+
+
+def parse_values(values: pd.Series, semantic_type: Optional[str],
+                 parse_format: Optional[str]) -> Optional[pd.Series]:
+    """
+    Text values converted under their inferred format, so they sort naturally
+
+    Unparseable values become NaN/NaT. Returns None when the type has no
+    parser (booleans, prefixed IDs, mixed columns).
+    """
+    if not parse_format:
+        return None
+    text = values.astype(str).str.strip()
+    if semantic_type in ("date", "timestamp", "time") and parse_format.startswith("%"):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return pd.to_datetime(text, format=parse_format, errors='coerce')
+    if semantic_type in ("integer", "decimal"):
+        if parse_format == "thousands=,":
+            text = text.str.replace(",", "", regex=False)
+        elif parse_format == "thousands=.;decimal=,":
+            text = text.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+        return pd.to_numeric(text, errors='coerce')
+    return None
+
+
+def zero_padded_columns(names: List[str], rows: List[List[Any]]) -> List[str]:
+    """
+    Columns whose raw text is mostly zero-padded digits
+
+    Readers parse such values as integers and drop the padding, so these
+    columns must be read as strings for the identifier pattern to match.
+    """
+    padded = []
+    for idx, name in enumerate(names):
+        values = pd.Series([row[idx] for row in rows if idx < len(row) and row[idx] not in (None, "")],
+                           dtype=object)
+        if values.empty:
+            continue
+        if _match_ratio(values.astype(str).str.strip(), "identifier", "zero_padded") >= MATCH_THRESHOLD:
+            padded.append(name)
+    return padded
+
+
+def _validation_sample(values: pd.Series) -> pd.Series:
+    """Evenly strided subset of at most about VALIDATION_SIZE values"""
+    if len(values) > VALIDATION_SIZE:
+        return values.iloc[::len(values) // VALIDATION_SIZE]
+    return values
+
+
+class SemanticTypeInferer:
+    """
+    Detects dates, numerics-in-strings, booleans and IDs in whole columns
+
+    Every candidate is evaluated with vectorized pandas string/datetime
+    operations, first on a small probe and then on an evenly strided sample
+    of the column. The winning format is cached per column name and tried
+    first next time, so later chunks of the same feed cost one parse.
+    """
+
+    def __init__(self, threshold: float = MATCH_THRESHOLD):
+        self.threshold = threshold
+        self.format_cache: Dict[str, Tuple[str, str]] = {}
+
+    def infer(self, series: pd.Series) -> Dict[str, Any]:
+        """
+        Infer the semantic type of a column
+
+        Returns:
+            {"semantic_type", "parse_format"}; parse_format is None when the
+            pandas dtype already carries the type
+        """
+        native = _native_semantic_type(series)
+        if native == "integer" and pd.api.types.is_integer_dtype(series) \
+                and COMPACT_DATE_FORMAT in _candidates(series.name):
+            # pandas reads compact dates such as 20251031 as integers
+            if _match_ratio(_validation_sample(series.dropna()).astype(str), *COMPACT_DATE_FORMAT) >= self.threshold:
+                return {"semantic_type": "date", "parse_format": COMPACT_DATE_FORMAT[1]}
+        if native is not None:
+            return {"semantic_type": native, "parse_format": None}
+
+        values = series.dropna()
+        if values.empty:
+            return {"semantic_type": "string", "parse_format": None}
+        values = _validation_sample(values)
+        if pd.api.types.infer_dtype(values, skipna=True) != "string":
+            values = values.astype(str)
+        values = values.str.strip()
+
+        cached = self.format_cache.get(series.name)
+        if cached and _match_ratio(values, *cached) >= self.threshold:
+            return {"semantic_type": cached[0], "parse_format": cached[1]}
+
+        probe = values.head(PROBE_SIZE)
+        for candidate in _candidates(series.name):
+            if _match_ratio(probe, *candidate) < self.threshold:
+                continue
+            if len(values) > len(probe) and _match_ratio(values, *candidate) < self.threshold:
+                continue
+            self.format_cache[series.name] = candidate
+            return {"semantic_type": candidate[0], "parse_format": candidate[1]}
+
+        return {"semantic_type": "string", "parse_format": None}
+
+
+def infer_semantic_type(series: pd.Series, inferer: Optional[SemanticTypeInferer] = None) -> Dict[str, Any]:
+    """
+    Infer the semantic type of a column
+
+    Pass the analysis's inferer to share its format cache across chunks;
+    caches never outlive one analysis, so a format learned from one feed
+    cannot decide an ambiguous same-named column of another.
+    """
+    return (inferer or SemanticTypeInferer()).infer(series)